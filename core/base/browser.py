@@ -2,28 +2,360 @@
 # -*- coding: utf-8 -*-
 """
 BrowserManager - 브라우저 관리 클래스
+단일 브라우저 설정(setup)과 함께, 여러 작업이 공유하는 브라우저 풀을 제공
+- N개의 브라우저 프로세스를 미리 띄워두고 BrowserContext 단위로 임대(lease)
+- 사이트별 저장 상태(SessionStore 스냅샷)를 컨텍스트 생성 시 적용
+- 작업 수 또는 RSS 상한을 넘은 브라우저는 재시작(recycle)
 """
 
-from playwright.async_api import Browser, BrowserContext, Page
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Set
+from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+
+from ..session_keeper import SessionKeeper
+from ..utils.session_store import SessionStore, default_store
+
+try:
+    import psutil
+except ImportError:  # RSS 기반 재시작은 psutil이 있을 때만 동작
+    psutil = None
+
+
+class _PooledBrowser:
+    """풀에 속한 브라우저 프로세스 하나의 상태"""
+
+    def __init__(self, browser: Browser, pids: Set[int]):
+        self.browser = browser
+        self.pids = pids
+        self.jobs = 0
+        self.active = 0
+        self.retiring = False
+        self.launched_at = time.time()
+
+    def rss_mb(self) -> Optional[float]:
+        """브라우저 프로세스 트리의 RSS 합계 (MB)"""
+        if psutil is None or not self.pids:
+            return None
+
+        total = 0
+        seen = set()
+        for pid in self.pids:
+            try:
+                root = psutil.Process(pid)
+                for proc in [root] + root.children(recursive=True):
+                    if proc.pid in seen:
+                        continue
+                    seen.add(proc.pid)
+                    total += proc.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return total / (1024 * 1024)
 
 
 class BrowserManager:
     """브라우저 관리 클래스"""
-    
-    def __init__(self):
+
+    def __init__(self, pool_size: int = 1, contexts_per_browser: int = 4,
+                 max_jobs_per_browser: int = 50, max_rss_mb: Optional[float] = None,
+                 session_store: Optional[SessionStore] = None,
+                 session_keeper: Optional[SessionKeeper] = None, **launch_options):
+        """
+        Args:
+            pool_size: 유지할 브라우저 프로세스 수
+            contexts_per_browser: 브라우저당 동시에 임대할 수 있는 컨텍스트 수
+            max_jobs_per_browser: 이 횟수만큼 임대된 브라우저는 재시작
+            max_rss_mb: 브라우저 프로세스 트리의 RSS 상한 (MB, psutil 필요)
+            session_store: 사이트 저장 상태 (기본: 프로세스 공용 SessionStore)
+            session_keeper: 임대 중인 컨텍스트의 세션을 만료 전에 연장할 SessionKeeper
+            **launch_options: chromium.launch 옵션 (headless 등)
+        """
+        # 단일 브라우저 모드 (setup)
         self.browser: Browser = None
         self.context: BrowserContext = None
         self.page: Page = None
-    
+
+        # 풀 모드 (start / lease)
+        self.pool_size = pool_size
+        self.contexts_per_browser = contexts_per_browser
+        self.max_jobs_per_browser = max_jobs_per_browser
+        self.max_rss_mb = max_rss_mb
+        self.launch_options = launch_options
+        self.sessions = session_store or default_store()
+        self.session_keeper = session_keeper
+
+        self._playwright: Optional[Playwright] = None
+        self._owns_playwright = False
+        self._pool: List[_PooledBrowser] = []
+        self._condition: Optional[asyncio.Condition] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self._leases: Dict[BrowserContext, _PooledBrowser] = {}
+        self._closed = False
+
+        self.metrics = {
+            'leases': 0,
+            'active_leases': 0,
+            'total_wait_time': 0.0,
+            'max_wait_time': 0.0,
+            'launches': 0,
+            'recycles': 0,
+            'recycle_failures': 0,
+            'start_time': None
+        }
+
     async def setup(self, browser: Browser, **context_options):
         """브라우저 설정"""
         self.browser = browser
         self.context = await browser.new_context(**context_options)
         self.page = await self.context.new_page()
-        
+
         return self.context, self.page
-    
+
+    # ============ 브라우저 풀 ============
+    async def start(self, playwright: Optional[Playwright] = None):
+        """브라우저 풀 시작 - pool_size개의 브라우저를 미리 실행"""
+        if self._condition is not None:
+            return self
+
+        if playwright is None:
+            self._playwright = await async_playwright().start()
+            self._owns_playwright = True
+        else:
+            self._playwright = playwright
+
+        self._condition = asyncio.Condition()
+        self._launch_lock = asyncio.Lock()
+        self._closed = False
+        self.metrics['start_time'] = time.time()
+
+        for _ in range(self.pool_size):
+            self._pool.append(await self._launch())
+
+        return self
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _launch(self) -> _PooledBrowser:
+        """브라우저 프로세스 실행 (실행 전후 자식 프로세스 비교로 PID 추적)"""
+        async with self._launch_lock:
+            before = self._child_pids()
+            browser = await self._playwright.chromium.launch(**self.launch_options)
+            pids = self._child_pids() - before
+
+        self.metrics['launches'] += 1
+        return _PooledBrowser(browser, pids)
+
+    def _child_pids(self) -> Set[int]:
+        """현재 프로세스의 하위 프로세스 PID 목록"""
+        if psutil is None:
+            return set()
+        try:
+            return {p.pid for p in psutil.Process().children(recursive=True)}
+        except psutil.Error:
+            return set()
+
+    def _pick_browser(self) -> Optional[_PooledBrowser]:
+        """여유가 있는 브라우저 중 가장 한가한 것 선택"""
+        candidates = [
+            pb for pb in self._pool
+            if not pb.retiring and pb.active < self.contexts_per_browser
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda pb: (pb.active, pb.jobs))
+
+    async def acquire(self, site_name: Optional[str] = None,
+                      timeout: Optional[float] = None,
+                      **context_options) -> BrowserContext:
+        """컨텍스트 임대 - 여유 브라우저가 없으면 반납될 때까지 대기
+
+        Args:
+            site_name: 저장 상태를 적용할 사이트 이름 (예: 'bizmeka')
+            timeout: 최대 대기 시간 (초)
+            **context_options: browser.new_context 옵션
+
+        Returns:
+            BrowserContext: 반드시 release()로 반납해야 하는 컨텍스트
+        """
+        if self._condition is None:
+            await self.start()
+
+        wait_start = time.time()
+        async with self._condition:
+            await asyncio.wait_for(
+                self._condition.wait_for(lambda: self._closed or self._pick_browser() is not None),
+                timeout
+            )
+            if self._closed:
+                raise RuntimeError("BrowserManager pool is closed")
+
+            pooled = self._pick_browser()
+            pooled.active += 1
+            pooled.jobs += 1
+
+        waited = time.time() - wait_start
+        self.metrics['leases'] += 1
+        self.metrics['active_leases'] += 1
+        self.metrics['total_wait_time'] += waited
+        self.metrics['max_wait_time'] = max(self.metrics['max_wait_time'], waited)
+
+        try:
+            options = dict(context_options)
+            if site_name:
+                # 동시에 임대되는 컨텍스트들이 같은 스냅샷 dict를 공유 (파일은 바뀐 경우에만 다시 읽음)
+                snapshot = self.sessions.get(site_name, include_expired=True)
+                if snapshot is not None:
+                    options.setdefault('storage_state', snapshot.state)
+
+            context = await pooled.browser.new_context(**options)
+        except Exception:
+            await self._finish_lease(pooled)
+            raise
+
+        self._leases[context] = pooled
+        if site_name and self.session_keeper is not None:
+            self.session_keeper.attach(site_name, context)
+        return context
+
+    async def release(self, context: BrowserContext):
+        """컨텍스트 반납 - 컨텍스트를 닫고 필요하면 브라우저 재시작"""
+        pooled = self._leases.pop(context, None)
+        if self.session_keeper is not None:
+            self.session_keeper.detach(context)
+        try:
+            await context.close()
+        except Exception:
+            pass
+        if pooled is not None:
+            await self._finish_lease(pooled)
+
+    async def _finish_lease(self, pooled: _PooledBrowser):
+        """임대 종료 처리 및 재시작 조건 확인"""
+        self.metrics['active_leases'] -= 1
+
+        async with self._condition:
+            pooled.active -= 1
+            if not pooled.retiring and self._should_recycle(pooled):
+                pooled.retiring = True
+            recycle = pooled.retiring and pooled.active == 0 and not self._closed
+            self._condition.notify_all()
+
+        if recycle:
+            await self._recycle(pooled)
+
+    def _should_recycle(self, pooled: _PooledBrowser) -> bool:
+        """작업 수/RSS 상한 초과 여부"""
+        if self.max_jobs_per_browser and pooled.jobs >= self.max_jobs_per_browser:
+            return True
+        if self.max_rss_mb:
+            rss = pooled.rss_mb()
+            if rss is not None and rss > self.max_rss_mb:
+                return True
+        if not pooled.browser.is_connected():
+            return True
+        return False
+
+    async def _recycle(self, pooled: _PooledBrowser):
+        """브라우저 교체
+
+        교체 브라우저를 띄우지 못하면 풀에서 빼기만 하고 (release()로 예외를 넘기지 않음),
+        띄우는 동안 풀이 닫혔으면 교체 브라우저를 닫는다.
+        """
+        condition = self._condition
+        try:
+            await pooled.browser.close()
+        except Exception:
+            pass
+
+        try:
+            replacement = await self._launch()
+        except Exception:
+            replacement = None
+
+        placed = False
+        if condition is not None:
+            async with condition:
+                if pooled in self._pool:
+                    if replacement is not None and not self._closed:
+                        self._pool[self._pool.index(pooled)] = replacement
+                        placed = True
+                    else:
+                        self._pool.remove(pooled)
+                if replacement is None:
+                    self.metrics['recycle_failures'] += 1
+                else:
+                    self.metrics['recycles'] += 1
+                condition.notify_all()
+
+        if replacement is not None and not placed:
+            try:
+                await replacement.browser.close()
+            except Exception:
+                pass
+
+    @asynccontextmanager
+    async def lease(self, site_name: Optional[str] = None,
+                    timeout: Optional[float] = None, **context_options):
+        """컨텍스트 임대 컨텍스트 매니저
+
+        사용 예:
+            async with manager.lease('bizmeka') as (context, page):
+                await page.goto(...)
+        """
+        context = await self.acquire(site_name, timeout=timeout, **context_options)
+        try:
+            page = await context.new_page()
+            yield context, page
+        finally:
+            await self.release(context)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """풀 메트릭 반환 (풀 크기 산정용)"""
+        metrics = dict(self.metrics)
+        runtime = time.time() - metrics['start_time'] if metrics['start_time'] else 0.0
+        leases = metrics['leases']
+
+        metrics['runtime_seconds'] = runtime
+        metrics['leases_per_second'] = leases / runtime if runtime > 0 else 0.0
+        metrics['avg_wait_time'] = metrics['total_wait_time'] / leases if leases else 0.0
+        metrics['browsers'] = [
+            {
+                'jobs': pb.jobs,
+                'active': pb.active,
+                'retiring': pb.retiring,
+                'rss_mb': pb.rss_mb(),
+                'uptime_seconds': time.time() - pb.launched_at
+            }
+            for pb in self._pool
+        ]
+        if self.session_keeper is not None:
+            metrics['sessions'] = self.session_keeper.get_metrics()
+        return metrics
+
     async def close(self):
         """브라우저 종료"""
         if self.browser:
-            await self.browser.close()
\ No newline at end of file
+            await self.browser.close()
+
+        if self._condition is not None:
+            async with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+
+            for pooled in self._pool:
+                try:
+                    await pooled.browser.close()
+                except Exception:
+                    pass
+            self._pool = []
+            self._condition = None
+
+        if self._owns_playwright and self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+            self._owns_playwright = False
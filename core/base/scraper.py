@@ -15,6 +15,7 @@ import pandas as pd
 from ..utils.popups import PopupHandler
 from ..utils.navigation import Navigator
 from ..utils.cookies import CookieManager
+from ..utils.settle import PageSettler
 from ..exceptions.scraping import ScrapingError
 
 
@@ -29,7 +30,8 @@ class BaseScraper:
         
         # 유틸리티 초기화
         self.popup_handler = PopupHandler()
-        self.navigator = Navigator()
+        self.navigator = Navigator(self._load_selectors().get('pagination', {}).get('list_container'))
+        self.settler = PageSettler()
         self.cookie_manager = CookieManager(site_name)
         
         # 상태
@@ -90,8 +90,7 @@ class BizmekaIntegrated:
             page = await context.new_page()
             
             # 메인 페이지 접속
-            await page.goto("https://www.bizmeka.com/app/main.do")
-            await page.wait_for_timeout(3000)
+            await page.goto("https://www.bizmeka.com/app/main.do", wait_until='load')
             
             # 실제 로그인 확인
             current_url = page.url
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+SessionKeeper - 세션 만료 전 자동 연장 스케줄러
+- 사이트별 만료 시각 추적: 인증 쿠키 만료(SessionStore) + 서버 유휴 타임아웃
+  (유휴 타임아웃은 설정값에서 시작해서, 세션이 실제로 끊긴 시점의 유휴 시간으로 학습,
+   이후 keep-alive가 계속 성공하면 설정값까지 조금씩 다시 늘림)
+- 만료 전에 가벼운 세션 확인 요청(SESSION_PROBES)으로 keep-alive
+  (임대 중인 컨텍스트가 있으면 그 컨텍스트의 쿠키로, 없으면 저장된 쿠키로 httpx 요청)
+- 응답으로 바뀐 쿠키는 저장소에 반영하고 임대 중인 모든 컨텍스트에 다시 주입
+- 사이트별 만료까지 남은 시간을 메트릭으로 제공
+
+사용 예:
+    keeper = SessionKeeper()
+    manager = BrowserManager(pool_size=2, session_keeper=keeper)
+    async with keeper:
+        async with manager.lease('bizmeka') as (context, page):
+            ...
+"""
+
+import asyncio
+import inspect
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+from playwright.async_api import BrowserContext
+
+from .smart_login import SESSION_PROBES, probe_verdict
+from .utils.session_store import SessionStore, default_store
+
+
+DEFAULT_IDLE_TIMEOUT = 30 * 60  # 서블릿 컨테이너 기본 세션 타임아웃 (초)
+MIN_IDLE_TIMEOUT = 60           # 학습값 하한 (서버 재시작 등으로 끊긴 경우에 너무 줄어들지 않도록)
+IDLE_TIMEOUT_GROWTH = 1.25      # 학습값이 설정값보다 작을 때 keep-alive 성공마다 늘리는 비율
+
+
+class _SiteSession:
+    """사이트 하나의 keep-alive 상태"""
+
+    def __init__(self, site: str, idle_timeout: float):
+        self.site = site
+        self.idle_timeout = idle_timeout
+        self.last_activity = time.time()
+        self.contexts: Set[BrowserContext] = set()
+        self.pings = 0
+        self.failures = 0
+        self.refreshes = 0
+        self.last_ping: Optional[float] = None
+        self.expired_at: Optional[float] = None  # 세션이 끊긴 것을 발견한 시각
+
+
+class SessionKeeper:
+    """사이트 세션을 만료 전에 연장하는 백그라운드 스케줄러"""
+
+    def __init__(self, store: Optional[SessionStore] = None,
+                 idle_timeouts: Optional[Dict[str, float]] = None,
+                 ping_ratio: float = 0.5, expiry_margin: float = 300, tick: float = 5.0,
+                 state_path: str = "data/session_keeper.json",
+                 on_expired: Optional[Callable[[str], Any]] = None):
+        """
+        Args:
+            store: 세션 저장소 (기본: 프로세스 공용 SessionStore)
+            idle_timeouts: 사이트별 서버 유휴 타임아웃 초기값 (초, 기본 DEFAULT_IDLE_TIMEOUT)
+            ping_ratio: 유휴 타임아웃의 이 비율만큼 지나면 keep-alive
+            expiry_margin: 쿠키 만료 이 시간(초) 전에 keep-alive
+            tick: 스케줄 확인 주기 (초)
+            state_path: 학습한 유휴 타임아웃 저장 파일
+            on_expired: 세션이 끊긴 것을 발견했을 때 호출 (site) - 재로그인 등, 코루틴 가능
+        """
+        self.store = store or default_store()
+        self.idle_timeouts = dict(idle_timeouts or {})
+        self.ping_ratio = ping_ratio
+        self.expiry_margin = expiry_margin
+        self.tick = tick
+        self.state_path = Path(state_path)
+        self.on_expired = on_expired
+
+        self._sites: Dict[str, _SiteSession] = {}
+        self._learned = self._load_learned()
+        self._task: Optional[asyncio.Task] = None
+
+    # ============ 추적 ============
+    def track(self, site: str) -> _SiteSession:
+        """사이트 추적 시작 (이미 추적 중이면 그대로)"""
+        session = self._sites.get(site)
+        if session is None:
+            idle_timeout = self._learned.get(site, self.idle_timeouts.get(site, DEFAULT_IDLE_TIMEOUT))
+            session = self._sites[site] = _SiteSession(site, idle_timeout)
+        return session
+
+    def attach(self, site: str, context: BrowserContext):
+        """임대된 컨텍스트 등록 - 쿠키가 갱신되면 이 컨텍스트에도 주입"""
+        session = self.track(site)
+        session.contexts.add(context)
+        session.last_activity = time.time()
+
+    def detach(self, context: BrowserContext):
+        """반납된 컨텍스트 제외"""
+        for session in self._sites.values():
+            session.contexts.discard(context)
+
+    def touch(self, site: str):
+        """사이트 요청이 있었음을 기록 (서버 유휴 타이머가 다시 시작됨)"""
+        session = self.track(site)
+        session.last_activity = time.time()
+        session.expired_at = None
+
+    # ============ 만료 계산 ============
+    def _is_expired(self, session: _SiteSession, snapshot) -> bool:
+        """끊긴 세션인지 - 그 뒤에 다시 로그인해서 저장된 상태가 있으면 다시 추적"""
+        if session.expired_at is None:
+            return False
+        if snapshot is not None and snapshot.saved_at > session.expired_at:
+            session.expired_at = None
+            session.last_activity = snapshot.saved_at
+            return False
+        return True
+
+    def time_to_expiry(self, site: str) -> Optional[float]:
+        """만료까지 남은 시간 (초) - 유휴 타임아웃과 쿠키 만료 중 이른 쪽, 추적하지 않는 사이트는 None"""
+        session = self._sites.get(site)
+        if session is None:
+            return None
+        snapshot = self.store.get(site, include_expired=True)
+        if self._is_expired(session, snapshot):
+            return 0.0
+        remaining = session.last_activity + session.idle_timeout - time.time()
+        ttl = snapshot.ttl() if snapshot is not None else None
+        return max(0.0, remaining if ttl is None else min(remaining, ttl))
+
+    def next_ping_at(self, site: str) -> Optional[float]:
+        """다음 keep-alive 시각 (끊긴 세션은 재로그인 전까지 None)"""
+        session = self._sites.get(site)
+        if session is None:
+            return None
+        snapshot = self.store.get(site, include_expired=True)
+        if self._is_expired(session, snapshot):
+            return None
+        due = session.last_activity + session.idle_timeout * self.ping_ratio
+        if snapshot is not None and snapshot.expires_at is not None:
+            due = min(due, snapshot.expires_at - self.expiry_margin)
+        # 쿠키 만료가 이미 임박했어도 tick마다 계속 두드리지 않도록
+        if session.last_ping is not None:
+            due = max(due, session.last_ping + self.tick)
+        return due
+
+    # ============ 스케줄러 ============
+    async def start(self):
+        """백그라운드 루프 시작"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """백그라운드 루프 종료"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    async def _run(self):
+        while True:
+            now = time.time()
+            due = [site for site in list(self._sites)
+                   if site in SESSION_PROBES and (self.next_ping_at(site) or float('inf')) <= now]
+            if due:
+                # 한 사이트의 예외로 루프가 죽으면 나머지 사이트도 연장이 멈춤
+                results = await asyncio.gather(*(self.keep_alive(site) for site in due), return_exceptions=True)
+                for site, result in zip(due, results, strict=True):
+                    if isinstance(result, Exception):
+                        print(f"⚠️ keep-alive 오류 ({site}): {result!r}")
+            await asyncio.sleep(self.tick)
+
+    async def keep_alive(self, site: str) -> bool:
+        """세션 확인 요청으로 연장 - 세션이 살아 있으면 True
+
+        네트워크 오류는 만료로 보지 않고 failures만 올림 (다음 tick에 다시 시도)
+        저장된 세션이 없어 확인 요청을 보내지 못한 경우도 만료로 보지 않음 (유휴 타임아웃 학습 안 함)
+        """
+        session = self.track(site)
+        probe = SESSION_PROBES.get(site)
+        if probe is None:
+            return False
+
+        idle_for = time.time() - session.last_activity
+        try:
+            if session.contexts:
+                alive = await self._ping_context(site, next(iter(session.contexts)))
+            else:
+                alive = await self._ping_http(site)
+        except Exception as e:
+            session.failures += 1
+            session.last_ping = time.time()
+            print(f"⚠️ keep-alive 실패 ({site}): {e}")
+            return False
+
+        if alive is None:
+            session.last_ping = time.time()
+            return False
+
+        session.pings += 1
+        session.last_ping = time.time()
+        if alive:
+            session.last_activity = session.last_ping
+            session.expired_at = None
+            self._grow_idle_timeout(session)
+            return True
+
+        self._learn_idle_timeout(session, idle_for)
+        session.expired_at = session.last_ping
+        print(f"⏰ 세션 만료 감지 ({site}, 유휴 {idle_for:.0f}초)")
+        if self.on_expired is not None:
+            try:
+                result = self.on_expired(site)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"⚠️ 세션 만료 처리 실패 ({site}): {e!r}")
+        return False
+
+    async def _ping_context(self, site: str, context: BrowserContext) -> bool:
+        """임대 중인 컨텍스트의 쿠키로 확인 (APIRequestContext - 페이지 로드 없음)"""
+        response = await context.request.get(
+            SESSION_PROBES[site]['url'], max_redirects=0, timeout=10000, fail_on_status_code=False
+        )
+        body = await response.text() if response.status < 300 else ''
+        alive = probe_verdict(site, response.status, response.headers.get('location', ''), body)
+        if alive:
+            await self._refresh(site, await context.storage_state(), source=context)
+        return alive
+
+    async def _ping_http(self, site: str) -> Optional[bool]:
+        """임대 중인 컨텍스트가 없으면 저장된 쿠키로 확인 (스냅샷 CookieJar 공유 → Set-Cookie가 바로 반영됨)
+
+        저장된 세션이 없으면 요청을 보내지 않고 None
+        """
+        snapshot = self.store.get(site, include_expired=True)
+        if snapshot is None:
+            return None
+        async with self.store.httpx_client(site, asynchronous=True, timeout=10) as client:
+            response = await client.get(SESSION_PROBES[site]['url'])
+            body = response.text if response.status_code < 300 else ''
+        alive = probe_verdict(site, response.status_code, response.headers.get('location', ''), body)
+        if alive:
+            await self._refresh(site, snapshot.current_state())
+        return alive
+
+    async def _refresh(self, site: str, state: Dict, source: Optional[BrowserContext] = None):
+        """바뀐 쿠키만 저장하고 다른 컨텍스트에 주입"""
+        snapshot = self.store.get(site, include_expired=True)
+        previous = {(c['name'], c['domain'], c['path']): c for c in snapshot.cookies} if snapshot else {}
+        changed = [c for c in state.get('cookies', [])
+                   if previous.get((c['name'], c['domain'], c['path'])) != c]
+        if not changed:
+            return
+
+        self.store.put(site, state)
+        session = self._sites[site]
+        session.refreshes += 1
+        for context in list(session.contexts):
+            if context is source:
+                continue
+            try:
+                await context.add_cookies(changed)
+            except Exception:
+                session.contexts.discard(context)  # 이미 닫힌 컨텍스트
+
+    # ============ 유휴 타임아웃 학습 ============
+    def _learn_idle_timeout(self, session: _SiteSession, idle_for: float):
+        """유휴 idle_for초 만에 끊겼다면 서버 타임아웃은 그 이하"""
+        if idle_for >= session.idle_timeout:
+            return
+        session.idle_timeout = max(MIN_IDLE_TIMEOUT, idle_for)
+        self._learned[session.site] = session.idle_timeout
+        self._save_learned()
+
+    def _grow_idle_timeout(self, session: _SiteSession):
+        """서버 재시작 등으로 한 번 끊긴 값에 계속 묶이지 않도록 성공할 때마다 설정값 쪽으로 다시 늘림
+        (실제 타임아웃을 넘으면 다시 끊기고 _learn_idle_timeout이 줄임)"""
+        configured = self.idle_timeouts.get(session.site, DEFAULT_IDLE_TIMEOUT)
+        if session.idle_timeout >= configured:
+            return
+        session.idle_timeout = min(configured, session.idle_timeout * IDLE_TIMEOUT_GROWTH)
+        if session.idle_timeout >= configured:
+            self._learned.pop(session.site, None)
+        else:
+            self._learned[session.site] = session.idle_timeout
+        self._save_learned()
+
+    def _save_learned(self):
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump({'idle_timeouts': self._learned}, f, indent=2)
+        except OSError:
+            pass
+
+    def _load_learned(self) -> Dict[str, float]:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('idle_timeouts', {})
+        except (OSError, ValueError):
+            return {}
+
+    # ============ 메트릭 ============
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """사이트별 만료까지 남은 시간 / keep-alive 통계"""
+        now = time.time()
+        metrics = {}
+        for site, session in self._sites.items():
+            next_ping = self.next_ping_at(site)
+            metrics[site] = {
+                'time_to_expiry': self.time_to_expiry(site),
+                'next_ping_in': None if next_ping is None else max(0.0, next_ping - now),
+                'idle_timeout': session.idle_timeout,
+                'idle_seconds': now - session.last_activity,
+                'expired': session.expired_at is not None,
+                'contexts': len(session.contexts),
+                'pings': session.pings,
+                'failures': session.failures,
+                'refreshes': session.refreshes
+            }
+        return metrics
@@ -5,8 +5,45 @@
 """
 
 import json
+import time
 from pathlib import Path
-from playwright.async_api import Page, BrowserContext
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from playwright.async_api import BrowserContext, Page
+
+from .utils.session_store import default_store
+from .utils.settle import PageSettler
+
+# 사이트별 메인 페이지
+MAIN_URLS = {
+    'bizmeka': 'https://www.bizmeka.com/app/main.do',
+    'mekics': 'https://it.mek-ics.com/mekics/main/main.do'
+}
+
+# 세션 확인용 요청 - 로그인 상태면 정상 응답, 만료면 로그인 페이지로 리다이렉트(또는 리다이렉트 스크립트)
+# 페이지 로드와 달리 문서 하나만 받고 스크립트/리소스는 실행하지 않음
+SESSION_PROBES = {
+    'bizmeka': {'url': 'https://www.bizmeka.com/app/main.do', 'login_markers': ['loginForm.do']},
+    'mekics': {'url': 'https://it.mek-ics.com/mekics/main/main.do', 'login_markers': ['login/login.do']}
+}
+
+PROBE_TTL = 600  # 세션 확인 결과 재사용 시간 (초), 쿠키 만료가 더 이르면 그때까지
+
+
+def probe_verdict(site_id: str, status: int, location: str = '', body: str = '') -> bool:
+    """세션 확인 요청의 응답으로 세션 유효 여부 판정 (리다이렉트는 따라가지 않은 응답 기준)"""
+    markers = SESSION_PROBES[site_id]['login_markers']
+    if 300 <= status < 400:
+        return not any(marker in location for marker in markers)
+    if status >= 400:
+        return False
+    return not any(marker in body for marker in markers)
+
+
+def _cookie_expiry(cookie: Dict) -> Optional[float]:
+    """쿠키 만료 시각 (세션 쿠키는 None)"""
+    expires = cookie.get('expires') or -1
+    return expires if expires > 0 else None
 
 
 class SmartLoginManager:
@@ -15,34 +52,33 @@ class SmartLoginManager:
     def __init__(self):
         self.sites_dir = Path("sites")
         self.data_dir = Path("data")
+        self.settler = PageSettler(timeout=5000)
+        self.store = default_store()
+        self.verdict_path = self.data_dir / "session_verdicts.json"
+        self._verdicts = None
         
-    async def login(self, site_id: str, page: Page) -> bool:
+    async def login(self, site_id: str, page: Page, open_main: bool = False) -> bool:
         """
         사이트별 최적 로그인 전략 자동 선택
         
-        1. 쿠키 있으면 → 쿠키 로그인 (Bizmeka)
+        1. 쿠키 있으면 → 쿠키 로그인 (Bizmeka) - HTTP 요청 한 번으로 세션 확인, 결과는 캐시
         2. 쿠키 없으면 → 직접 로그인 (MEK-ICS)
         3. 2FA 필요하면 → 수동 로그인 후 쿠키 저장
+        
+        open_main=True면 쿠키 로그인 후 메인 페이지까지 연다 (기본은 쿠키만 주입하고 페이지는 그대로)
         """
         
         site_id = site_id.lower()
         
-        # 1단계: 쿠키 확인
-        cookie_paths = [
-            self.sites_dir / site_id / "data" / "cookies.json",
-            self.data_dir / f"{site_id}_cookies.json",
-            self.data_dir / "bizmeka_cookies.json"  # 레거시 호환
-        ]
-        
-        for cookie_path in cookie_paths:
-            if cookie_path.exists():
-                print(f"[Smart Login] Found cookies for {site_id}")
-                success = await self._login_with_cookies(site_id, page, cookie_path)
-                if success:
-                    return True
-                print(f"[Smart Login] Cookie expired, trying direct login...")
+        # 1단계: 쿠키 확인 (세션 저장소 → 레거시 쿠키 파일)
+        for source, version, cookies in self._cookie_sources(site_id):
+            print(f"[Smart Login] Found cookies for {site_id}")
+            success = await self._login_with_cookies(site_id, page, source, version, cookies, open_main)
+            if success:
+                return True
+            print(f"[Smart Login] Cookie expired, trying direct login...")
         
-        # 2단계: 직접 로그인
+        # 2단계: 직접 로그인 (여기서만 페이지를 실제로 띄움)
         settings_path = self.sites_dir / site_id / "config" / "settings.json"
         if settings_path.exists():
             print(f"[Smart Login] Trying direct login for {site_id}")
@@ -54,41 +90,124 @@ class SmartLoginManager:
         print(f"  python scripts/{site_id}_manual_login.py")
         return False
     
-    async def _login_with_cookies(self, site_id: str, page: Page, cookie_path: Path) -> bool:
-        """쿠키로 로그인"""
+    def _cookie_sources(self, site_id: str) -> Iterator[Tuple[str, float, List[Dict]]]:
+        """(출처, 버전, 쿠키) 후보 - 세션 저장소 스냅샷 먼저, 그다음 data/ 아래 레거시 파일 (같은 파일은 한 번만)"""
+        snapshot = self.store.get(site_id, include_expired=True)
+        if snapshot is not None:
+            yield f"store:{site_id}", snapshot.saved_at, snapshot.cookies
+        
+        legacy_paths = [
+            self.data_dir / f"{site_id}_cookies.json",
+            self.data_dir / "bizmeka_cookies.json"  # 레거시 호환
+        ]
+        for cookie_path in dict.fromkeys(legacy_paths):
+            if cookie_path.exists():
+                with open(cookie_path, 'r', encoding='utf-8') as f:
+                    yield str(cookie_path), cookie_path.stat().st_mtime, json.load(f)
+    
+    async def _login_with_cookies(self, site_id: str, page: Page, source: str, version: float,
+                                  cookies: List[Dict], open_main: bool = False) -> bool:
+        """쿠키로 로그인 - 캐시된 판정 → HTTP 프로브 → (프로브가 없는 사이트만) 페이지 로드 순"""
         try:
-            # 쿠키 로드
-            with open(cookie_path, 'r', encoding='utf-8') as f:
-                cookies = json.load(f)
+            # 이미 만료된 쿠키는 버림
+            now = time.time()
+            live = [c for c in cookies if (_cookie_expiry(c) or now + 1) > now]
+            if not live:
+                print(f"  ✗ Cookies expired")
+                return False
             
             # 쿠키 주입
-            await page.context.add_cookies(cookies)
-            print(f"  Loaded {len(cookies)} cookies")
-            
-            # 사이트별 메인 페이지
-            main_urls = {
-                'bizmeka': 'https://www.bizmeka.com/app/main.do',
-                'mekics': 'https://it.mek-ics.com/mekics/main/main.do'
-            }
+            await page.context.add_cookies(live)
+            print(f"  Loaded {len(live)} cookies")
             
-            # 메인 페이지 접속
-            main_url = main_urls.get(site_id, '/')
-            await page.goto(main_url)
-            await page.wait_for_timeout(3000)
-            
-            # 로그인 확인
-            current_url = page.url
-            if 'login' not in current_url.lower():
-                print(f"  ✓ Logged in with cookies!")
-                return True
+            valid = self._cached_verdict(site_id, source, version)
+            if valid is None:
+                valid = await self._probe_session(site_id, page)
+                if valid is None:
+                    valid = await self._check_with_page(site_id, page)
+                self._remember_verdict(site_id, source, version, live, valid)
             else:
+                print(f"  (cached session verdict)")
+            
+            if not valid:
                 print(f"  ✗ Cookies expired")
                 return False
+            
+            print(f"  ✓ Logged in with cookies!")
+            if open_main and site_id in MAIN_URLS and MAIN_URLS[site_id] not in page.url:
+                await page.goto(MAIN_URLS[site_id], wait_until='domcontentloaded')
+            return True
                 
         except Exception as e:
             print(f"  Cookie login failed: {e}")
             return False
     
+    async def _probe_session(self, site_id: str, page: Page) -> Optional[bool]:
+        """HTTP 요청 한 번으로 세션 확인 (컨텍스트 쿠키 공유, 리다이렉트는 따라가지 않음)
+        
+        프로브가 없는 사이트거나 요청 자체가 실패하면 None (페이지 로드로 확인)
+        """
+        probe = SESSION_PROBES.get(site_id)
+        if not probe:
+            return None
+        
+        try:
+            response = await page.context.request.get(
+                probe['url'], max_redirects=0, timeout=5000, fail_on_status_code=False
+            )
+        except Exception as e:
+            print(f"  Session probe failed: {e}")
+            return None
+        
+        body = await response.text() if response.status < 300 else ''
+        return probe_verdict(site_id, response.status, response.headers.get('location', ''), body)
+    
+    async def _check_with_page(self, site_id: str, page: Page) -> bool:
+        """메인 페이지를 열어 로그인 페이지로 튕기는지 확인 (프로브를 못 쓸 때)"""
+        # 만료 시 스크립트 리다이렉트까지 반영되도록 load 이벤트까지 대기
+        await page.goto(MAIN_URLS.get(site_id, '/'), wait_until='load')
+        return 'login' not in page.url.lower()
+    
+    # ============ 세션 판정 캐시 ============
+    def _load_verdicts(self) -> Dict:
+        if self._verdicts is None:
+            try:
+                with open(self.verdict_path, 'r', encoding='utf-8') as f:
+                    self._verdicts = json.load(f)
+            except (OSError, ValueError):
+                self._verdicts = {}
+        return self._verdicts
+    
+    def _cached_verdict(self, site_id: str, source: str, version: float) -> Optional[bool]:
+        """같은 쿠키(출처와 저장 시각 동일)에 대한 판정이 유효하면 반환
+        
+        유효 판정은 expires_at까지, 만료 판정은 쿠키가 다시 저장될 때까지
+        """
+        verdict = self._load_verdicts().get(site_id)
+        if not verdict or verdict['source'] != source or verdict['version'] != version:
+            return None
+        if verdict['valid'] and time.time() >= verdict['expires_at']:
+            return None
+        return verdict['valid']
+    
+    def _remember_verdict(self, site_id: str, source: str, version: float, cookies: List[Dict], valid: bool):
+        """판정 저장 - 유효 기간은 PROBE_TTL과 가장 이른 쿠키 만료 중 빠른 쪽"""
+        now = time.time()
+        expiries = [_cookie_expiry(c) for c in cookies if _cookie_expiry(c)]
+        self._load_verdicts()[site_id] = {
+            'source': source,
+            'version': version,
+            'valid': valid,
+            'checked_at': now,
+            'expires_at': min([now + PROBE_TTL] + expiries)
+        }
+        try:
+            self.verdict_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.verdict_path, 'w', encoding='utf-8') as f:
+                json.dump(self._verdicts, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"  Could not save session verdict: {e}")
+    
     async def _direct_login(self, site_id: str, page: Page, settings_path: Path) -> bool:
         """ID/PW로 직접 로그인"""
         try:
@@ -111,8 +230,7 @@ class SmartLoginManager:
                 return False
             
             # 로그인 페이지 이동
-            await page.goto(login_url)
-            await page.wait_for_timeout(3000)
+            await page.goto(login_url, wait_until='domcontentloaded')
             
             # 사이트별 셀렉터
             selectors = {
@@ -131,10 +249,10 @@ class SmartLoginManager:
             # 로그인 입력
             await page.fill(site_selectors['username'], username)
             await page.fill(site_selectors['password'], password)
-            await page.keyboard.press('Enter')
             
-            # 결과 대기
-            await page.wait_for_timeout(5000)
+            # 결과 대기 - 로그인 페이지를 벗어날 때까지 (최대 5초)
+            async with self.settler.settle(page, url=lambda url: 'login' not in url.lower()):
+                await page.keyboard.press('Enter')
             
             # 성공 확인
             if 'login' not in page.url.lower():
@@ -152,17 +270,12 @@ class SmartLoginManager:
             return False
     
     async def _save_cookies(self, site_id: str, page: Page):
-        """로그인 성공 후 쿠키 저장"""
-        cookies = await page.context.cookies()
-        
-        # 저장 경로
-        cookie_path = self.sites_dir / site_id / "data" / "cookies.json"
-        cookie_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(cookie_path, 'w', encoding='utf-8') as f:
-            json.dump(cookies, f, ensure_ascii=False, indent=2)
+        """로그인 성공 후 세션 저장 (쿠키 + localStorage, SessionStore)"""
+        snapshot = await self.store.save_context(site_id, page.context)
         
-        print(f"  Saved {len(cookies)} cookies for future use")
+        # 방금 로그인에 성공한 쿠키이므로 다음 시작 때는 프로브도 생략
+        self._remember_verdict(site_id, f"store:{site_id}", snapshot.saved_at, snapshot.cookies, True)
+        print(f"  Saved {len(snapshot.cookies)} cookies for future use")
 
 
 # 사용 예시
@@ -177,7 +290,7 @@ async def example():
         smart = SmartLoginManager()
         
         # 알아서 처리 (쿠키 있으면 쿠키, 없으면 직접 로그인)
-        await smart.login("bizmeka", page)  # 쿠키 사용
+        await smart.login("bizmeka", page, open_main=True)  # 쿠키 사용
         # await smart.login("mekics", page)   # 직접 로그인
         
         await page.wait_for_timeout(60000)
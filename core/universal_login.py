@@ -4,70 +4,84 @@
 범용 로그인 매니저 - 사이트 ID만으로 자동 로그인
 """
 
-import json
-import yaml
-import re
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from playwright.async_api import Page, BrowserContext
 
+from .utils.settle import PageSettler
+from .utils.session_store import default_store
+from .utils.site_config import SiteConfigCache, default_site_configs
+
+
+# 사이트 설정에 셀렉터가 없거나 맞지 않을 때의 기본 후보 (앞쪽 우선)
+USERNAME_SELECTORS = [
+    'input[name="userId"]',
+    'input[name="userid"]',
+    'input[name="username"]',
+    'input[name="id"]',
+    '#userId',
+    '#username',
+    'input[type="text"]:first-of-type'
+]
+PASSWORD_SELECTORS = [
+    'input[type="password"]',
+    'input[name="password"]',
+    'input[name="passwd"]',
+    '#password'
+]
+DEFAULT_SELECTORS = {'username': USERNAME_SELECTORS, 'password': PASSWORD_SELECTORS}
+FILL_TIMEOUT = 2000  # 찾은 입력 필드 채우기 대기 (ms) - 안 되면 다시 찾음
+
+# 필드별로 후보 셀렉터를 순서대로 querySelectorAll 해서 처음 보이는 요소의 [후보 번호, 요소 번호]
+# (잘못된 CSS - 예: 'Enter key' - 는 건너뜀, 필수 필드가 다 나오기 전에는 null → wait_for_function이 다시 평가)
+_RESOLVE_JS = """
+({fields, required}) => {
+    const visible = (el) => {
+        if (el.disabled) return false;
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none' && el.getClientRects().length > 0;
+    };
+    const found = {};
+    for (const [field, selectors] of Object.entries(fields)) {
+        for (let i = 0; i < selectors.length && !(field in found); i++) {
+            let nodes;
+            try { nodes = document.querySelectorAll(selectors[i]); } catch (e) { continue; }
+            const n = Array.prototype.findIndex.call(nodes, visible);
+            if (n >= 0) found[field] = [i, n];
+        }
+    }
+    return required.every((field) => field in found) ? found : null;
+}
+"""
+
+
+async def resolve_selectors(page: Page, candidates: Dict[str, List[Optional[str]]],
+                            required: Iterable[str] = (), timeout: float = 3000) -> Dict[str, Tuple[str, int]]:
+    """후보 셀렉터 전체를 DOM 질의 한 번으로 평가 - 필드별 (셀렉터, 같은 셀렉터 안에서의 요소 순번)
+
+    required 필드가 모두 보일 때까지 최대 timeout(ms) 대기, 시간이 지나면 그때 보이는 것만 반환
+    """
+    fields = {field: [s for s in dict.fromkeys(selectors) if s] for field, selectors in candidates.items()}
+    try:
+        handle = await page.wait_for_function(
+            _RESOLVE_JS, arg={'fields': fields, 'required': list(required)}, timeout=timeout
+        )
+        found = await handle.json_value()
+    except Exception:
+        found = await page.evaluate(_RESOLVE_JS, {'fields': fields, 'required': []})
+    return {field: (fields[field][i], n) for field, (i, n) in found.items()}
+
 
 class UniversalLoginManager:
     """모든 사이트 로그인을 처리하는 범용 매니저"""
     
-    def __init__(self):
+    def __init__(self, site_configs: Optional[SiteConfigCache] = None):
         self.docs_dir = Path("docs")
         self.sites_dir = Path("sites")
-        self.site_configs = {}
-        self._load_all_site_configs()
-    
-    def _load_all_site_configs(self):
-        """모든 SITE_DB 문서 자동 로드"""
-        for doc_file in self.docs_dir.glob("SITE_DB_*.md"):
-            site_name = doc_file.stem.replace("SITE_DB_", "").lower()
-            self.site_configs[site_name] = self._parse_site_doc(doc_file)
-    
-    def _parse_site_doc(self, doc_path: Path) -> Dict[str, Any]:
-        """SITE_DB 문서 파싱"""
-        with open(doc_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        config = {}
-        
-        # YAML 블록 추출
-        yaml_pattern = r'```yaml\n(.*?)\n```'
-        yaml_matches = re.findall(yaml_pattern, content, re.DOTALL)
-        
-        for yaml_content in yaml_matches:
-            try:
-                data = yaml.safe_load(yaml_content)
-                if isinstance(data, dict):
-                    # Authentication 섹션 처리
-                    if 'Authentication' in data:
-                        auth = data['Authentication']
-                        config['login_url'] = auth.get('URL', '')
-                        config['selectors'] = auth.get('Selectors', {})
-                    else:
-                        config.update(data)
-            except:
-                continue
-        
-        # 로그인 URL 백업 추출
-        if not config.get('login_url'):
-            url_match = re.search(r'\*\*로그인 URL\*\*.*?\|\s*(https?://[^\s]+)', content)
-            if url_match:
-                config['login_url'] = url_match.group(1)
-        
-        # 사이트별 설정 파일 확인
-        site_name = doc_path.stem.replace("SITE_DB_", "").lower()
-        settings_path = self.sites_dir / site_name / "config" / "settings.json"
-        
-        if settings_path.exists():
-            with open(settings_path, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-                config['credentials'] = settings.get('credentials', {})
-        
-        return config
+        # SITE_DB 문서/settings.json은 사이트별로 처음 쓰일 때 한 번만 파싱 (디스크 캐시 공유)
+        self.site_configs = site_configs or default_site_configs()
+        self.settler = PageSettler(timeout=5000)
+        self.store = default_store()
     
     async def login(self, site_id: str, page: Page) -> bool:
         """사이트 ID만으로 자동 로그인"""
@@ -75,12 +89,13 @@ class UniversalLoginManager:
         site_id = site_id.lower()
         
         # 설정 확인
-        if site_id not in self.site_configs:
+        site_config = self.site_configs.get_config(site_id)
+        if site_config is None:
             print(f"Error: No configuration found for site '{site_id}'")
-            print(f"Available sites: {list(self.site_configs.keys())}")
+            print(f"Available sites: {self.site_configs.sites()}")
             return False
         
-        config = self.site_configs[site_id]
+        config = site_config.as_dict()
         
         # 필수 정보 확인
         if 'login_url' not in config:
@@ -97,70 +112,39 @@ class UniversalLoginManager:
         
         # 로그인 페이지 이동
         print(f"1. Navigating to: {config['login_url']}")
-        await page.goto(config['login_url'])
-        await page.wait_for_timeout(3000)
-        
-        # 사용자명 입력
-        username = config['credentials'].get('username', '')
-        password = config['credentials'].get('password', '')
-        
-        print(f"2. Entering username: {username}")
-        
-        # 여러 셀렉터 시도
-        username_selectors = [
-            config.get('selectors', {}).get('username'),
-            'input[name="userId"]',
-            'input[name="userid"]', 
-            'input[name="username"]',
-            'input[name="id"]',
-            '#userId',
-            '#username',
-            'input[type="text"]:first-of-type'
-        ]
-        
-        for selector in username_selectors:
-            if selector:
-                try:
-                    await page.fill(selector, username)
-                    print(f"   Success with: {selector}")
-                    break
-                except:
-                    continue
-        
-        # 비밀번호 입력
-        print("3. Entering password")
-        password_selectors = [
-            config.get('selectors', {}).get('password'),
-            'input[type="password"]',
-            'input[name="password"]',
-            'input[name="passwd"]',
-            '#password'
-        ]
-        
-        for selector in password_selectors:
-            if selector:
-                try:
-                    await page.fill(selector, password)
-                    break
-                except:
-                    continue
+        await page.goto(config['login_url'], wait_until='domcontentloaded')
+        
+        # 사용자명/비밀번호/제출 버튼 후보 (기록된 셀렉터 → SITE_DB 셀렉터 → 기본 후보)
+        selectors = site_config.selectors
+        candidates = {}
+        for field in ('username', 'password', 'submit'):
+            defaults = DEFAULT_SELECTORS.get(field, [])
+            resolved = site_config.resolved.get(field)
+            if resolved in defaults:  # 예전에 기록된 기본 후보는 앞세우지 않음
+                resolved = None
+            candidates[field] = [resolved, selectors.get(field)] + defaults
+        
+        matched = await self._fill_credentials(page, candidates, config['credentials'])
+        if matched is None:
+            print("\nLogin failed: could not fill the login form")
+            return False
         
         # 로그인 시도
         print("4. Attempting login")
         
-        # 제출 버튼 또는 Enter
-        submit_selector = config.get('selectors', {}).get('submit')
-        if submit_selector:
-            try:
-                await page.click(submit_selector)
-            except:
+        # 제출 버튼 또는 Enter - 로그인 페이지를 벗어날 때까지 대기 (최대 5초)
+        async with self.settler.settle(page, url=lambda url: 'login' not in url.lower()):
+            if 'submit' in matched:
+                selector, index = matched['submit']
+                try:
+                    await page.locator(selector).nth(index).click(timeout=3000)
+                except:
+                    await page.keyboard.press('Enter')
+            else:
                 await page.keyboard.press('Enter')
-        else:
-            await page.keyboard.press('Enter')
-        
-        # 결과 대기
-        print("5. Waiting for result...")
-        await page.wait_for_timeout(5000)
+            
+            # 결과 대기
+            print("5. Waiting for result...")
         
         # 성공 여부 확인
         current_url = page.url
@@ -168,6 +152,13 @@ class UniversalLoginManager:
             print(f"\nSUCCESS! Logged in to {site_id}")
             print(f"Current URL: {current_url}")
             
+            # 이번에 맞은 셀렉터 기록 - 다음 로그인에서 먼저 시도
+            # (기본 후보로 맞았으면 기록하지 않음 - 'input[type="text"]:first-of-type' 같은 것이 굳지 않도록)
+            self.site_configs.remember_selectors(site_id, {
+                field: selector if selector == selectors.get(field) or selector not in DEFAULT_SELECTORS.get(field, []) else None
+                for field, (selector, _) in matched.items()
+            })
+            
             # 쿠키 저장
             await self._save_cookies(site_id, page.context)
             return True
@@ -176,32 +167,51 @@ class UniversalLoginManager:
             print(f"Current URL: {current_url}")
             return False
     
+    async def _fill_credentials(self, page: Page, candidates: Dict[str, List[Optional[str]]],
+                                credentials: Dict[str, str]) -> Optional[Dict[str, Tuple[str, int]]]:
+        """후보를 DOM 질의 한 번으로 평가하고(폼이 그려질 때까지 최대 3초) 사용자명/비밀번호 입력
+
+        채우기가 실패하면(폼이 다시 그려짐 등) 한 번 다시 찾아서 시도, 그래도 실패하면 None
+        """
+        for _ in range(2):
+            matched = await resolve_selectors(page, candidates, required=('username', 'password'))
+            try:
+                # 사용자명 입력
+                print(f"2. Entering username: {credentials.get('username', '')}")
+                if 'username' in matched:
+                    selector, index = matched['username']
+                    await page.locator(selector).nth(index).fill(credentials.get('username', ''), timeout=FILL_TIMEOUT)
+                    print(f"   Success with: {selector}")
+                else:
+                    print("   No visible username field")
+                
+                # 비밀번호 입력
+                print("3. Entering password")
+                if 'password' in matched:
+                    selector, index = matched['password']
+                    await page.locator(selector).nth(index).fill(credentials.get('password', ''), timeout=FILL_TIMEOUT)
+                return matched
+            except Exception as e:
+                print(f"   Fill failed with {selector}: {e}")
+        return None
+    
     async def _save_cookies(self, site_id: str, context: BrowserContext):
-        """쿠키 저장"""
-        cookies = await context.cookies()
-        cookie_path = self.sites_dir / site_id / "data" / "cookies.json"
-        cookie_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(cookie_path, 'w', encoding='utf-8') as f:
-            json.dump(cookies, f, ensure_ascii=False, indent=2)
-        
-        print(f"Cookies saved: {len(cookies)} cookies")
+        """세션 저장 (쿠키 + localStorage, SessionStore)"""
+        snapshot = await self.store.save_context(site_id, context)
+        print(f"Cookies saved: {len(snapshot.cookies)} cookies")
     
     async def load_cookies(self, site_id: str, context: BrowserContext) -> bool:
         """저장된 쿠키 로드"""
-        cookie_path = self.sites_dir / site_id / "data" / "cookies.json"
-        
-        if cookie_path.exists():
-            with open(cookie_path, 'r', encoding='utf-8') as f:
-                cookies = json.load(f)
-            await context.add_cookies(cookies)
-            print(f"Loaded {len(cookies)} cookies for {site_id}")
+        snapshot = self.store.get(site_id, include_expired=True)
+        if snapshot and await self.store.apply(site_id, context):
+            print(f"Loaded {len(snapshot.cookies)} cookies for {site_id}")
             return True
         return False
     
     def get_site_config(self, site_id: str) -> Dict[str, Any]:
         """사이트 설정 반환"""
-        return self.site_configs.get(site_id.lower(), {})
+        site_config = self.site_configs.get_config(site_id)
+        return site_config.as_dict() if site_config else {}
 
 
 # 사용 예시
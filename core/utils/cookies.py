@@ -2,45 +2,41 @@
 # -*- coding: utf-8 -*-
 """
 CookieManager - 쿠키 관리 유틸리티
+실제 저장은 SessionStore (sites/{site}/data/storage_state.json)가 담당하고,
+여기서는 기존 쿠키 목록 인터페이스만 유지
 """
 
-import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from .session_store import SessionStore, default_store
 
 
 class CookieManager:
     """쿠키 관리 클래스"""
-    
-    def __init__(self, site_name: str):
+
+    def __init__(self, site_name: str, store: Optional[SessionStore] = None):
         self.site_name = site_name
+        self.store = store or default_store()
         self.site_dir = Path(f"sites/{site_name}")
-        self.data_dir = self.site_dir / "data" 
-        self.cookie_path = self.data_dir / "cookies.json"
-    
+        self.data_dir = self.site_dir / "data"
+        self.cookie_path = self.store.state_path(site_name)
+
     def load_cookies(self) -> List[Dict]:
-        """쿠키 로드"""
-        if self.cookie_path.exists():
-            try:
-                with open(self.cookie_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return []
-    
+        """쿠키 로드 (메모리 스냅샷, 파일이 바뀐 경우에만 다시 읽음)"""
+        snapshot = self.store.get(self.site_name, include_expired=True)
+        return list(snapshot.cookies) if snapshot else []
+
     def save_cookies(self, cookies: List[Dict]):
-        """쿠키 저장"""
+        """쿠키 저장 (localStorage는 유지)"""
         try:
-            self.data_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.cookie_path, 'w', encoding='utf-8') as f:
-                json.dump(cookies, f, indent=2)
+            self.store.put_cookies(self.site_name, cookies)
         except Exception:
             pass
-    
+
     def clear_cookies(self):
         """쿠키 삭제"""
         try:
-            if self.cookie_path.exists():
-                self.cookie_path.unlink()
+            self.store.delete(self.site_name)
         except Exception:
-            pass
\ No newline at end of file
+            pass
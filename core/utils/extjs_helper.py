@@ -9,6 +9,11 @@ from typing import Dict, List, Any, Optional
 import asyncio
 from playwright.async_api import Page
 
+try:
+    from .settle import PageSettler
+except ImportError:  # scripts/가 core/utils를 sys.path에 넣고 extjs_helper를 직접 import하는 경우
+    from settle import PageSettler
+
 
 class ExtJSHelper:
     """ExtJS 애플리케이션 스크래핑 헬퍼"""
@@ -19,6 +24,7 @@ class ExtJSHelper:
             page: Playwright Page 객체
         """
         self.page = page
+        self.settler = PageSettler(timeout=30000)
     
     async def wait_for_extjs(self, timeout: int = 30000) -> bool:
         """ExtJS 프레임워크 로드 완료 대기
@@ -523,19 +529,20 @@ class MEKICSHelper(ExtJSHelper):
             return False
         
         try:
-            result = await self.page.evaluate(f"""
-                () => {{
-                    if (typeof changeModule === 'function') {{
-                        changeModule('{module_id}');
-                        return true;
+            # 모듈 화면의 Ajax 요청이 끝나고 로딩 마스크가 걷힐 때까지 대기
+            async with self.settler.settle(self.page, load_mask=True):
+                result = await self.page.evaluate(f"""
+                    () => {{
+                        if (typeof changeModule === 'function') {{
+                            changeModule('{module_id}');
+                            return true;
+                        }}
+                        return false;
                     }}
-                    return false;
-                }}
-            """)
+                """)
             
             if result:
                 print(f"[MEK-ICS] '{module_name}' 모듈로 이동")
-                await self.wait_for_loading()
             
             return result
             
@@ -4,14 +4,26 @@
 Navigator - 페이지 네비게이션 유틸리티
 """
 
-from typing import List
+from typing import List, Optional
 from playwright.async_api import Page
 
+from .settle import PageSettler
+
 
 class Navigator:
     """페이지 네비게이션 처리 클래스"""
     
-    def __init__(self):
+    def __init__(self, list_selector: Optional[str] = None, settler: Optional[PageSettler] = None):
+        """
+        Args:
+            list_selector: 페이지 이동 후 내용이 바뀌는 목록 컨테이너 선택자
+                           ('body'처럼 넓게 잡으면 애니메이션 등으로 조용해지지 않음,
+                            없으면 클릭 후 문서 로드만 기다림)
+            settler: 이동 완료 대기에 사용할 PageSettler
+        """
+        self.list_selector = list_selector
+        self.settler = settler or PageSettler(timeout=5000)
+        
         self.page_selectors = [
             'a:has-text("{page_num}")',
             'button:has-text("{page_num}")',
@@ -35,8 +47,7 @@ class Navigator:
                 try:
                     element = await page.wait_for_selector(selector, timeout=2000)
                     if element:
-                        await element.click()
-                        await page.wait_for_timeout(2000)
+                        await self._click_and_settle(page, element)
                         return True
                 except:
                     continue
@@ -53,8 +64,7 @@ class Navigator:
                 try:
                     element = await page.wait_for_selector(selector, timeout=2000)
                     if element:
-                        await element.click()
-                        await page.wait_for_timeout(2000)
+                        await self._click_and_settle(page, element)
                         return True
                 except:
                     continue
@@ -62,4 +72,13 @@ class Navigator:
             return False
             
         except Exception:
-            return False
\ No newline at end of file
+            return False
+    
+    async def _click_and_settle(self, page: Page, element):
+        """클릭 후 목록 컨테이너의 DOM 변경이 잦아들 때까지 대기"""
+        if not self.list_selector:
+            await element.click()
+            await page.wait_for_load_state('load', timeout=self.settler.timeout)
+            return
+        async with self.settler.settle(page, mutation=self.list_selector):
+            await element.click()
@@ -29,6 +29,8 @@ class PopupHandler:
             '.modal-close',
             '.close-button'
         ]
+        
+        self.overlay_selector = 'div.ui-widget-overlay, .modal-overlay, .popup-overlay'
     
     async def close_all(self, page: Page, max_attempts: int = 5) -> bool:
         """모든 팝업 닫기"""
@@ -38,7 +40,7 @@ class PopupHandler:
             try:
                 # 1. ESC 키 시도 (가장 효과적)
                 await page.keyboard.press('Escape')
-                await page.wait_for_timeout(300)
+                await self._wait_overlay_hidden(page, 300)
                 
                 # 2. X 버튼 클릭 시도
                 for selector in self.close_selectors:
@@ -47,20 +49,22 @@ class PopupHandler:
                         if close_btn:
                             await close_btn.click()
                             closed_count += 1
-                            await page.wait_for_timeout(300)
+                            # 고정 대기 대신 버튼이 사라지는 것을 확인
+                            try:
+                                await close_btn.wait_for_element_state('hidden', timeout=300)
+                            except:
+                                pass
                             break
                     except:
                         continue
                 
                 # 3. 오버레이 확인 후 ESC
-                overlay = await page.query_selector('div.ui-widget-overlay, .modal-overlay, .popup-overlay')
+                overlay = await page.query_selector(self.overlay_selector)
                 if overlay:
                     await page.keyboard.press('Escape')
-                    await page.wait_for_timeout(500)
                     
                     # 오버레이가 사라졌는지 확인
-                    overlay_check = await page.query_selector('div.ui-widget-overlay, .modal-overlay, .popup-overlay')
-                    if not overlay_check:
+                    if await self._wait_overlay_hidden(page, 500):
                         closed_count += 1
                 else:
                     # 더 이상 팝업이 없으면 종료
@@ -104,10 +108,18 @@ class PopupHandler:
         try:
             # 오버레이나 모달이 사라질 때까지 대기
             await page.wait_for_selector(
-                'div.ui-widget-overlay, .modal-overlay, .popup-overlay', 
+                self.overlay_selector, 
                 state='detached', 
                 timeout=timeout
             )
             return True
         except:
-            return False
\ No newline at end of file
+            return False
+    
+    async def _wait_overlay_hidden(self, page: Page, timeout: int) -> bool:
+        """오버레이가 숨겨질 때까지 대기 - 오버레이가 없으면 즉시 반환"""
+        try:
+            await page.wait_for_selector(self.overlay_selector, state='hidden', timeout=timeout)
+            return True
+        except:
+            return False
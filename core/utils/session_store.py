@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+SessionStore - 사이트별 인증 상태(Playwright storage_state) 공용 저장소
+- 메모리: 사이트당 스냅샷 하나 (쿠키 + localStorage), 저장소가 바뀌었을 때만 다시 읽음
+- 영속화: sites/{site}/data/storage_state.json (Playwright가 그대로 읽는 형식) 또는 SQLite
+  (예전 cookies.json도 읽어서 둘 중 최근 파일을 사용, 저장할 때 cookies.json에도 쿠키 목록을 같이 씀
+   - 아직 cookies.json을 직접 읽고 쓰는 스크립트들이 옮겨올 때까지)
+- 브라우저: 여러 컨텍스트가 같은 스냅샷 dict로 new_context (파일 재파싱 없음)
+- HTTP: 스냅샷마다 한 번 만든 CookieJar를 requests.Session / httpx 클라이언트가 복사 없이 공유
+- 만료: 인증 쿠키의 가장 이른 만료 시각 (max_age가 있으면 저장 시각 + max_age까지)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from http.cookiejar import Cookie, CookieJar
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from playwright.async_api import Browser, BrowserContext
+
+# requests가 있으면 dict처럼도 쓸 수 있는 CookieJar
+try:
+    from requests.cookies import RequestsCookieJar as _Jar
+except ImportError:
+    _Jar = CookieJar
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    site      TEXT PRIMARY KEY,
+    state     TEXT NOT NULL,
+    saved_at  REAL NOT NULL
+);
+"""
+
+# 세션 만료 판단에 쓰는 쿠키 (없는 사이트는 '_'로 시작하지 않는 영속 쿠키 전체 - _ga, _gat 등 분석용 제외)
+AUTH_COOKIES = {
+    'bizmeka': ['JSESSIONID', 'rememberMe', 'autoLogin'],
+    'mekics': ['JSESSIONID']
+}
+
+
+def _to_cookie(cookie: Dict) -> Cookie:
+    """Playwright 쿠키 dict → http.cookiejar.Cookie"""
+    domain = cookie.get('domain', '')
+    expires = cookie.get('expires') or -1
+    return Cookie(
+        version=0, name=cookie['name'], value=cookie.get('value', ''),
+        port=None, port_specified=False,
+        domain=domain, domain_specified=bool(domain), domain_initial_dot=domain.startswith('.'),
+        path=cookie.get('path', '/'), path_specified=True,
+        secure=bool(cookie.get('secure')),
+        expires=int(expires) if expires > 0 else None,
+        discard=expires <= 0,
+        comment=None, comment_url=None,
+        rest={'HttpOnly': None} if cookie.get('httpOnly') else {},
+        rfc2109=False
+    )
+
+
+def _from_cookie(cookie: Cookie, previous: Optional[Dict] = None) -> Dict:
+    """http.cookiejar.Cookie → Playwright 쿠키 dict (sameSite는 기존 값 유지)"""
+    return {
+        'name': cookie.name,
+        'value': cookie.value,
+        'domain': cookie.domain,
+        'path': cookie.path,
+        'expires': float(cookie.expires) if cookie.expires else -1,
+        'httpOnly': cookie.has_nonstandard_attr('HttpOnly'),
+        'secure': bool(cookie.secure),
+        'sameSite': (previous or {}).get('sameSite', 'Lax')
+    }
+
+
+class SessionSnapshot:
+    """사이트 하나의 인증 상태 - 여러 컨텍스트/HTTP 클라이언트가 공유하므로 state는 수정하지 않음"""
+
+    def __init__(self, site: str, state: Dict, saved_at: float,
+                 max_age: Optional[float] = None, auth_cookies: Optional[List[str]] = None):
+        self.site = site
+        self.state = state
+        self.saved_at = saved_at
+        self.max_age = max_age
+        self.auth_cookies = auth_cookies
+        self._jar: Optional[CookieJar] = None
+        self._lock = threading.Lock()
+
+    @property
+    def cookies(self) -> List[Dict]:
+        return self.state.get('cookies', [])
+
+    @property
+    def origins(self) -> List[Dict]:
+        return self.state.get('origins', [])
+
+    def local_storage(self, origin: str) -> Dict[str, str]:
+        """origin의 localStorage"""
+        for entry in self.origins:
+            if entry.get('origin') == origin:
+                return {item['name']: item['value'] for item in entry.get('localStorage', [])}
+        return {}
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """세션 만료 시각 (인증 쿠키가 전부 세션 쿠키고 max_age도 없으면 None)"""
+        if self.auth_cookies:
+            tracked = [c for c in self.cookies if c['name'] in self.auth_cookies]
+        else:
+            tracked = [c for c in self.cookies if not c['name'].startswith('_')]
+        candidates = [c['expires'] for c in tracked if (c.get('expires') or -1) > 0]
+        if self.max_age:
+            candidates.append(self.saved_at + self.max_age)
+        return min(candidates) if candidates else None
+
+    def ttl(self) -> Optional[float]:
+        """만료까지 남은 시간 (초, 음수면 이미 만료)"""
+        expires_at = self.expires_at
+        return None if expires_at is None else expires_at - time.time()
+
+    @property
+    def expired(self) -> bool:
+        ttl = self.ttl()
+        return ttl is not None and ttl <= 0
+
+    def current_state(self) -> Dict:
+        """HTTP 클라이언트가 받은 Set-Cookie까지 반영한 storage_state (jar를 아직 안 만들었으면 원본)"""
+        if self._jar is None:
+            return self.state
+        previous = {(c['name'], c['domain'], c['path']): c for c in self.cookies}
+        cookies = [_from_cookie(c, previous.get((c.name, c.domain, c.path))) for c in list(self._jar)]
+        return {'cookies': cookies, 'origins': self.origins}
+
+    @property
+    def cookie_jar(self) -> CookieJar:
+        """스냅샷 쿠키의 CookieJar - 한 번만 만들고 공유 (requests.Session.cookies / httpx cookies=에 그대로)
+
+        공유 객체이므로 HTTP 응답의 Set-Cookie는 이 스냅샷을 쓰는 모든 클라이언트에 반영된다.
+        """
+        if self._jar is None:
+            with self._lock:
+                if self._jar is None:
+                    jar = _Jar()
+                    for cookie in self.cookies:
+                        jar.set_cookie(_to_cookie(cookie))
+                    self._jar = jar
+        return self._jar
+
+
+class SessionStore:
+    """사이트별 storage_state 저장소 (스레드 안전)"""
+
+    def __init__(self, root: str = "sites", db_path: Optional[str] = None,
+                 max_age: Optional[float] = None, auth_cookies: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            root: 사이트 디렉터리 루트 (파일 저장 시 {root}/{site}/data/storage_state.json)
+            db_path: SQLite 파일 경로 (지정하면 파일 대신 SQLite에 저장)
+            max_age: 저장 후 이 시간(초)이 지나면 만료로 간주 (서버 측 세션 수명)
+            auth_cookies: 사이트별 만료 판단 쿠키 이름 (기본: AUTH_COOKIES)
+        """
+        self.root = Path(root)
+        self.max_age = max_age
+        self.auth_cookies = AUTH_COOKIES if auth_cookies is None else auth_cookies
+        self._snapshots: Dict[str, SessionSnapshot] = {}
+        self._versions: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.RLock()
+
+        self._conn = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+
+    def state_path(self, site: str) -> Path:
+        return self.root / site / "data" / "storage_state.json"
+
+    def _legacy_path(self, site: str) -> Path:
+        return self.root / site / "data" / "cookies.json"
+
+    # ============ 조회 ============
+    def get(self, site: str, include_expired: bool = False) -> Optional[SessionSnapshot]:
+        """사이트 스냅샷 (없거나 만료됐으면 None)"""
+        with self._lock:
+            snapshot = self._load(site)
+        if snapshot is None or (snapshot.expired and not include_expired):
+            return None
+        return snapshot
+
+    def _load(self, site: str) -> Optional[SessionSnapshot]:
+        """메모리 스냅샷 - 저장소 버전(파일 mtime / 저장 시각)이 바뀌었을 때만 다시 읽음"""
+        if self._conn is not None:
+            row = self._conn.execute("SELECT saved_at FROM sessions WHERE site=?", (site,)).fetchone()
+            version = ('db', row[0]) if row else None
+        else:
+            # 예전 스크립트가 cookies.json만 새로 썼을 수 있으므로 최근 파일 (같으면 storage_state.json)
+            versions = []
+            for path in (self.state_path(site), self._legacy_path(site)):
+                try:
+                    versions.append((str(path), path.stat().st_mtime))
+                except OSError:
+                    continue
+            version = max(versions, key=lambda v: v[1]) if versions else None
+
+        if version is None:
+            self._snapshots.pop(site, None)
+            self._versions.pop(site, None)
+            return None
+        if self._versions.get(site) == version:
+            return self._snapshots[site]
+
+        try:
+            if self._conn is not None:
+                data = json.loads(self._conn.execute(
+                    "SELECT state FROM sessions WHERE site=?", (site,)
+                ).fetchone()[0])
+            else:
+                with open(version[0], 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"⚠️ 세션 상태 로드 실패 ({site}): {e}")
+            return None
+
+        # cookies.json(쿠키 목록)도 storage_state 형식으로
+        state = data if isinstance(data, dict) else {'cookies': data, 'origins': []}
+        return self._remember(site, state, version)
+
+    def _remember(self, site: str, state: Dict, version: Tuple[str, float]) -> SessionSnapshot:
+        snapshot = SessionSnapshot(site, state, version[1], self.max_age, self.auth_cookies.get(site))
+        self._snapshots[site] = snapshot
+        self._versions[site] = version
+        return snapshot
+
+    # ============ 저장 ============
+    def put(self, site: str, state: Dict) -> SessionSnapshot:
+        """스냅샷 교체 + 영속화 (파일은 임시 파일에 쓴 뒤 교체 → 다른 프로세스가 반쯤 쓰인 파일을 읽지 않음)"""
+        state = {'cookies': list(state.get('cookies', [])), 'origins': list(state.get('origins', []))}
+        with self._lock:
+            # 예전 스크립트용 cookies.json을 먼저 써서 storage_state.json이 항상 같거나 더 최근
+            self._write_json(self._legacy_path(site), state['cookies'])
+            if self._conn is not None:
+                saved_at = time.time()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (site, state, saved_at) VALUES (?,?,?)",
+                    (site, json.dumps(state, ensure_ascii=False), saved_at)
+                )
+                self._conn.commit()
+                version = ('db', saved_at)
+            else:
+                path = self.state_path(site)
+                self._write_json(path, state)
+                version = (str(path), path.stat().st_mtime)
+            return self._remember(site, state, version)
+
+    @staticmethod
+    def _write_json(path: Path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+    def put_cookies(self, site: str, cookies: List[Dict]) -> SessionSnapshot:
+        """쿠키만 교체 (localStorage는 유지)"""
+        current = self.get(site, include_expired=True)
+        return self.put(site, {'cookies': cookies, 'origins': current.origins if current else []})
+
+    def delete(self, site: str):
+        """사이트 상태 삭제 (예전 cookies.json 포함)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM sessions WHERE site=?", (site,))
+                self._conn.commit()
+            for path in (self.state_path(site), self._legacy_path(site)):
+                if path.exists():
+                    path.unlink()
+            self._snapshots.pop(site, None)
+            self._versions.pop(site, None)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ============ 브라우저 ============
+    async def save_context(self, site: str, context: BrowserContext) -> SessionSnapshot:
+        """컨텍스트의 storage_state(쿠키 + localStorage) 저장"""
+        return self.put(site, await context.storage_state())
+
+    async def new_context(self, browser: Browser, site: str, **context_options) -> BrowserContext:
+        """저장된 상태로 새 컨텍스트 생성 - 동시에 여러 개를 만들어도 같은 스냅샷 dict를 사용"""
+        snapshot = self.get(site, include_expired=True)
+        if snapshot is not None:
+            context_options.setdefault('storage_state', snapshot.state)
+        return await browser.new_context(**context_options)
+
+    async def apply(self, site: str, context: BrowserContext) -> bool:
+        """이미 만든 컨텍스트에 쿠키 적용 (localStorage는 new_context에서만 적용됨)"""
+        snapshot = self.get(site, include_expired=True)
+        if snapshot is None or not snapshot.cookies:
+            return False
+        await context.add_cookies(snapshot.cookies)
+        return True
+
+    # ============ HTTP ============
+    def requests_session(self, site: str, session=None):
+        """스냅샷 쿠키를 쓰는 requests.Session (CookieJar는 스냅샷과 공유)"""
+        import requests
+
+        session = session or requests.Session()
+        snapshot = self.get(site, include_expired=True)
+        if snapshot is not None:
+            session.cookies = snapshot.cookie_jar
+        return session
+
+    def httpx_client(self, site: str, asynchronous: bool = False, **client_options):
+        """스냅샷 쿠키를 쓰는 httpx.Client / AsyncClient (httpx는 CookieJar를 감싸기만 하고 복사하지 않음)"""
+        import httpx
+
+        snapshot = self.get(site, include_expired=True)
+        if snapshot is not None:
+            client_options.setdefault('cookies', snapshot.cookie_jar)
+        return (httpx.AsyncClient if asynchronous else httpx.Client)(**client_options)
+
+
+_default_store: Optional[SessionStore] = None
+_default_lock = threading.Lock()
+
+
+def default_store() -> SessionStore:
+    """프로세스 공용 저장소 (sites/ 파일 기반) - 같은 프로세스의 작업들이 스냅샷을 공유"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = SessionStore()
+        return _default_store
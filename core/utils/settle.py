@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+PageSettler - 이벤트 기반 대기 유틸리티
+고정 wait_for_timeout 대신 실제 신호(네트워크 응답, DOM 변경, ExtJS Store 로드,
+로딩 마스크 해제, URL 변경)를 기다린다. 모든 대기에는 하드 타임아웃이 있다.
+"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional, Union
+
+from playwright.async_api import Frame, Page, Response
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+_ARM_MUTATION_JS = """
+([selector, token]) => {
+    const el = document.querySelector(selector);
+    if (!el) return false;
+    window.__autoinputSettle = window.__autoinputSettle || {};
+    const state = {changed: false, last: 0, observer: null};
+    state.observer = new MutationObserver(() => {
+        state.changed = true;
+        state.last = performance.now();
+    });
+    state.observer.observe(el, {childList: true, subtree: true, characterData: true, attributes: true});
+    window.__autoinputSettle[token] = state;
+    return true;
+}
+"""
+
+_MUTATION_SETTLED_JS = """
+([token, quietMs]) => {
+    // 상태가 없으면 문서가 바뀐 것 (이동/새로고침) → 호출 쪽에서 새 문서 로드를 기다림
+    const state = window.__autoinputSettle && window.__autoinputSettle[token];
+    if (!state) return 'navigated';
+    // 대기 시작 후 마지막 변경(없으면 대기 시작)부터 quietMs 동안 조용하면 완료 - 아무것도 안 바뀌는 클릭도 quietMs 만에 끝남
+    state.waiting = state.waiting || performance.now();
+    return performance.now() - Math.max(state.last, state.waiting) >= quietMs ? 'settled' : false;
+}
+"""
+
+_DISARM_JS = """
+(token) => {
+    const state = window.__autoinputSettle && window.__autoinputSettle[token];
+    if (state) {
+        if (state.observer) state.observer.disconnect();
+        delete window.__autoinputSettle[token];
+    }
+}
+"""
+
+_ARM_STORE_JS = """
+([storeId, token]) => {
+    if (typeof Ext === 'undefined') return false;
+    const store = Ext.StoreManager.lookup(storeId);
+    if (!store) return false;
+    window.__autoinputSettle = window.__autoinputSettle || {};
+    const state = {changed: false};
+    store.on('load', () => { state.changed = true; }, null, {single: true});
+    window.__autoinputSettle[token] = state;
+    return true;
+}
+"""
+
+_STORE_LOADED_JS = """
+(token) => {
+    const state = window.__autoinputSettle && window.__autoinputSettle[token];
+    return !!state && state.changed;
+}
+"""
+
+_ARM_AJAX_JS = """
+(token) => {
+    if (typeof Ext === 'undefined' || !Ext.Ajax || !Ext.Ajax.on) return false;
+    window.__autoinputSettle = window.__autoinputSettle || {};
+    const state = {requests: 0, waiting: 0};
+    state.listener = () => { state.requests += 1; };
+    Ext.Ajax.on('beforerequest', state.listener);
+    window.__autoinputSettle[token] = state;
+    return true;
+}
+"""
+
+_DISARM_AJAX_JS = """
+(token) => {
+    const state = window.__autoinputSettle && window.__autoinputSettle[token];
+    if (state) {
+        Ext.Ajax.un('beforerequest', state.listener);
+        delete window.__autoinputSettle[token];
+    }
+}
+"""
+
+_LOAD_MASK_GONE_JS = """
+([token, quietMs]) => {
+    // 동작이 요청을 비동기로 시작하면 마스크가 뜨기 전에 통과할 수 있으므로,
+    // 요청이 시작됐거나 quietMs 동안 시작되지 않았을 때부터 판단
+    const state = window.__autoinputSettle && window.__autoinputSettle[token];
+    if (state) {
+        state.waiting = state.waiting || performance.now();
+        if (!state.requests && performance.now() - state.waiting < quietMs) return false;
+    }
+    if (typeof Ext !== 'undefined') {
+        if (Ext.Ajax && Ext.Ajax.isLoading && Ext.Ajax.isLoading()) return false;
+        if (Ext.ComponentQuery) {
+            const masks = Ext.ComponentQuery.query('loadmask');
+            if (masks.some(mask => mask.isVisible())) return false;
+        }
+    }
+    const domMasks = document.querySelectorAll('.x-mask-msg, .x-mask, .loading, .loadmask');
+    for (const mask of domMasks) {
+        if (mask.offsetParent !== null) return false;
+    }
+    return true;
+}
+"""
+
+
+class PageSettler:
+    """구체적인 신호를 기다리는 대기 클래스
+
+    사용 예:
+        settler = PageSettler()
+        async with settler.settle(page, response='list.do', mutation='ul.mail_list'):
+            await link.click()
+
+    mutation은 실제로 바뀌는 목록 컨테이너를 지정해야 한다 ('body'처럼 넓으면 애니메이션 등으로 조용해지지 않음).
+    """
+
+    _tokens = itertools.count()
+
+    def __init__(self, timeout: int = 10000, quiet_ms: int = 150):
+        """
+        Args:
+            timeout: 하드 타임아웃 (밀리초)
+            quiet_ms: DOM 변경 후 추가 변경이 없어야 하는 시간 (밀리초)
+        """
+        self.timeout = timeout
+        self.quiet_ms = quiet_ms
+        self.last_result: Dict[str, bool] = {}
+        self.last_elapsed = 0.0
+
+    @asynccontextmanager
+    async def settle(self, page: Union[Page, Frame],
+                     response: Optional[Union[str, Callable[[Response], bool]]] = None,
+                     mutation: Optional[str] = None,
+                     store_id: Optional[str] = None,
+                     load_mask: bool = False,
+                     url: Optional[Union[str, Callable[[str], bool]]] = None,
+                     timeout: Optional[int] = None):
+        """블록 안의 동작 전에 신호를 걸어두고, 블록이 끝나면 신호를 기다림
+
+        Args:
+            page: Page 또는 Frame
+            response: 기다릴 응답의 URL 일부 또는 판별 함수
+            mutation: 변경을 감시할 컨테이너 선택자 - quiet_ms 동안 변경이 없으면 완료,
+                      문서가 바뀌었으면(이동/새로고침) 새 문서 로드까지 대기
+            store_id: load 이벤트를 기다릴 ExtJS Store ID
+            load_mask: 로딩 마스크가 사라지고 Ext.Ajax 요청이 끝날 때까지 대기
+            url: 이동 후 URL 조건 (URL 일부 또는 판별 함수)
+            timeout: 하드 타임아웃 (밀리초, 기본값은 self.timeout)
+
+        결과는 self.last_result에 신호별 성공 여부로 기록된다.
+        """
+        timeout = timeout or self.timeout
+        owner = page.page if isinstance(page, Frame) else page
+        token = f"settle_{next(self._tokens)}"
+        started = time.monotonic()
+        waiters: Dict[str, asyncio.Future] = {}
+        armed_mutation = False
+        armed_store = False
+        armed_ajax = False
+
+        # 1. 동작 전에 신호 준비
+        if response is not None:
+            predicate = response if callable(response) else (lambda r, part=response: part in r.url)
+            waiters['response'] = asyncio.ensure_future(
+                owner.wait_for_event('response', predicate=predicate, timeout=timeout)
+            )
+
+        if mutation:
+            try:
+                armed_mutation = await page.evaluate(_ARM_MUTATION_JS, [mutation, token])
+            except Exception:
+                armed_mutation = False
+
+        if store_id:
+            try:
+                armed_store = await page.evaluate(_ARM_STORE_JS, [store_id, token])
+            except Exception:
+                armed_store = False
+
+        if load_mask:
+            try:
+                armed_ajax = await page.evaluate(_ARM_AJAX_JS, f"{token}_ajax")
+            except Exception:
+                armed_ajax = False
+
+        try:
+            yield self
+        except BaseException:
+            for waiter in waiters.values():
+                waiter.cancel()
+            raise
+
+        # 2. 동작 후 신호 대기 (남은 시간 안에서)
+        def remaining() -> int:
+            return max(1, int(timeout - (time.monotonic() - started) * 1000))
+
+        if url is not None:
+            url_predicate = url if callable(url) else (lambda u, part=url: part in u)
+            waiters['url'] = asyncio.ensure_future(owner.wait_for_url(url_predicate, timeout=remaining()))
+
+        if armed_mutation:
+            waiters['mutation'] = asyncio.ensure_future(self._wait_mutation(page, token, remaining))
+
+        if armed_store:
+            waiters['store'] = asyncio.ensure_future(page.wait_for_function(
+                _STORE_LOADED_JS, arg=token, timeout=remaining()
+            ))
+
+        result = {}
+        for name, waiter in waiters.items():
+            try:
+                await waiter
+                result[name] = True
+            except Exception:
+                result[name] = False
+
+        if load_mask:
+            try:
+                await page.wait_for_function(
+                    _LOAD_MASK_GONE_JS, arg=[f"{token}_ajax", self.quiet_ms], timeout=remaining()
+                )
+                result['load_mask'] = True
+            except Exception:
+                result['load_mask'] = False
+
+        if armed_mutation or armed_store:
+            try:
+                await page.evaluate(_DISARM_JS, token)
+            except Exception:
+                pass
+        if armed_ajax:
+            try:
+                await page.evaluate(_DISARM_AJAX_JS, f"{token}_ajax")
+            except Exception:
+                pass
+
+        self.last_result = result
+        self.last_elapsed = time.monotonic() - started
+
+    async def _wait_mutation(self, page: Union[Page, Frame], token: str, remaining: Callable[[], int]):
+        """컨테이너가 조용해질 때까지 - 감시 중 문서가 바뀌었으면 새 문서의 load까지"""
+        try:
+            handle = await page.wait_for_function(
+                _MUTATION_SETTLED_JS, arg=[token, self.quiet_ms], timeout=remaining()
+            )
+            navigated = await handle.json_value() == 'navigated'
+        except PlaywrightTimeoutError:
+            raise
+        except Exception:
+            # 평가 중 실행 컨텍스트가 사라짐 (이동)
+            navigated = True
+        if navigated:
+            await page.wait_for_load_state('load', timeout=remaining())
+
+    def settled(self) -> bool:
+        """마지막 settle()에서 모든 신호가 도착했는지 여부"""
+        return all(self.last_result.values()) if self.last_result else False
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+SiteConfigCache - 사이트 설정 컴파일 캐시
+- 원본: docs/SITE_DB_{SITE}.md의 yaml 블록 + sites/{site}/config/settings.json
+- 사이트별로 처음 요청될 때만 읽음 (생성 시점에는 아무것도 파싱하지 않음)
+- 파싱/검증 결과는 data/site_config/{site}.json에 원본 파일 지문(mtime, 크기, sha1)과 함께 저장
+  → 원본이 그대로면 다음 실행에서도 yaml을 다시 파싱하지 않음 (mtime만 바뀌고 내용이 같으면 지문만 갱신)
+- 계정 정보는 캐시 파일에 복사하지 않고 settings.json에서 직접 읽음
+- 로그인 때 실제로 맞은 셀렉터(resolved)도 같은 캐시 파일에 기록 (원본이 바뀌어 다시 컴파일해도 유지)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+CACHE_VERSION = 1
+
+_YAML_BLOCK = re.compile(r'```yaml\n(.*?)\n```', re.DOTALL)
+_LOGIN_URL_ROW = re.compile(r'\*\*로그인 URL\*\*.*?\|\s*(https?://[^\s]+)')
+_SELECTOR_FIELDS = ('username', 'password', 'submit')
+
+
+class SiteConfig:
+    """컴파일된 사이트 설정 하나"""
+
+    def __init__(self, site: str, login_url: str = '', success_url: str = '',
+                 selectors: Optional[Dict[str, str]] = None, extra: Optional[Dict[str, Any]] = None,
+                 credentials: Optional[Dict[str, str]] = None, errors: Optional[List[str]] = None,
+                 resolved: Optional[Dict[str, str]] = None):
+        self.site = site
+        self.login_url = login_url
+        self.success_url = success_url
+        self.selectors = selectors or {}
+        self.extra = extra or {}
+        self.credentials = credentials  # settings.json이 없으면 None
+        self.errors = errors or []
+        self.resolved = resolved or {}  # 필드별로 지난 로그인에서 맞은 셀렉터
+
+    def as_dict(self) -> Dict[str, Any]:
+        """예전 site_configs 항목과 같은 형식 (login_url/credentials는 있을 때만)"""
+        config = dict(self.extra)
+        if self.login_url:
+            config['login_url'] = self.login_url
+        if self.selectors:
+            config['selectors'] = dict(self.selectors)
+        if self.credentials is not None:
+            config['credentials'] = dict(self.credentials)
+        return config
+
+    def to_cache(self) -> Dict[str, Any]:
+        return {
+            'login_url': self.login_url,
+            'success_url': self.success_url,
+            'selectors': self.selectors,
+            'extra': self.extra,
+            'errors': self.errors,
+            'resolved': self.resolved
+        }
+
+    @classmethod
+    def from_cache(cls, site: str, data: Dict[str, Any]) -> 'SiteConfig':
+        return cls(site, data.get('login_url', ''), data.get('success_url', ''),
+                   data.get('selectors'), data.get('extra'), errors=data.get('errors'),
+                   resolved=data.get('resolved'))
+
+
+def _fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _sha1(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _is_url(value: Any) -> bool:
+    return isinstance(value, str) and value.startswith(('http://', 'https://'))
+
+
+class SiteConfigCache(Mapping):
+    """사이트 ID → 설정 dict (읽기 전용 Mapping, 항목은 요청 시 로드)"""
+
+    def __init__(self, docs_dir: str = "docs", sites_dir: str = "sites",
+                 cache_dir: str = "data/site_config"):
+        self.docs_dir = Path(docs_dir)
+        self.sites_dir = Path(sites_dir)
+        self.cache_dir = Path(cache_dir)
+        self._configs: Dict[str, SiteConfig] = {}
+        self._lock = threading.Lock()
+
+    def doc_path(self, site: str) -> Path:
+        return self.docs_dir / f"SITE_DB_{site.upper()}.md"
+
+    def settings_path(self, site: str) -> Path:
+        return self.sites_dir / site / "config" / "settings.json"
+
+    def cache_path(self, site: str) -> Path:
+        return self.cache_dir / f"{site}.json"
+
+    # ============ 조회 ============
+    def get_config(self, site: str) -> Optional[SiteConfig]:
+        """사이트 설정 (원본이 하나도 없으면 None)"""
+        site = site.lower()
+        with self._lock:
+            config = self._configs.get(site)
+            if config is None:
+                config = self._load(site)
+                if config is None:
+                    return None
+                self._configs[site] = config
+        return config
+
+    def sites(self) -> List[str]:
+        """설정이 있는 사이트 목록 (파일 이름만 확인, 파싱하지 않음)"""
+        names = {p.stem[len("SITE_DB_"):].lower() for p in self.docs_dir.glob("SITE_DB_*.md")}
+        names.update(p.parent.parent.name for p in self.sites_dir.glob("*/config/settings.json"))
+        return sorted(names)
+
+    def remember_selectors(self, site: str, resolved: Dict[str, Optional[str]]):
+        """로그인에 성공한 셀렉터 기록 - 다음 로그인에서 먼저 시도 (None이면 그 필드의 기록 삭제)"""
+        config = self.get_config(site)
+        if config is None or all(config.resolved.get(k) == v for k, v in resolved.items()):
+            return
+        with self._lock:
+            for field, selector in resolved.items():
+                if selector is None:
+                    config.resolved.pop(field, None)
+                else:
+                    config.resolved[field] = selector
+            # 캐시 파일의 resolved만 교체 (원본 지문/컴파일 결과는 그대로 → 그 사이 원본이 바뀌었으면 다음 로드에서 재컴파일)
+            cached = self._read_cache(config.site)
+            if cached is None or not isinstance(cached.get('config'), dict):
+                return
+            cached['config']['resolved'] = config.resolved
+            self._dump_cache(config.site, cached)
+
+    def invalidate(self, site: Optional[str] = None):
+        """메모리 캐시 비우기 (디스크 캐시는 지문으로 검증되므로 그대로)"""
+        with self._lock:
+            if site is None:
+                self._configs.clear()
+            else:
+                self._configs.pop(site.lower(), None)
+
+    # Mapping 인터페이스 (예전 site_configs dict 대용)
+    def __getitem__(self, site: str) -> Dict[str, Any]:
+        config = self.get_config(site)
+        if config is None:
+            raise KeyError(site)
+        return config.as_dict()
+
+    def __contains__(self, site: object) -> bool:
+        if not isinstance(site, str):
+            return False
+        site = site.lower()
+        return site in self._configs or self.doc_path(site).exists() or self.settings_path(site).exists()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sites())
+
+    def __len__(self) -> int:
+        return len(self.sites())
+
+    # ============ 로드 ============
+    def _load(self, site: str) -> Optional[SiteConfig]:
+        doc, settings_path = self.doc_path(site), self.settings_path(site)
+        sources = {str(p): _fingerprint(p) for p in (doc, settings_path)}
+        if not any(sources.values()):
+            return None
+
+        settings = self._read_settings(settings_path) if sources[str(settings_path)] else None
+        cached = self._read_cache(site)
+        config = self._cached(site, sources, cached) if cached else None
+        if config is None:
+            config = self._compile(site, doc if sources[str(doc)] else None, settings)
+            config.resolved = dict((cached or {}).get('config', {}).get('resolved') or {})
+            self._write_cache(site, sources, config)
+        if settings is not None:
+            config.credentials = settings.get('credentials', {})
+        for error in config.errors:
+            print(f"⚠️ 사이트 설정 ({site}): {error}")
+        return config
+
+    def _read_cache(self, site: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.cache_path(site), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cached if isinstance(cached, dict) else None
+
+    def _cached(self, site: str, sources: Dict[str, Optional[Tuple[int, int]]],
+                cached: Dict[str, Any]) -> Optional[SiteConfig]:
+        """디스크 캐시 - 원본 지문이 같으면 사용, mtime만 바뀌었으면 sha1로 확인"""
+        if cached.get('version') != CACHE_VERSION or set(cached.get('sources', {})) != set(sources):
+            return None
+
+        touched = False
+        for path, fingerprint in sources.items():
+            entry = cached['sources'][path]
+            if fingerprint is None or entry is None:
+                if fingerprint != entry:
+                    return None
+                continue
+            if tuple(entry['stat']) == fingerprint:
+                continue
+            if entry['sha1'] != _sha1(Path(path)):
+                return None
+            entry['stat'] = list(fingerprint)
+            touched = True
+
+        config = SiteConfig.from_cache(site, cached['config'])
+        if touched:
+            self._write_cache(site, sources, config, hashes={p: e['sha1'] for p, e in cached['sources'].items() if e})
+        return config
+
+    def _write_cache(self, site: str, sources: Dict[str, Optional[Tuple[int, int]]], config: SiteConfig,
+                     hashes: Optional[Dict[str, str]] = None):
+        hashes = hashes or {}
+        entries = {
+            path: None if fingerprint is None else {
+                'stat': list(fingerprint),
+                'sha1': hashes.get(path) or _sha1(Path(path))
+            }
+            for path, fingerprint in sources.items()
+        }
+        self._dump_cache(site, {'version': CACHE_VERSION, 'sources': entries, 'config': config.to_cache()})
+
+    def _dump_cache(self, site: str, data: Dict[str, Any]):
+        path = self.cache_path(site)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(path.name + '.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️ 사이트 설정 캐시 저장 실패 ({site}): {e}")
+
+    @staticmethod
+    def _read_settings(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 설정 파일 로드 실패 ({path}): {e}")
+            return None
+        return settings if isinstance(settings, dict) else None
+
+    # ============ 컴파일 ============
+    def _compile(self, site: str, doc: Optional[Path], settings: Optional[Dict[str, Any]]) -> SiteConfig:
+        """SITE_DB 문서 + settings.json → SiteConfig (검증 오류는 errors에 기록)"""
+        config = SiteConfig(site)
+        if doc is not None:
+            self._parse_doc(doc, config)
+
+        site_info = (settings or {}).get('site_info', {})
+        if not config.login_url and _is_url(site_info.get('login_url')):
+            config.login_url = site_info['login_url']
+
+        config.errors.extend(self._validate(config, settings))
+        return config
+
+    @staticmethod
+    def _parse_doc(doc: Path, config: SiteConfig):
+        import yaml  # 캐시가 맞으면 yaml은 불러오지도 않음
+
+        with open(doc, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        for block in _YAML_BLOCK.findall(content):
+            try:
+                data = yaml.safe_load(block)
+            except yaml.YAMLError as e:
+                config.errors.append(f"yaml 블록 파싱 실패: {e}")
+                continue
+            if not isinstance(data, dict):
+                continue
+            auth = data.pop('Authentication', None)
+            if isinstance(auth, dict):
+                config.login_url = auth.get('URL', '') or ''
+                config.success_url = auth.get('Success_URL', '') or ''
+                selectors = auth.get('Selectors') or {}
+                config.selectors = {k: v for k, v in selectors.items() if isinstance(v, str)}
+            config.extra.update(data)
+
+        # 로그인 URL 백업 추출 (표 형식)
+        if not config.login_url:
+            match = _LOGIN_URL_ROW.search(content)
+            if match:
+                config.login_url = match.group(1)
+
+    @staticmethod
+    def _validate(config: SiteConfig, settings: Optional[Dict[str, Any]]) -> List[str]:
+        errors = []
+        if config.login_url and not _is_url(config.login_url):
+            errors.append(f"login_url이 URL이 아님: {config.login_url!r}")
+            config.login_url = ''
+        if config.success_url and not _is_url(config.success_url):
+            errors.append(f"Success_URL이 URL이 아님: {config.success_url!r}")
+            config.success_url = ''
+        unknown = sorted(set(config.selectors) - set(_SELECTOR_FIELDS))
+        if unknown:
+            errors.append(f"알 수 없는 셀렉터 항목: {unknown}")
+        if settings is not None:
+            credentials = settings.get('credentials')
+            if not isinstance(credentials, dict) or not all(
+                isinstance(credentials.get(key), str) for key in ('username', 'password')
+            ):
+                errors.append("settings.json credentials에 username/password 문자열이 없음")
+        return errors
+
+
+_default_cache: Optional[SiteConfigCache] = None
+_default_lock = threading.Lock()
+
+
+def default_site_configs() -> SiteConfigCache:
+    """프로세스 공용 사이트 설정 캐시"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SiteConfigCache()
+        return _default_cache
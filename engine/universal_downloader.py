@@ -11,17 +11,68 @@ import json
 import time
 import shutil
 import os
+import re
+import uuid
+import base64
+import statistics
+from urllib.parse import unquote
+from datetime import datetime
+
+
+# 아직 쓰는 중인 파일 (파일 시스템 감시에서 제외)
+PARTIAL_SUFFIXES = ('.crdownload', '.part', '.tmp', '.download')
+
+# 경쟁 모드에서 동시에 거는 캡처 방식
+RACE_STRATEGIES = ('playwright', 'network', 'cdp', 'filesystem')
+
+# 전략 캐시에 보관할 최근 지연 시간 개수
+LATENCY_WINDOW = 20
+
+# 파일 다운로드로 보는 Content-Type (Content-Disposition이 없을 때)
+DOWNLOAD_CONTENT_TYPES = (
+    'application/vnd.ms-excel', 'application/vnd.openxmlformats', 'application/octet-stream',
+    'application/x-msdownload', 'application/zip', 'application/pdf', 'text/csv', 'application/csv',
+    'application/force-download', 'application/x-download'
+)
+
+# 브라우저가 스스로 파일로 저장하는 요청 종류 (내비게이션 / download 속성 링크)
+NAVIGATION_RESOURCE_TYPES = ('Document', 'Other')
+
+# 응답 스트리밍 시 한 번에 읽을 크기
+STREAM_CHUNK = 1024 * 1024
 
 
 class UniversalDownloadEngine:
     """모든 웹사이트에서 작동하는 다운로드 엔진"""
     
-    def __init__(self, download_dir="downloads"):
+    def __init__(self, download_dir="downloads", watch_dirs=None, site_name=None, download_url=None):
+        """
+        Args:
+            download_dir: 저장 폴더
+            watch_dirs: 파일 시스템 감시에 추가할 폴더
+            site_name: 전략 캐시를 둘 사이트 이름
+            download_url: 네트워크 캡처가 멈출 다운로드 요청 URL 패턴 (CDP 와일드카드, 예: '*excelDown.do*')
+                          지정하면 XHR/Fetch 응답도 캡처, 없으면 내비게이션/download 링크 요청만
+        """
+        self.download_url = download_url
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
         self.strategies = []
+        # 파일 시스템/CDP 전략이 새 파일을 찾을 폴더 (브라우저 downloads_path 등)
+        self.watch_dirs = [Path.home() / "Downloads"] + [Path(d) for d in (watch_dirs or [])]
+        self.last_race = None
+        self.race_history = []
+        
+        # 사이트/트리거별로 학습한 우승 전략 (sites/{site}/data/download_strategies.json)
+        self.site_name = site_name
+        if site_name:
+            self.strategy_cache_path = Path(f"sites/{site_name}/data") / "download_strategies.json"
+        else:
+            self.strategy_cache_path = self.download_dir / "download_strategies.json"
+        self.strategy_cache = self._load_strategy_cache()
         
-    async def download(self, page, trigger_selector=None, trigger_action=None):
+    async def download(self, page, trigger_selector=None, trigger_action=None, race=False, timeout=30000,
+                       trigger_key=None):
         """
         범용 다운로드 실행
         
@@ -29,11 +80,17 @@ class UniversalDownloadEngine:
             page: Playwright page 객체
             trigger_selector: 다운로드 버튼 선택자
             trigger_action: 다운로드 트리거 액션
+            race: True면 한 번만 트리거하고 모든 캡처 방식을 동시에 경쟁 (race_download)
+            timeout: 경쟁 모드 최대 대기 시간 (밀리초)
+            trigger_key: 전략 캐시 키 (기본값: 선택자 또는 트리거 함수 이름, lambda/중첩 함수면 지정해야 캐시됨)
         
         Returns:
             다운로드된 파일 경로 또는 데이터
         """
         
+        if race:
+            return await self.race_download(page, trigger_selector, trigger_action, timeout, trigger_key)
+        
         results = {}
         
         # 전략 1: Playwright 다운로드 이벤트 캡처
@@ -63,6 +120,439 @@ class UniversalDownloadEngine:
         
         return results
     
+    # ============ 경쟁 모드 ============
+    async def race_download(self, page, trigger_selector=None, trigger_action=None, timeout=30000,
+                            trigger_key=None):
+        """
+        경쟁 다운로드 - 트리거는 한 번만, 캡처 방식은 모두 동시에
+        
+        다운로드 이벤트 / 네트워크 응답 / CDP 다운로드 이벤트 / 파일 시스템 감시를
+        트리거 전에 모두 걸어두고, 완성된 파일을 가장 먼저 만든 방식이 이기면 나머지는 취소.
+        아무것도 잡지 못하면 JavaScript 데이터 추출로 대체.
+        
+        같은 사이트/트리거에서 이미 이긴 전략이 캐시에 있으면 그 전략만 걸고,
+        실패했을 때만 전체 경쟁(탐색)으로 돌아감. JavaScript 추출은 파일을 받지 못했을 때의 대체일 뿐이므로
+        캐시하지 않음 (캐시하면 이후로 트리거도 다운로드도 하지 않게 됨).
+        
+        Returns:
+            {전략명: 파일 경로} - 우승 전략과 지연 시간은 self.last_race에 기록
+        """
+        key = trigger_key or self._trigger_key(trigger_selector, trigger_action)
+        if key is None:
+            print("[Race] 이름 없는 트리거 함수 - 전략 캐시 사용 안 함 (trigger_key 지정 필요)")
+        record = self.strategy_cache.get(key) if key is not None else None
+        
+        # 예전에 캐시된 'javascript' 등 캡처 방식이 아닌 기록은 무시
+        if record and record['strategy'] in RACE_STRATEGIES:
+            cached = record['strategy']
+            print(f"[Race] 캐시된 전략 사용: {cached} (중앙값 {record['median_latency']:.2f}초)")
+            result = await self._race(page, trigger_selector, trigger_action, timeout, [cached], fallback=False)
+            
+            if result:
+                self._record_strategy(key, cached, self.last_race['latency'])
+                return result
+            
+            self._record_failure(key)
+            print(f"[Race] 캐시된 전략 실패: {cached} → 전체 전략 탐색")
+        
+        result = await self._race(page, trigger_selector, trigger_action, timeout, RACE_STRATEGIES, fallback=True)
+        winner = next(iter(result), None)
+        if key is not None and winner in RACE_STRATEGIES:
+            self._record_strategy(key, winner, self.last_race['latency'])
+        return result
+    
+    async def _race(self, page, trigger_selector, trigger_action, timeout, strategies, fallback=True):
+        """strategies에 해당하는 캡처 방식만 걸고 한 번 트리거"""
+        deadline = timeout / 1000
+        tasks = {}
+        cleanups = []
+        
+        # 1. Playwright 다운로드 이벤트
+        if 'playwright' in strategies:
+            tasks['playwright'] = asyncio.ensure_future(self._race_playwright(page, timeout))
+        
+        # 2. 네트워크 응답 (본문을 디스크로 스트리밍)
+        if 'network' in strategies:
+            # 브라우저가 직접 받는 첨부 파일은 다른 캡처 방식에 넘김 (본문을 가로채면 다운로드가 중단됨)
+            browser_captures = {'playwright', 'cdp', 'filesystem'} & set(strategies)
+            network_done, cleanup = await self._arm_network_capture(page, yield_attachments=bool(browser_captures))
+            cleanups.append(cleanup)
+            tasks['network'] = network_done
+        
+        # 3. CDP 다운로드 이벤트 (Chromium 전용, 다운로드 동작은 바꾸지 않고 이벤트만 구독)
+        if 'cdp' in strategies:
+            try:
+                client = await page.context.new_cdp_session(page)
+                await client.send('Page.enable')
+                tasks['cdp'] = asyncio.ensure_future(self._race_cdp(client, deadline))
+                cleanups.append(client.detach)
+            except Exception as e:
+                print(f"[CDP] 사용 불가: {e}")
+        
+        # 4. 파일 시스템 감시
+        if 'filesystem' in strategies:
+            initial_files = self._snapshot(self.watch_dirs)
+            tasks['filesystem'] = asyncio.ensure_future(self._race_filesystem(initial_files, deadline))
+        
+        # 트리거 (한 번만)
+        started = time.monotonic()
+        try:
+            if trigger_action:
+                await trigger_action(page)
+            elif trigger_selector:
+                await page.click(trigger_selector)
+        except Exception as e:
+            print(f"[Race] 트리거 실패: {e}")
+            await self._finish_race(tasks, cleanups)
+            return {}
+        
+        winner, path = None, None
+        pending = set(tasks.values())
+        names = {task: name for name, task in tasks.items()}
+        while pending and not winner:
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled() or task.exception() is not None or not task.result():
+                    continue
+                winner, path = names[task], task.result()
+                break
+        
+        latency = time.monotonic() - started
+        await self._finish_race(tasks, cleanups)
+        
+        self.last_race = {
+            'winner': winner,
+            'latency': latency,
+            'path': str(path) if path else None,
+            'timestamp': time.time()
+        }
+        self.race_history.append(self.last_race)
+        
+        if winner:
+            print(f"[Race] 우승: {winner} ({latency:.2f}초) → {path}")
+            return {winner: path}
+        
+        if not fallback:
+            print(f"[Race] {latency:.1f}초 동안 캡처 실패")
+            return {}
+        
+        print(f"[Race] {latency:.1f}초 동안 캡처 실패 → JavaScript 추출 시도")
+        data = await self.strategy_javascript_extraction(page)
+        if data:
+            self.last_race['winner'] = 'javascript'
+            return {'javascript': data}
+        return {}
+    
+    # ============ 전략 캐시 ============
+    def _trigger_key(self, trigger_selector, trigger_action):
+        """캐시 키 - 선택자 또는 이름 있는 트리거 함수 (모듈.이름)
+
+        lambda/중첩 함수/partial 등은 이름으로 서로 구분할 수 없으므로 None → 캐시 사용 안 함
+        (캐시하려면 trigger_key를 직접 지정)
+        """
+        if trigger_selector:
+            return trigger_selector
+        if trigger_action:
+            qualname = getattr(trigger_action, '__qualname__', None)
+            if not qualname or '<' in qualname:  # '<lambda>', 'f.<locals>.g'
+                return None
+            return f"{getattr(trigger_action, '__module__', '')}.{qualname}"
+        return 'default'
+    
+    def _load_strategy_cache(self):
+        """전략 캐시 로드"""
+        if self.strategy_cache_path.exists():
+            try:
+                with open(self.strategy_cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return {}
+    
+    def _save_strategy_cache(self):
+        """전략 캐시 저장"""
+        try:
+            self.strategy_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.strategy_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self.strategy_cache, f, indent=2, ensure_ascii=False)
+        except Exception:
+            pass
+    
+    def _record_strategy(self, key, strategy, latency):
+        """성공 기록 - 다른 전략이 이겼으면 기록을 새로 시작"""
+        record = self.strategy_cache.get(key)
+        if not record or record['strategy'] != strategy:
+            record = {'strategy': strategy, 'latencies': [], 'successes': 0, 'failures': 0}
+        
+        record['latencies'] = (record['latencies'] + [round(latency, 3)])[-LATENCY_WINDOW:]
+        record['median_latency'] = statistics.median(record['latencies'])
+        record['successes'] += 1
+        record['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        self.strategy_cache[key] = record
+        self._save_strategy_cache()
+    
+    def _record_failure(self, key):
+        """캐시된 전략 실패 횟수 기록"""
+        record = self.strategy_cache.get(key)
+        if record:
+            record['failures'] += 1
+            record['updated_at'] = datetime.now().isoformat(timespec='seconds')
+            self._save_strategy_cache()
+    
+    def forget_strategy(self, trigger_key=None):
+        """캐시 삭제 (trigger_key 없으면 전체)"""
+        if trigger_key is None:
+            self.strategy_cache = {}
+        else:
+            self.strategy_cache.pop(trigger_key, None)
+        self._save_strategy_cache()
+    
+    async def _finish_race(self, tasks, cleanups):
+        """남은 캡처 취소 및 리스너 해제"""
+        for task in tasks.values():
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for cleanup in cleanups:
+            try:
+                result = cleanup()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception:
+                pass
+    
+    async def _race_playwright(self, page, timeout):
+        """다운로드 이벤트 → save_as 완료 시 파일 경로"""
+        download = await page.wait_for_event('download', timeout=timeout)
+        save_path = self.download_dir / download.suggested_filename
+        await download.save_as(str(save_path))
+        return save_path
+    
+    async def _race_cdp(self, client, deadline):
+        """CDP downloadProgress 'completed' → 감시 폴더에서 파일을 찾아 복사"""
+        begun = {}
+        completed = asyncio.get_running_loop().create_future()
+        
+        def on_begin(params):
+            begun[params.get('guid')] = params.get('suggestedFilename') or params.get('guid')
+        
+        def on_progress(params):
+            if params.get('state') == 'completed' and not completed.done():
+                completed.set_result(params.get('guid'))
+        
+        client.on('Page.downloadWillBegin', on_begin)
+        client.on('Page.downloadProgress', on_progress)
+        
+        guid = await asyncio.wait_for(completed, deadline)
+        filename = begun.get(guid, guid)
+        # 브라우저는 guid 또는 제안 파일명으로 저장함
+        for folder in self.watch_dirs:
+            for candidate in (folder / guid, folder / filename):
+                if candidate.is_file():
+                    target = self.download_dir / filename
+                    shutil.copy2(candidate, target)
+                    return target
+        return None
+    
+    def _snapshot(self, folders):
+        files = set()
+        for folder in folders:
+            if folder.exists():
+                files.update(folder.glob('*'))
+        return files
+    
+    async def _race_filesystem(self, initial_files, deadline, poll=0.2):
+        """감시 폴더에 새로 생긴 파일이 크기 변화 없이 안정되면 복사"""
+        sizes = {}
+        started = time.monotonic()
+        while time.monotonic() - started < deadline:
+            await asyncio.sleep(poll)
+            for file in self._snapshot(self.watch_dirs) - initial_files:
+                if not file.is_file() or file.suffix.lower() in PARTIAL_SUFFIXES:
+                    continue
+                size = file.stat().st_size
+                if size > 0 and sizes.get(file) == size:
+                    target = self.download_dir / file.name
+                    shutil.copy2(file, target)
+                    return target
+                sizes[file] = size
+        return None
+    
+    def _is_download_headers(self, headers):
+        """다운로드 응답 판별 - URL이 아니라 Content-Disposition / Content-Type 기준"""
+        disposition = headers.get('content-disposition', '').lower()
+        if 'attachment' in disposition or 'filename' in disposition:
+            return True
+        content_type = headers.get('content-type', '').lower()
+        return any(content_type.startswith(t) for t in DOWNLOAD_CONTENT_TYPES)
+    
+    def _is_download_response(self, response):
+        """다운로드 응답 판별"""
+        return response.status == 200 and self._is_download_headers(response.headers)
+    
+    def _response_filename(self, headers):
+        """Content-Disposition / Content-Type으로 파일명 결정"""
+        filename = "download"
+        disposition = headers.get('content-disposition', '')
+        
+        # RFC 5987 (filename*=UTF-8''...) 우선, 없으면 filename="..."
+        match = re.search(r"filename\*\s*=\s*(?:[\w-]+'[^']*')?([^;]+)", disposition, re.I)
+        if match:
+            filename = unquote(match.group(1).strip().strip('"'))
+        else:
+            match = re.search(r'filename\s*=\s*([\"\']?)([^\"\';]*)\1', disposition, re.I)
+            if match and match.group(2).strip():
+                filename = unquote(match.group(2).strip())
+        filename = Path(filename.replace('\\', '/')).name or "download"
+        
+        # 확장자가 없을 때만 추정
+        if not Path(filename).suffix:
+            content_type = headers.get('content-type', '')
+            if 'excel' in content_type or 'spreadsheet' in content_type:
+                filename += '.xlsx'
+            elif 'csv' in content_type:
+                filename += '.csv'
+            elif 'pdf' in content_type:
+                filename += '.pdf'
+        return filename
+    
+    def _temp_path(self, final_path):
+        """같은 폴더의 임시 파일 (완료 후 os.replace로 원자적 이름 변경)"""
+        return final_path.with_name(f".{final_path.name}.{uuid.uuid4().hex[:8]}.part")
+    
+    async def _save_response(self, response):
+        """응답 본문을 파일로 저장 (CDP를 쓸 수 없는 브라우저용 - 본문 전체를 메모리에 읽음)"""
+        save_path = self.download_dir / self._response_filename(response.headers)
+        temp_path = self._temp_path(save_path)
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(await response.body())
+            os.replace(temp_path, save_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        print(f"[Network] 응답 캡처 성공: {save_path.name}")
+        return save_path
+    
+    async def _arm_network_capture(self, page, yield_attachments=False):
+        """
+        다운로드 응답 캡처 준비
+        
+        Chromium: CDP Fetch로 응답 헤더 단계에서 멈추고, 다운로드 응답이면
+        Fetch.takeResponseBodyAsStream + IO.read로 청크 단위 디스크 저장 (메모리에 본문 전체를 올리지 않음)
+        멈추는 요청은 내비게이션/download 링크 요청만 (download_url을 지정했으면 그 URL의 XHR/Fetch도) -
+        페이지의 API 호출이나 route() 핸들러가 걸린 요청을 전부 세우지 않도록
+        그 외 브라우저: response 이벤트 + response.body()
+        
+        Args:
+            yield_attachments: True면 Content-Disposition: attachment 응답은 가로채지 않고 진행
+                               (브라우저 다운로드를 잡는 다른 캡처 방식과 경쟁할 때)
+        
+        Returns:
+            (완료 시 파일 경로가 들어오는 future, 해제 함수)
+        """
+        loop = asyncio.get_running_loop()
+        captured = loop.create_future()
+        
+        try:
+            client = await page.context.new_cdp_session(page)
+            resource_types = NAVIGATION_RESOURCE_TYPES + (('XHR', 'Fetch') if self.download_url else ())
+            await client.send('Fetch.enable', {'patterns': [
+                {'urlPattern': self.download_url or '*', 'resourceType': resource_type, 'requestStage': 'Response'}
+                for resource_type in resource_types
+            ]})
+        except Exception:
+            client = None
+        
+        if client is not None:
+            def on_paused(params):
+                asyncio.ensure_future(self._handle_paused_response(client, params, captured, yield_attachments))
+            
+            client.on('Fetch.requestPaused', on_paused)
+            
+            async def cleanup():
+                try:
+                    await client.send('Fetch.disable')
+                finally:
+                    await client.detach()
+            
+            return captured, cleanup
+        
+        async def on_response(response):
+            if captured.done() or not self._is_download_response(response):
+                return
+            try:
+                path = await self._save_response(response)
+            except Exception as e:
+                print(f"[Network] 응답 저장 실패: {e}")
+                return
+            if path and not captured.done():
+                captured.set_result(path)
+        
+        page.on('response', on_response)
+        return captured, lambda: page.remove_listener('response', on_response)
+    
+    async def _handle_paused_response(self, client, params, captured, yield_attachments=False):
+        """멈춘 응답 처리 - 다운로드면 스트리밍 저장, 아니면 그대로 진행"""
+        request_id = params['requestId']
+        headers = {h['name'].lower(): h['value'] for h in params.get('responseHeaders') or []}
+        attachment = 'attachment' in headers.get('content-disposition', '').lower()
+        
+        if (captured.done() or params.get('responseStatusCode') != 200 or not self._is_download_headers(headers)
+                or (yield_attachments and attachment)):
+            try:
+                await client.send('Fetch.continueRequest', {'requestId': request_id})
+            except Exception:
+                pass
+            return
+        
+        try:
+            stream = await client.send('Fetch.takeResponseBodyAsStream', {'requestId': request_id})
+            path = await self._stream_to_file(client, stream['stream'], headers)
+        except Exception as e:
+            print(f"[Network] 스트리밍 저장 실패: {e}")
+            path = None
+        
+        # 스트림으로 가져간 응답은 그대로 진행할 수 없으므로 중단 (브라우저 쪽 중복 다운로드 방지)
+        try:
+            await client.send('Fetch.failRequest', {'requestId': request_id, 'errorReason': 'Aborted'})
+        except Exception:
+            pass
+        
+        if path and not captured.done():
+            captured.set_result(path)
+    
+    async def _stream_to_file(self, client, handle, headers):
+        """CDP IO 스트림을 임시 파일에 청크 단위로 쓰고 완료되면 원자적으로 이름 변경"""
+        save_path = self.download_dir / self._response_filename(headers)
+        temp_path = self._temp_path(save_path)
+        size = 0
+        try:
+            with open(temp_path, 'wb') as f:
+                while True:
+                    chunk = await client.send('IO.read', {'handle': handle, 'size': STREAM_CHUNK})
+                    data = chunk.get('data', '')
+                    if data:
+                        data = base64.b64decode(data) if chunk.get('base64Encoded') else data.encode('utf-8')
+                        f.write(data)
+                        size += len(data)
+                    if chunk.get('eof'):
+                        break
+            os.replace(temp_path, save_path)
+        finally:
+            try:
+                await client.send('IO.close', {'handle': handle})
+            except Exception:
+                pass
+            if temp_path.exists():
+                temp_path.unlink()
+        
+        print(f"[Network] 응답 스트리밍 저장: {save_path.name} ({size / (1024 * 1024):.1f}MB)")
+        return save_path
+    
     async def strategy_playwright_download(self, page, trigger_selector, trigger_action):
         """전략 1: Playwright 기본 다운로드 이벤트"""
         try:
@@ -103,47 +593,10 @@ class UniversalDownloadEngine:
             return None
     
     async def strategy_network_intercept(self, page, trigger_selector, trigger_action):
-        """전략 2: 네트워크 응답 인터셉트"""
+        """전략 2: 네트워크 응답 인터셉트 (응답 본문을 디스크로 스트리밍)"""
+        cleanup = None
         try:
-            captured_response = None
-            
-            async def handle_response(response):
-                nonlocal captured_response
-                
-                # 다운로드 관련 응답 감지
-                if any(keyword in response.url.lower() for keyword in ['download', 'export', 'excel', 'csv', 'pdf']):
-                    if response.status == 200:
-                        content = await response.body()
-                        
-                        # 파일명 추출
-                        headers = response.headers
-                        filename = "download"
-                        
-                        if 'content-disposition' in headers:
-                            import re
-                            match = re.search(r'filename[^;=\n]*=([\"\']?)([^\"\';]*)\1', headers['content-disposition'])
-                            if match:
-                                filename = match.group(2)
-                        
-                        # 확장자 추정
-                        content_type = headers.get('content-type', '')
-                        if 'excel' in content_type or 'spreadsheet' in content_type:
-                            filename += '.xlsx'
-                        elif 'csv' in content_type:
-                            filename += '.csv'
-                        elif 'pdf' in content_type:
-                            filename += '.pdf'
-                        
-                        # 파일 저장
-                        save_path = self.download_dir / filename
-                        with open(save_path, 'wb') as f:
-                            f.write(content)
-                        
-                        captured_response = save_path
-                        print(f"[Network] 응답 캡처 성공: {filename}")
-            
-            # 응답 리스너 등록
-            page.on('response', handle_response)
+            captured, cleanup = await self._arm_network_capture(page)
             
             # 다운로드 트리거
             if trigger_action:
@@ -151,17 +604,25 @@ class UniversalDownloadEngine:
             elif trigger_selector:
                 await page.click(trigger_selector)
             
-            # 응답 대기
-            await page.wait_for_timeout(5000)
-            
-            # 리스너 제거
-            page.remove_listener('response', handle_response)
-            
-            return captured_response
+            # 응답 대기 (최대 5초)
+            try:
+                return await asyncio.wait_for(captured, 5)
+            except asyncio.TimeoutError:
+                return None
             
         except Exception as e:
             print(f"[Network] 전략 실패: {e}")
             return None
+        
+        finally:
+            # 리스너 제거
+            if cleanup:
+                try:
+                    result = cleanup()
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception:
+                    pass
     
     async def strategy_javascript_extraction(self, page):
         """전략 3: JavaScript 프레임워크 데이터 추출"""
@@ -448,6 +909,11 @@ async def example_usage():
                 print(f"성공한 전략: {strategy}")
                 print(f"결과: {result}")
         
+        # 경쟁 모드: 한 번만 트리거하고 가장 먼저 완성된 캡처 방식을 사용
+        results = await downloader.download(page, trigger_selector='button#download', race=True)
+        if downloader.last_race['winner']:
+            print(f"우승 전략: {downloader.last_race['winner']} ({downloader.last_race['latency']:.2f}초)")
+        
         await browser.close()
 
 
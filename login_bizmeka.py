@@ -9,7 +9,7 @@ async def run():
         page = await context.new_page()
         
         smart = SmartLoginManager()
-        await smart.login('bizmeka', page)
+        await smart.login('bizmeka', page, open_main=True)
         
         await page.wait_for_timeout(180000)
         await browser.close()
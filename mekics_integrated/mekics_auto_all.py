@@ -109,6 +109,12 @@ def grid_payload(date_fr: str, date_to: str, limit: int, page: int) -> dict:
     }
     return {"action":"ssa450skrvService","method":"selectList1","data":[data],"type":"rpc","tid":1}
 
+def template_columns(xml_path: Path) -> List[str]:
+    # 엑셀 템플릿 <field col=.. name=..> 순서 = 그리드 컬럼 모델
+    import xml.etree.ElementTree as ET
+    fields = sorted(ET.parse(str(xml_path)).getroot().iter("field"), key=lambda f: int(f.get("col", 0)))
+    return [f.get("name") for f in fields if f.get("name")]
+
 def fetch_grid(sess: requests.Session, out_dir: Path, date_fr: str, date_to: str, limit: int) -> Path:
     router_url = BASE_URL + ROUTER
     referer = BASE_URL + SALES_PATH
@@ -116,51 +122,55 @@ def fetch_grid(sess: requests.Session, out_dir: Path, date_fr: str, date_to: str
         "Accept":"*/*","Content-Type":"application/json","Origin":BASE_URL,"Referer":referer,
         "User-Agent":UA,"X-Requested-With":"XMLHttpRequest"
     }
+    # 컬럼은 엑셀 템플릿의 field 정의로 고정 (+ 첫 페이지에만 있는 컬럼), 페이지마다 바로 파일에 추가
+    cols = template_columns(Path(__file__).parent / "templates" / "ssa450skrv_excel_template.xml")
+    raw_path = out_dir / "sales_grid_raw.jsonl"
+    csv_path = out_dir / "sales_grid.csv"
+    raw_f, csv_f, w = raw_path.open("w", encoding="utf-8"), None, None
     page = 1
-    total_rows: List[dict] = []
-    while True:
-        payload = grid_payload(date_fr, date_to, limit, page)
-        r = sess.post(router_url, headers=headers, json=payload, timeout=60)
-        r.raise_for_status()
-        obj = r.json()
-        # ExtDirect 단일 응답 or 리스트 대응
-        result = None
-        if isinstance(obj, dict) and "result" in obj:
-            result = obj["result"]
-        elif isinstance(obj, list) and obj and isinstance(obj[0], dict) and "result" in obj[0]:
-            result = obj[0]["result"]
-        rows = None
-        if isinstance(result, dict):
-            for k in ["list","data","rows","items","result"]:
-                v = result.get(k)
-                if isinstance(v, list):
-                    rows = v; break
-        if not rows:
-            break
-        total_rows.extend(rows)
-        if len(rows) < limit:
-            break
-        page += 1
-        if page > 200:  # safety
-            break
-    # save json
-    raw_path = out_dir / "sales_grid_raw.json"
-    raw_path.write_text(json.dumps(total_rows, ensure_ascii=False, indent=2), encoding="utf-8")
-    # save csv
-    if total_rows:
-        cols = set()
-        for r in total_rows:
-            cols.update(r.keys())
-        cols = list(cols)
-        csv_path = out_dir / "sales_grid.csv"
-        import csv
-        with csv_path.open("w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=cols)
-            w.writeheader()
-            for r in total_rows:
-                w.writerow({k: r.get(k, "") for k in cols})
-        return csv_path
-    return raw_path
+    count = 0
+    try:
+        while True:
+            payload = grid_payload(date_fr, date_to, limit, page)
+            r = sess.post(router_url, headers=headers, json=payload, timeout=60)
+            r.raise_for_status()
+            obj = r.json()
+            # ExtDirect 단일 응답 or 리스트 대응
+            result = None
+            if isinstance(obj, dict) and "result" in obj:
+                result = obj["result"]
+            elif isinstance(obj, list) and obj and isinstance(obj[0], dict) and "result" in obj[0]:
+                result = obj[0]["result"]
+            rows = None
+            if isinstance(result, dict):
+                for k in ["list","data","rows","items","result"]:
+                    v = result.get(k)
+                    if isinstance(v, list):
+                        rows = v; break
+            if not rows:
+                break
+            if w is None:
+                for row in rows:
+                    cols += [k for k in row if k not in cols]
+                csv_f = csv_path.open("w", newline="", encoding="utf-8")
+                w = csv.DictWriter(csv_f, fieldnames=cols, extrasaction="ignore")
+                w.writeheader()
+            for row in rows:
+                raw_f.write(json.dumps(row, ensure_ascii=False) + "\n")
+                w.writerow({k: row.get(k, "") for k in cols})
+            raw_f.flush(); csv_f.flush()
+            count += len(rows)
+            if len(rows) < limit:
+                break
+            page += 1
+            if page > 200:  # safety
+                break
+    finally:
+        raw_f.close()
+        if csv_f:
+            csv_f.close()
+    print(f"[GRID] {count}건 저장")
+    return csv_path if w is not None else raw_path
 
 def download_excel(sess: requests.Session, out_dir: Path, date_fr: str, date_to: str, template_xml_path: Path) -> Path:
     # Build form payload
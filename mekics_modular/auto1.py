@@ -5,7 +5,9 @@ from datetime import datetime
 
 from login_playwright import login_and_get_session
 from sales_grid import fetch_sales_grid
+from date_shards import fetch_sales_sharded
 from sales_excel_export import export_excel
+from sync_store import sync_sales
 
 def main():
     ap = argparse.ArgumentParser()
@@ -15,6 +17,14 @@ def main():
     ap.add_argument("--sale-fr", default=datetime.now().strftime("%Y%m01"), help="YYYYMMDD")
     ap.add_argument("--sale-to", default=datetime.now().strftime("%Y%m%d"), help="YYYYMMDD")
     ap.add_argument("--limit", type=int, default=100, help="페이지당 행 수")
+    ap.add_argument("--concurrency", type=int, default=4, help="동시 페이지 요청 수")
+    ap.add_argument("--batch", type=int, default=1, help="Ext.Direct 배치당 페이지 수 (1=배치 안 함)")
+    ap.add_argument("--shard", choices=["none","month","adaptive"], default="none", help="기간 분할 조회 (장기간 조회용)")
+    ap.add_argument("--shard-concurrency", type=int, default=4, help="동시 조회 구간 수")
+    ap.add_argument("--parquet", action="store_true", help="sales_grid.parquet도 저장 (pyarrow 필요)")
+    ap.add_argument("--incremental", action="store_true", help="워터마크 이후(+lookback)만 조회해 SQLite에 반영, 델타 파일 출력")
+    ap.add_argument("--lookback-days", type=int, default=7, help="증분 조회 시 워터마크 이전으로 다시 볼 일수 (소급 수정 반영)")
+    ap.add_argument("--sync-db", default=None, help="증분 동기화 SQLite 경로 (기본: <out>/mekics_sync.db)")
     ap.add_argument("--out", default="out_modular", help="출력 디렉토리")
     args = ap.parse_args()
 
@@ -27,11 +37,21 @@ def main():
     session = login_and_get_session(args.id, args.pw, args.db)
 
     # 2) 그리드 수집
-    csv_path = fetch_sales_grid(session, out_dir, args.sale_fr, args.sale_to, args.limit)
-    print("[OK] GRID CSV:", csv_path)
+    sale_fr = args.sale_fr
+    if args.incremental:
+        delta_path, sale_fr = sync_sales(session, out_dir, args.sale_fr, args.sale_to, args.limit, args.concurrency, args.batch,
+                                         Path(args.sync_db) if args.sync_db else None, args.lookback_days)
+        print("[OK] DELTA:", delta_path)
+    else:
+        if args.shard == "none":
+            csv_path = fetch_sales_grid(session, out_dir, args.sale_fr, args.sale_to, args.limit, args.concurrency, args.batch, args.parquet)
+        else:
+            csv_path = fetch_sales_sharded(session, out_dir, args.sale_fr, args.sale_to, args.limit, args.shard,
+                                           args.shard_concurrency, page_concurrency=1, batch_size=args.batch, parquet=args.parquet)
+        print("[OK] GRID CSV:", csv_path)
 
     # 3) 엑셀 다운로드
-    xlsx_path = export_excel(session, out_dir, args.sale_fr, args.sale_to, Path(__file__).parent / "templates" / "ssa450skrv_excel_template.xml")
+    xlsx_path = export_excel(session, out_dir, sale_fr, args.sale_to, Path(__file__).parent / "templates" / "ssa450skrv_excel_template.xml")
     print("[OK] XLSX:", xlsx_path)
 
 if __name__ == "__main__":
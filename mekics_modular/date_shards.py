@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+기간 분할(샤딩) 조회 - 장기간 조회를 월 단위(또는 적응형) 구간으로 나눠 병렬 수집
+- 실패한 구간만 재시도 (반복 실패 시 구간을 반으로 나눠 재시도)
+- 구간별 결과를 날짜 순으로 합치고 key_fields가 있으면 중복 행 제거 (sink가 있으면 앞 구간이 끝나는 대로 바로 기록)
+- adaptive 모드는 관측된 행 수/응답 시간으로 다음 구간 길이를 조정
+"""
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+from grid_sink import GridSink
+from sales_grid import fetch_rows, pooled_session
+
+FMT = "%Y%m%d"
+
+def _d(s: str) -> date:
+    return datetime.strptime(s, FMT).date()
+
+def _s(d: date) -> str:
+    return d.strftime(FMT)
+
+def month_windows(date_fr: str, date_to: str) -> List[Tuple[str, str]]:
+    # 달력 월 경계로 분할 (첫/마지막 구간은 잘림)
+    start, end = _d(date_fr), _d(date_to)
+    windows = []
+    while start <= end:
+        next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        stop = min(next_month - timedelta(days=1), end)
+        windows.append((_s(start), _s(stop)))
+        start = stop + timedelta(days=1)
+    return windows
+
+class DateShardFetcher:
+    """기간 구간을 병렬로 수집하는 샤딩 엔진"""
+
+    def __init__(self, fetch: Callable[[str, str], List[dict]], mode: str = "month", concurrency: int = 4,
+                 max_retries: int = 3, target_rows: int = 5000, target_seconds: float = 20.0,
+                 min_days: int = 1, max_days: int = 92, initial_days: int = 31,
+                 key_fields: Optional[Sequence[str]] = None):
+        """
+        Args:
+            fetch: (date_fr, date_to) -> rows 함수 (예: sales_grid.fetch_rows 래핑)
+            mode: "month" (달력 월 고정) 또는 "adaptive" (관측치로 구간 길이 조정)
+            concurrency: 동시에 조회할 구간 수
+            max_retries: 구간별 최대 재시도 횟수
+            target_rows / target_seconds: adaptive 모드에서 구간 하나가 목표로 하는 행 수 / 응답 시간
+            min_days / max_days / initial_days: adaptive 구간 길이 범위와 시작값 (일)
+            key_fields: 중복 판정에 쓸 컬럼 (없으면 중복 제거 안 함 - 같은 내용의 행도 정상 데이터일 수 있음)
+        """
+        if mode not in ("month", "adaptive"):
+            raise ValueError(f"unknown shard mode: {mode}")
+        self.fetch = fetch
+        self.mode = mode
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.target_rows = target_rows
+        self.target_seconds = target_seconds
+        self.min_days = min_days
+        self.max_days = max_days
+        self.window_days = initial_days
+        self.key_fields = list(key_fields) if key_fields else None
+        self.stats = {"windows": 0, "retries": 0, "splits": 0, "rows": 0, "duplicates": 0, "failed": []}
+
+    # ============ 구간 계획 ============
+    def _adapt(self, days: int, rows: int, seconds: float):
+        # 행 수와 응답 시간 중 더 빡빡한 쪽 기준으로 다음 구간 길이 조정 (급변 방지를 위해 0.5~2배)
+        ratio = min(self.target_rows / max(rows, 1), self.target_seconds / max(seconds, 0.001))
+        ratio = max(0.5, min(2.0, ratio))
+        self.window_days = int(max(self.min_days, min(self.max_days, round(days * ratio))))
+
+    def _next_adaptive(self, cursor: date, end: date) -> Tuple[str, str]:
+        stop = min(cursor + timedelta(days=self.window_days - 1), end)
+        return _s(cursor), _s(stop)
+
+    def _split(self, window: Tuple[str, str]) -> Optional[List[Tuple[str, str]]]:
+        start, end = _d(window[0]), _d(window[1])
+        days = (end - start).days + 1
+        if days < 2 or days <= self.min_days:
+            return None
+        mid = start + timedelta(days=days // 2 - 1)
+        return [(_s(start), _s(mid)), (_s(mid + timedelta(days=1)), _s(end))]
+
+    def _run_window(self, window: Tuple[str, str]) -> Tuple[List[dict], float]:
+        started = time.time()
+        rows = self.fetch(window[0], window[1])
+        return rows, time.time() - started
+
+    # ============ 실행 ============
+    def run(self, date_fr: str, date_to: str, sink: Optional[GridSink] = None) -> List[dict]:
+        """구간별 조회 실행. sink가 있으면 날짜 순으로 바로 기록하고 빈 목록 반환"""
+        end = _d(date_to)
+        pending: List[Tuple[str, str]] = month_windows(date_fr, date_to) if self.mode == "month" else []
+        cursor = _d(date_fr) if self.mode == "adaptive" else end + timedelta(days=1)
+        attempts: Dict[Tuple[str, str], int] = {}
+        results: Dict[str, Tuple[str, List[dict]]] = {}  # 시작일 → (종료일, 행), 아직 기록 전인 구간만
+        merged: List[dict] = []
+        seen = set()
+        next_start = date_fr
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as ex:
+            running = {}
+            while pending or cursor <= end or running:
+                # 빈 슬롯 채우기: 재시도/분할 구간 우선, 그다음 새 구간
+                while len(running) < self.concurrency and (pending or cursor <= end):
+                    if pending:
+                        window = pending.pop(0)
+                    else:
+                        window = self._next_adaptive(cursor, end)
+                        cursor = _d(window[1]) + timedelta(days=1)
+                    running[ex.submit(self._run_window, window)] = window
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    window = running.pop(fut)
+                    try:
+                        rows, seconds = fut.result()
+                    except Exception as e:
+                        attempts[window] = attempts.get(window, 0) + 1
+                        halves = self._split(window) if attempts[window] >= 2 else None
+                        if halves:
+                            # 반복 실패는 구간이 너무 큰 것으로 보고 반으로 나눔
+                            print(f"[SHARD] {window[0]}~{window[1]} 실패 {attempts[window]}회 → 분할: {e}")
+                            self.stats["splits"] += 1
+                            pending[:0] = halves
+                            if self.mode == "adaptive":
+                                self.window_days = max(self.min_days, self.window_days // 2)
+                        elif attempts[window] <= self.max_retries:
+                            print(f"[SHARD] {window[0]}~{window[1]} 재시도 ({attempts[window]}/{self.max_retries}): {e}")
+                            self.stats["retries"] += 1
+                            pending.insert(0, window)
+                        else:
+                            print(f"[SHARD] {window[0]}~{window[1]} 최종 실패: {e}")
+                            self.stats["failed"].append(window)
+                        continue
+
+                    results[window[0]] = (window[1], rows)
+                    self.stats["windows"] += 1
+                    days = (_d(window[1]) - _d(window[0])).days + 1
+                    print(f"[SHARD] {window[0]}~{window[1]}: {len(rows)}건 ({seconds:.1f}s, {days}일)")
+                    if self.mode == "adaptive":
+                        self._adapt(days, len(rows), seconds)
+
+                # 구간들은 전체 기간을 빈틈없이 나누므로 다음 시작일 구간이 오면 순서대로 내보냄
+                while next_start in results:
+                    stop, rows = results.pop(next_start)
+                    self._emit(rows, seen, sink.write if sink else merged.extend)
+                    next_start = _s(_d(stop) + timedelta(days=1))
+
+        if self.stats["failed"]:
+            failed = ", ".join(f"{a}~{b}" for a, b in self.stats["failed"])
+            raise RuntimeError(f"구간 조회 실패: {failed}")
+
+        return merged
+
+    def _emit(self, rows: List[dict], seen: set, write: Callable[[List[dict]], None]):
+        if not self.key_fields:
+            self.stats["rows"] += len(rows)
+            write(rows)
+            return
+        # 중복 판정용 키의 16바이트 해시만 유지 (행 내용 크기와 무관하게 행당 메모리 일정, 행 자체는 바로 넘김)
+        unique = []
+        for row in rows:
+            raw = json.dumps([row.get(k) for k in self.key_fields], ensure_ascii=False, default=str)
+            key = hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+            if key in seen:
+                self.stats["duplicates"] += 1
+                continue
+            seen.add(key)
+            unique.append(row)
+        self.stats["rows"] += len(unique)
+        write(unique)
+
+def fetch_sales_sharded(session: requests.Session, out_dir: Path, date_fr: str, date_to: str, limit: int = 100,
+                        mode: str = "month", concurrency: int = 4, page_concurrency: int = 1, batch_size: int = 1,
+                        key_fields: Optional[Sequence[str]] = None, parquet: bool = False) -> Path:
+    # 구간 동시성 x 페이지 동시성 만큼 커넥션 유지
+    pooled_session(session, concurrency * max(page_concurrency, 1))
+    fetcher = DateShardFetcher(
+        lambda fr, to: fetch_rows(session, fr, to, limit, page_concurrency, batch_size),
+        mode=mode, concurrency=concurrency, key_fields=key_fields
+    )
+    sink = GridSink(out_dir, parquet=parquet).open()
+    try:
+        fetcher.run(date_fr, date_to, sink)
+    finally:
+        path = sink.close()
+    print(f"[SHARD] 완료: {fetcher.stats['windows']}구간, {fetcher.stats['rows']}건 "
+          f"(재시도 {fetcher.stats['retries']}, 분할 {fetcher.stats['splits']}, 중복 제거 {fetcher.stats['duplicates']})")
+    return path
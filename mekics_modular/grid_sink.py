@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+그리드 행 스트리밍 저장 - 페이지가 도착할 때마다 바로 파일에 추가
+- sales_grid_raw.jsonl : 원본 행 (한 줄에 한 행, 중단돼도 받은 부분까지 유효)
+- sales_grid.csv       : 엑셀 템플릿의 컬럼 모델로 고정된 헤더
+- sales_grid.parquet   : 선택 (pyarrow 설치 시), 같은 고정 스키마
+"""
+import csv
+import json
+import xml.etree.ElementTree as ET
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # parquet 출력은 pyarrow가 있을 때만
+    pa = None
+
+TEMPLATE = Path(__file__).parent / "templates" / "ssa450skrv_excel_template.xml"
+
+def template_columns(xml_path: Path = TEMPLATE) -> List[Tuple[str, str]]:
+    # <field name="SALE_Q" type="integer"/> → [("SALE_Q","integer"), ...] (col 순서)
+    root = ET.parse(str(xml_path)).getroot()
+    fields = sorted(root.iter("field"), key=lambda f: int(f.get("col", 0)))
+    return [(f.get("name"), f.get("type") or "string") for f in fields if f.get("name")]
+
+def _num(v, cast):
+    # "1,000" / "12.0" / 12.0 → 숫자 (integer 컬럼은 정수 값일 때만, 아니면 ValueError)
+    if v is None or v == "":
+        return None
+    try:
+        d = Decimal(str(v).replace(",", "").strip())
+    except InvalidOperation:
+        raise ValueError(f"숫자가 아님: {v!r}") from None
+    if cast is int:
+        if not d.is_finite() or d != d.to_integral_value():
+            raise ValueError(f"정수가 아님: {v!r}")
+        return int(d)
+    return float(d)
+
+class GridSink:
+    """페이지 단위로 행을 받아 JSONL/CSV/Parquet에 바로 추가"""
+
+    def __init__(self, out_dir: Path, columns: Optional[List[Tuple[str, str]]] = None, parquet: bool = False):
+        self.out_dir = Path(out_dir)
+        self.columns = list(columns) if columns is not None else template_columns()
+        self.parquet = parquet
+        if parquet and pa is None:
+            raise RuntimeError("parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow)")
+        self.raw_path = self.out_dir / "sales_grid_raw.jsonl"
+        self.csv_path = self.out_dir / "sales_grid.csv"
+        self.parquet_path = self.out_dir / "sales_grid.parquet"
+        self.rows = 0
+        self._raw = self._csv = self._writer = self._pq = None
+        self._extra_warned = set()
+        self._cast_warned = set()
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def open(self) -> "GridSink":
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self._raw = self.raw_path.open("w", encoding="utf-8")
+        return self
+
+    def _open_tables(self, rows: List[dict]):
+        # 템플릿에 없는 컬럼은 첫 페이지 기준으로만 뒤에 추가 (헤더/스키마는 이후 고정)
+        names = {n for n, _ in self.columns}
+        for r in rows:
+            for k in r:
+                if k not in names:
+                    self.columns.append((k, "string"))
+                    names.add(k)
+        self._csv = self.csv_path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._csv, fieldnames=[n for n, _ in self.columns], extrasaction="ignore")
+        self._writer.writeheader()
+        if self.parquet:
+            types = {"integer": pa.int64(), "number": pa.float64()}
+            self._schema = pa.schema([(n, types.get(t, pa.string())) for n, t in self.columns])
+            self._pq = pq.ParquetWriter(str(self.parquet_path), self._schema)
+
+    def write(self, rows: List[dict]):
+        if not rows:
+            return
+        if self._writer is None:
+            self._open_tables(rows)
+
+        for r in rows:
+            self._raw.write(json.dumps(r, ensure_ascii=False) + "\n")
+            extra = set(r) - set(self._writer.fieldnames) - self._extra_warned
+            if extra:
+                # 원본은 jsonl에 남으므로 CSV/Parquet에서만 제외
+                print(f"[SINK] 스키마에 없는 컬럼 무시: {sorted(extra)}")
+                self._extra_warned |= extra
+            self._writer.writerow({k: r.get(k, "") for k in self._writer.fieldnames})
+
+        if self._pq is not None:
+            cols = {}
+            for name, typ in self.columns:
+                cast = int if typ == "integer" else float if typ == "number" else None
+                values = [r.get(name) for r in rows]
+                cols[name] = self._cast(name, values, cast) if cast else [None if v is None else str(v) for v in values]
+            self._pq.write_table(pa.table(cols, schema=self._schema))
+
+        # 페이지마다 flush → 중간에 죽어도 받은 페이지까지는 파일에 남음
+        self._raw.flush()
+        self._csv.flush()
+        self.rows += len(rows)
+
+    def _cast(self, name: str, values: list, cast) -> list:
+        # 변환할 수 없는 값만 null (원본은 jsonl/CSV에 남음), 컬럼마다 한 번 경고
+        out = []
+        for v in values:
+            try:
+                out.append(_num(v, cast))
+            except ValueError as e:
+                if name not in self._cast_warned:
+                    print(f"[SINK] {name} 컬럼 변환 실패 → null: {e}")
+                    self._cast_warned.add(name)
+                out.append(None)
+        return out
+
+    def close(self) -> Path:
+        for f in (self._raw, self._csv):
+            if f is not None and not f.closed:
+                f.close()
+        if self._pq is not None:
+            self._pq.close()
+            self._pq = None
+        return self.csv_path if self._writer is not None else self.raw_path
@@ -1,15 +1,25 @@
 # -*- coding: utf-8 -*-
-import json, csv
-from typing import List, Dict, Any, Optional
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from grid_sink import GridSink
 
 BASE_URL = "https://it.mek-ics.com"
 ROUTER = "/mekics/router.do"
 SALES_PATH = "/mekics/sales/ssa450skrv.do?authoUser=A"
 UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
+ROW_KEYS = ["list","data","rows","items","records","result"]
+TOTAL_KEYS = ["total","totalCount","totalRecords","TOTAL_COUNT","recordsTotal"]
+MAX_SEQUENTIAL_PAGES = 200
 
-def grid_payload(date_fr: str, date_to: str, limit: int, page: int) -> dict:
+def grid_payload(date_fr: str, date_to: str, limit: int, page: int, tid: int = 1) -> dict:
     start = (page - 1) * limit
     data = {
         "DIV_CODE":"01","SALE_CUSTOM_CODE":"","SALE_CUSTOM_NAME":"","PROJECT_NO":"","PROJECT_NAME":"",
@@ -23,50 +33,148 @@ def grid_payload(date_fr: str, date_to: str, limit: int, page: int) -> dict:
         "INOUT_TO_DATE":"","REMARK":"","WH_CODE":"","WH_CELL_CODE":"","INCLUDE_LOT_YN":"Y",
         "SITE_CODE":"MICS","page":page,"start":start,"limit":limit
     }
-    return {"action":"ssa450skrvService","method":"selectList1","data":[data],"type":"rpc","tid":1}
+    return {"action":"ssa450skrvService","method":"selectList1","data":[data],"type":"rpc","tid":tid}
 
-def fetch_sales_grid(session: requests.Session, out_dir: Path, date_fr: str, date_to: str, limit: int = 100) -> Path:
-    router_url = BASE_URL + ROUTER
-    referer = BASE_URL + SALES_PATH
-    headers = {"Accept":"*/*","Content-Type":"application/json","Origin":BASE_URL,"Referer":referer,"User-Agent":UA,"X-Requested-With":"XMLHttpRequest"}
+def _headers() -> dict:
+    return {"Accept":"*/*","Content-Type":"application/json","Origin":BASE_URL,"Referer":BASE_URL + SALES_PATH,"User-Agent":UA,"X-Requested-With":"XMLHttpRequest"}
 
-    page = 1
-    total_rows: List[dict] = []
-    while True:
-        pld = grid_payload(date_fr, date_to, limit, page)
-        r = session.post(router_url, headers=headers, json=pld, timeout=60)
-        r.raise_for_status()
+def pooled_session(session: requests.Session, pool_size: int) -> requests.Session:
+    # 동시 요청 수만큼 keep-alive 커넥션을 유지하도록 어댑터 교체
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def parse_result(result: Any) -> Tuple[Optional[List[dict]], Optional[int]]:
+    rows, total = None, None
+    if isinstance(result, dict):
+        for k in ROW_KEYS:
+            v = result.get(k)
+            if isinstance(v, list):
+                rows = v
+                break
+        for k in TOTAL_KEYS:
+            v = result.get(k)
+            if isinstance(v, (int, str)) and str(v).isdigit():
+                total = int(v)
+                break
+    return rows, total
+
+def _result_of(obj: Any) -> Any:
+    # ExtDirect 단일 응답 or 리스트 대응 (서버 예외 응답은 빈 결과가 아니라 오류로 처리)
+    first = obj[0] if isinstance(obj, list) and obj else obj
+    if isinstance(first, dict) and first.get("type") == "exception":
+        raise RuntimeError(f"Ext.Direct 서버 예외: {first.get('message') or first.get('where') or ''}")
+    if isinstance(obj, dict) and "result" in obj:
+        return obj["result"]
+    if isinstance(obj, list) and obj and isinstance(obj[0], dict) and "result" in obj[0]:
+        return obj[0]["result"]
+    return None
+
+def fetch_page(session: requests.Session, date_fr: str, date_to: str, limit: int, page: int) -> Tuple[Optional[List[dict]], Optional[int]]:
+    r = session.post(BASE_URL + ROUTER, headers=_headers(), json=grid_payload(date_fr, date_to, limit, page), timeout=60)
+    r.raise_for_status()
+    return parse_result(_result_of(r.json()))
+
+def fetch_pages_batched(session: requests.Session, date_fr: str, date_to: str, limit: int, pages: List[int]) -> Optional[Dict[int, List[dict]]]:
+    # Ext.Direct 배치: 여러 tid를 한 번의 POST로 전송. 서버가 배치를 지원하지 않으면 None
+    payload = [grid_payload(date_fr, date_to, limit, page, tid=page) for page in pages]
+    r = session.post(BASE_URL + ROUTER, headers=_headers(), json=payload, timeout=120)
+    r.raise_for_status()
+    try:
         obj = r.json()
-        result = None
-        if isinstance(obj, dict) and "result" in obj:
-            result = obj["result"]
-        elif isinstance(obj, list) and obj and isinstance(obj[0], dict) and "result" in obj[0]:
-            result = obj[0]["result"]
-        rows = None
-        if isinstance(result, dict):
-            for k in ["list","data","rows","items","result"]:
-                v = result.get(k)
-                if isinstance(v, list):
-                    rows = v; break
-        if not rows:
-            break
+    except ValueError:
+        return None
+    if not isinstance(obj, list) or len(obj) != len(pages):
+        return None
+    by_tid = {}
+    for item in obj:
+        if not isinstance(item, dict) or item.get("tid") not in pages:
+            return None
+        # 항목별 서버 예외는 단일 요청과 같이 오류로 처리 (빈 페이지로 저장하지 않음)
+        rows, _ = parse_result(_result_of(item))
+        if rows is None:
+            return None
+        by_tid[item["tid"]] = rows
+    return by_tid if len(by_tid) == len(pages) else None
+
+def _ordered_map(ex: ThreadPoolExecutor, fn, items: List, window: int) -> Iterator:
+    # ex.map과 같이 입력 순서로 결과를 내보내되 미리 제출하는 작업은 window개까지만
+    # (앞 페이지가 느려도 끝난 페이지가 메모리에 끝없이 쌓이지 않음)
+    items = iter(items)
+    running = deque(ex.submit(fn, item) for item in islice(items, max(window, 1)))
+    while running:
+        result = running.popleft().result()
+        for item in islice(items, 1):
+            running.append(ex.submit(fn, item))
+        yield result
+
+def _require_rows(rows: Optional[List[dict]], page: int) -> List[dict]:
+    # 행 목록이 없는 응답은 빈 페이지가 아니라 오류 (빈 페이지로 넘기면 동기화에서 기존 행이 삭제로 처리됨)
+    if rows is None:
+        raise RuntimeError(f"조회 결과 없음: page {page}")
+    return rows
+
+def iter_pages(session: requests.Session, date_fr: str, date_to: str, limit: int = 100, concurrency: int = 4, batch_size: int = 1) -> Iterator[List[dict]]:
+    # 페이지 순서대로 행 목록을 하나씩 내보냄 (전체를 메모리에 모으지 않음)
+    # 결과가 없는 페이지는 예외 - 내보낸 페이지들은 항상 실제 조회 결과
+    # 1) 첫 페이지로 전체 건수 확인
+    rows, total = fetch_page(session, date_fr, date_to, limit, 1)
+    if not _require_rows(rows, 1):
+        return
+    yield list(rows)
+    if len(rows) < limit:
+        return
+
+    # 전체 건수를 모르면 기존처럼 순차 조회
+    # 상한까지 꽉 찬 페이지만 나오면 예외 (잘린 결과를 전체로 보면 동기화에서 나머지 행이 삭제로 처리됨)
+    if total is None:
+        for page in range(2, MAX_SEQUENTIAL_PAGES + 1):
+            rows, _ = fetch_page(session, date_fr, date_to, limit, page)
+            if not _require_rows(rows, page):
+                return
+            yield rows
+            if len(rows) < limit:
+                return
+        raise RuntimeError(f"전체 건수 없이 {MAX_SEQUENTIAL_PAGES}페이지 초과 - 기간을 나눠서 조회 필요")
+
+    # 2) 나머지 페이지를 제한된 동시성으로 조회 (완료 순서와 무관하게 페이지 순서로 돌려줌)
+    pages = list(range(2, math.ceil(total / limit) + 1))
+    pooled_session(session, concurrency)
+
+    if batch_size > 1 and pages:
+        first = pages[:batch_size]
+        batched = fetch_pages_batched(session, date_fr, date_to, limit, first)
+        if batched is not None:
+            for page in first:
+                yield batched[page]
+            chunks = [pages[i:i + batch_size] for i in range(batch_size, len(pages), batch_size)]
+            with ThreadPoolExecutor(max_workers=concurrency) as ex:
+                fetch_chunk = lambda c: fetch_pages_batched(session, date_fr, date_to, limit, c)
+                for chunk, res in zip(chunks, _ordered_map(ex, fetch_chunk, chunks, concurrency * 2), strict=True):
+                    if res is None:
+                        raise RuntimeError(f"Ext.Direct 배치 응답 오류: pages {chunk[0]}-{chunk[-1]}")
+                    for page in chunk:
+                        yield res[page]
+            return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        fetch_one = lambda p: fetch_page(session, date_fr, date_to, limit, p)
+        for page, (page_rows, _) in zip(pages, _ordered_map(ex, fetch_one, pages, concurrency * 2), strict=True):
+            yield _require_rows(page_rows, page)
+
+def fetch_rows(session: requests.Session, date_fr: str, date_to: str, limit: int = 100, concurrency: int = 4, batch_size: int = 1) -> List[dict]:
+    total_rows: List[dict] = []
+    for rows in iter_pages(session, date_fr, date_to, limit, concurrency, batch_size):
         total_rows.extend(rows)
-        if len(rows) < limit:
-            break
-        page += 1
-        if page > 200: break
-
-    raw_path = out_dir / "sales_grid_raw.json"
-    raw_path.write_text(json.dumps(total_rows, ensure_ascii=False, indent=2), encoding="utf-8")
-    if total_rows:
-        cols = set()
-        for r in total_rows: cols.update(r.keys())
-        cols = list(cols)
-        csv_path = out_dir / "sales_grid.csv"
-        with csv_path.open("w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=cols)
-            w.writeheader()
-            for r in total_rows:
-                w.writerow({k: r.get(k, "") for k in cols})
-        return csv_path
-    return raw_path
+    return total_rows
+
+def fetch_sales_grid(session: requests.Session, out_dir: Path, date_fr: str, date_to: str, limit: int = 100, concurrency: int = 4, batch_size: int = 1, parquet: bool = False) -> Path:
+    # 페이지가 올 때마다 바로 파일에 추가 (메모리 사용량 일정, 중단 시에도 부분 결과 유지)
+    sink = GridSink(out_dir, parquet=parquet).open()
+    try:
+        for rows in iter_pages(session, date_fr, date_to, limit, concurrency, batch_size):
+            sink.write(rows)
+    finally:
+        path = sink.close()
+    return path
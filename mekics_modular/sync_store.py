@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+증분(델타) 동기화 - 프로그램 ID별 워터마크를 로컬 SQLite에 저장
+- 첫 실행: 요청 기간 전체 수집 후 저장
+- 이후: (마지막 매출일 - lookback일) ~ 종료일만 다시 조회해서 upsert
+  lookback 구간에서 사라진 행은 삭제로 처리 (소급 수정/취소 반영)
+- 변경분만 sales_delta_*.jsonl 로 출력 (op: insert / update / delete)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import requests
+
+from sales_grid import iter_pages
+
+PROGRAM_ID = "ssa450skrv"
+KEY_FIELDS = ["BILL_NUM", "ITEM_CODE", "LOT_NO"]
+FMT = "%Y%m%d"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermark (
+    program_id     TEXT PRIMARY KEY,
+    last_sale_date TEXT,
+    last_bill_num  TEXT,
+    synced_at      TEXT
+);
+CREATE TABLE IF NOT EXISTS grid_rows (
+    program_id TEXT NOT NULL,
+    row_key    TEXT NOT NULL,
+    sale_date  TEXT,
+    row_hash   TEXT NOT NULL,
+    data       TEXT NOT NULL,
+    updated_at TEXT,
+    PRIMARY KEY (program_id, row_key)
+);
+CREATE INDEX IF NOT EXISTS idx_grid_rows_date ON grid_rows (program_id, sale_date);
+"""
+
+def sale_date_of(row: dict) -> str:
+    # "2025.08.04" / "2025-08-04" / "20250804" → "20250804"
+    return "".join(ch for ch in str(row.get("SALE_DATE") or "") if ch.isdigit())[:8]
+
+class SyncStore:
+    """워터마크 + 행 저장소 (SQLite)"""
+
+    def __init__(self, db_path: Path, key_fields: Optional[Sequence[str]] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.key_fields = list(key_fields or KEY_FIELDS)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_watermark(self, program_id: str) -> Optional[Tuple[str, str]]:
+        cur = self.conn.execute("SELECT last_sale_date, last_bill_num FROM watermark WHERE program_id=?", (program_id,))
+        row = cur.fetchone()
+        return (row[0], row[1]) if row and row[0] else None
+
+    def set_watermark(self, program_id: str, sale_date: str, bill_num: str):
+        self.conn.execute(
+            "INSERT INTO watermark (program_id, last_sale_date, last_bill_num, synced_at) VALUES (?,?,?,?) "
+            "ON CONFLICT(program_id) DO UPDATE SET last_sale_date=excluded.last_sale_date, "
+            "last_bill_num=excluded.last_bill_num, synced_at=excluded.synced_at",
+            (program_id, sale_date, bill_num, datetime.now().isoformat(timespec="seconds"))
+        )
+
+    def row_keys(self, rows: Iterable[dict], counter: Dict[str, int]) -> List[str]:
+        # 같은 매출번호/품목/LOT가 여러 줄일 수 있어 조회 순서상의 순번을 붙임 (counter는 조회 전체에서 공유)
+        keys = []
+        for row in rows:
+            base = "|".join(str(row.get(k) or "") for k in self.key_fields)
+            counter[base] = counter.get(base, 0) + 1
+            keys.append(f"{base}#{counter[base]}")
+        return keys
+
+    def upsert(self, program_id: str, rows: List[dict], keys: List[str]) -> List[dict]:
+        """행 저장. 새로 생겼거나 내용이 바뀐 행만 델타로 반환"""
+        delta = []
+        now = datetime.now().isoformat(timespec="seconds")
+        for row, key in zip(rows, keys, strict=True):
+            data = json.dumps(row, ensure_ascii=False, sort_keys=True)
+            row_hash = hashlib.sha1(data.encode("utf-8")).hexdigest()
+            cur = self.conn.execute("SELECT row_hash FROM grid_rows WHERE program_id=? AND row_key=?", (program_id, key))
+            old = cur.fetchone()
+            if old and old[0] == row_hash:
+                continue
+            self.conn.execute(
+                "INSERT INTO grid_rows (program_id, row_key, sale_date, row_hash, data, updated_at) VALUES (?,?,?,?,?,?) "
+                "ON CONFLICT(program_id, row_key) DO UPDATE SET sale_date=excluded.sale_date, "
+                "row_hash=excluded.row_hash, data=excluded.data, updated_at=excluded.updated_at",
+                (program_id, key, sale_date_of(row), row_hash, data, now)
+            )
+            delta.append({"op": "update" if old else "insert", "key": key, "row": row})
+        return delta
+
+    def delete_missing(self, program_id: str, date_fr: str, date_to: str, seen: set) -> List[dict]:
+        """다시 조회한 기간에 있었는데 이번 응답에 없는 행 삭제"""
+        cur = self.conn.execute(
+            "SELECT row_key, data FROM grid_rows WHERE program_id=? AND sale_date BETWEEN ? AND ?",
+            (program_id, date_fr, date_to)
+        )
+        gone = [(key, data) for key, data in cur.fetchall() if key not in seen]
+        self.conn.executemany("DELETE FROM grid_rows WHERE program_id=? AND row_key=?", [(program_id, k) for k, _ in gone])
+        return [{"op": "delete", "key": key, "row": json.loads(data)} for key, data in gone]
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+def sync_window(store: SyncStore, program_id: str, date_fr: str, lookback_days: int = 7) -> str:
+    # 워터마크가 있으면 (마지막 매출일 - lookback) 부터, 단 요청 시작일보다 앞으로는 가지 않음
+    mark = store.get_watermark(program_id)
+    if not mark:
+        return date_fr
+    start = (datetime.strptime(mark[0], FMT) - timedelta(days=lookback_days)).strftime(FMT)
+    return max(start, date_fr)
+
+def sync_sales(session: requests.Session, out_dir: Path, date_fr: str, date_to: str, limit: int = 100,
+               concurrency: int = 4, batch_size: int = 1, db_path: Optional[Path] = None, lookback_days: int = 7,
+               program_id: str = PROGRAM_ID,
+               pages: Optional[Callable[[str, str], Iterable[List[dict]]]] = None) -> Tuple[Path, str]:
+    """증분 동기화 실행. (델타 파일 경로, 실제 조회 시작일) 반환"""
+    pages = pages or (lambda fr, to: iter_pages(session, fr, to, limit, concurrency, batch_size))
+    db_path = db_path or out_dir / "mekics_sync.db"
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    delta_path = out_dir / f"sales_delta_{program_id}_{stamp}.jsonl"
+    tmp_path = delta_path.with_suffix(".tmp")
+
+    with SyncStore(db_path) as store:
+        fr = sync_window(store, program_id, date_fr, lookback_days)
+        print(f"[SYNC] {program_id}: {fr} ~ {date_to} 조회 (워터마크: {store.get_watermark(program_id)})")
+
+        seen, counter = set(), {}
+        last = (None, "")
+        counts = {"insert": 0, "update": 0, "delete": 0, "rows": 0}
+        # 델타는 임시 파일에 쓰고 DB 커밋이 끝난 뒤에만 최종 이름으로 교체
+        # (중간 실패 시 DB는 롤백되는데 델타만 남아 소비 측이 반영하는 일이 없도록)
+        try:
+            with tmp_path.open("w", encoding="utf-8") as out:
+                def emit(delta):
+                    for d in delta:
+                        counts[d["op"]] += 1
+                        out.write(json.dumps(d, ensure_ascii=False) + "\n")
+
+                for rows in pages(fr, date_to):
+                    if rows is None:
+                        raise RuntimeError(f"조회 결과 없음: {fr} ~ {date_to}")
+                    keys = store.row_keys(rows, counter)
+                    seen.update(keys)
+                    emit(store.upsert(program_id, rows, keys))
+                    counts["rows"] += len(rows)
+                    for row in rows:
+                        mark = (sale_date_of(row), str(row.get("BILL_NUM") or ""))
+                        if mark[0] and (last[0] is None or mark > last):
+                            last = mark
+
+                # 모든 페이지가 실제 결과로 끝났을 때만 여기 도달 (실패 페이지는 예외로 빠짐)
+                emit(store.delete_missing(program_id, fr, date_to, seen))
+
+            # 워터마크는 끝까지 성공했을 때만 전진 (중간 실패 시 다음 실행에서 같은 구간 재조회)
+            if last[0]:
+                prev = store.get_watermark(program_id)
+                if not prev or last > prev:
+                    store.set_watermark(program_id, last[0], last[1])
+            store.commit()
+            os.replace(tmp_path, delta_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    print(f"[SYNC] 조회 {counts['rows']}건 → 추가 {counts['insert']}, 변경 {counts['update']}, 삭제 {counts['delete']}")
+    return delta_path, fr
@@ -286,6 +286,16 @@ class FinalRegionDownloader:
                 await browser.close()
                 print("\n[COMPLETE] All done!")
 
+async def fleet_download_region(page, action, params):
+    """브라우저 플릿 핸들러 - 시도 하나 다운로드 (site='longtermcare', action='region')"""
+    downloader = FinalRegionDownloader()
+    await downloader.initialize()
+    ok = await downloader.download_region(page, page.context, params['code'], params['name'])
+    result = downloader.results.get(params['name'], {})
+    if not ok:
+        raise RuntimeError(result.get('error', 'download failed'))
+    return result
+
 async def main():
     """메인 실행"""
     print("""
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+전국 17개 시도 장기요양기관 다운로드 - 브라우저 플릿 버전
+시도 하나를 작업 하나로 큐에 넣고, 여러 프로세스(프로세스당 브라우저 1개 + 컨텍스트 여러 개)가 나눠서 처리
+
+사용법:
+    python scripts/download_regions_fleet.py                 # CPU 코어 수만큼 프로세스
+    python scripts/download_regions_fleet.py --processes 4 --max-contexts 3
+    python scripts/download_regions_fleet.py --redis         # Redis 큐 사용 (다른 머신과 작업 공유)
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'src', 'scraper'))
+
+from distributed_scraper import DistributedScraper, TaskQueue  # noqa: E402
+from download_all_regions_final_working import FinalRegionDownloader  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description="장기요양기관 시도별 다운로드 (브라우저 플릿)")
+    parser.add_argument('--processes', type=int, default=None, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument('--max-contexts', type=int, default=3, help="프로세스당 최대 동시 컨텍스트")
+    parser.add_argument('--max-rss-mb', type=float, default=1500, help="프로세스당 RSS 상한 (MB)")
+    parser.add_argument('--redis', action='store_true', help="Redis 큐 사용")
+    parser.add_argument('--headful', action='store_true', help="브라우저 화면 표시")
+    args = parser.parse_args()
+
+    # 사이트 부하를 고려해 시도 작업은 최대 2회 재시도
+    scraper = DistributedScraper(
+        num_workers=args.processes or os.cpu_count() or 1,
+        task_queue=TaskQueue(use_redis=args.redis, key='longtermcare_regions', visibility_timeout=900)
+    )
+    for code, name in FinalRegionDownloader().regions:
+        scraper.add_browser_task('longtermcare', 'region', {'code': code, 'name': name},
+                                 task_id=f"longtermcare_region_{code}")
+
+    results = scraper.run_browser_fleet(
+        handlers={'longtermcare': 'download_all_regions_final_working:fleet_download_region'},
+        max_contexts=args.max_contexts,
+        max_rss_mb=args.max_rss_mb,
+        context_options={'longtermcare': {
+            'accept_downloads': True,
+            'viewport': {'width': 1920, 'height': 1080},
+            'locale': 'ko-KR'
+        }},
+        launch_options={
+            'headless': not args.headful,
+            'args': ['--disable-blink-features=AutomationControlled']
+        }
+    )
+
+    scraper.print_summary()
+    for task in sorted(results, key=lambda t: t.task_id):
+        detail = task.result.get('file') if task.result else task.error
+        print(f"  {'✓' if task.result else '✗'} {task.data['params']['name']}: {detail}")
+    print("\n다운로드된 파일은 downloads/longtermcare/regions 폴더를 확인하세요.")
+
+if __name__ == "__main__":
+    main()
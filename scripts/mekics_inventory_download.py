@@ -261,7 +261,7 @@ class MekicsInventoryDownloader:
                     
                     # 9. 범용 다운로더도 시도 (백업)
                     print("\n[7] 범용 다운로더 백업 시도...")
-                    downloader = UniversalDownloadEngine(str(self.downloads_dir))
+                    downloader = UniversalDownloadEngine(str(self.downloads_dir), site_name='mekics')
                     
                     async def trigger_excel():
                         await page.evaluate("""
@@ -272,7 +272,9 @@ class MekicsInventoryDownloader:
                             }
                         """)
                     
-                    backup_results = await downloader.download(page, trigger_action=trigger_excel)
+                    # 지난번에 이긴 캡처 전략만 사용 (실패 시 전체 경쟁)
+                    backup_results = await downloader.download(page, trigger_action=trigger_excel,
+                                                               race=True, trigger_key='inventory_excel')
                     
                     print("\n" + "="*60)
                     print("✅ 재고현황 다운로드 완료!")
@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import Optional
 from playwright.async_api import BrowserContext, Page
 
+from core.utils.session_store import default_store
+
 # from core.base.scraper import BaseScraper  # 불필요한 import 제거
 
 
@@ -20,7 +22,8 @@ class BizmekaAuth:
     def __init__(self):
         self.site_dir = Path("sites/bizmeka")
         self.data_dir = self.site_dir / "data"
-        self.cookie_file = self.data_dir / "cookies.json"
+        self.store = default_store()
+        self.cookie_file = self.store.state_path("bizmeka")
         
         # 설정 로드
         config_path = self.site_dir / "config" / "settings.json"
@@ -39,23 +42,17 @@ class BizmekaAuth:
         self.page = page
     
     def load_cookies(self) -> list:
-        """쿠키 로드"""
-        if self.cookie_file.exists():
-            try:
-                with open(self.cookie_file, 'r', encoding='utf-8') as f:
-                    cookies = json.load(f)
-                print(f"✅ 쿠키 로드: {len(cookies)}개")
-                return cookies
-            except Exception as e:
-                print(f"❌ 쿠키 로드 실패: {e}")
+        """쿠키 로드 (SessionStore 스냅샷)"""
+        snapshot = self.store.get("bizmeka", include_expired=True)
+        if snapshot:
+            print(f"✅ 쿠키 로드: {len(snapshot.cookies)}개")
+            return list(snapshot.cookies)
         return []
     
     def save_cookies(self, cookies: list):
-        """쿠키 저장"""
+        """쿠키 저장 (SessionStore, localStorage는 유지)"""
         try:
-            self.data_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.cookie_file, 'w', encoding='utf-8') as f:
-                json.dump(cookies, f, indent=2)
+            self.store.put_cookies("bizmeka", cookies)
             print(f"✅ 쿠키 저장: {len(cookies)}개")
         except Exception as e:
             print(f"❌ 쿠키 저장 실패: {e}")
@@ -75,8 +72,7 @@ class BizmekaAuth:
                 
                 # 메인 페이지 접속하여 로그인 상태 확인
                 main_url = self.config.get('site_info', {}).get('main_url', 'https://bizmeka.com')
-                await self.page.goto(main_url)
-                await self.page.wait_for_timeout(3000)
+                await self.page.goto(main_url, wait_until='load')
                 
                 # 로그인 상태 확인
                 if await self._check_login_status():
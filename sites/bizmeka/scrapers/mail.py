@@ -7,17 +7,47 @@ BizmekaMailScraper - 비즈메카 메일 스크래퍼
 
 from typing import List, Dict, Any
 from datetime import datetime
-from playwright.async_api import Page
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
 
 from core.base.scraper import BaseScraper
 
 
+# li.m_data 전체를 한 번의 evaluate로 읽어 컬럼 단위로 반환
+_BULK_EXTRACT_JS = """
+([itemSel, subjectSel, dateSel, sizeSel, attrs]) => {
+    const columns = {
+        mail_id: [], from_name: [], from_addr: [],
+        subject: [], date: [], size: [], unread: []
+    };
+    const text = (item, sel) => {
+        const el = item.querySelector(sel);
+        return el ? el.innerText : '';
+    };
+    for (const item of document.querySelectorAll(itemSel)) {
+        columns.mail_id.push(item.getAttribute(attrs.mail_id) || '');
+        columns.from_name.push(item.getAttribute(attrs.from_name) || '');
+        columns.from_addr.push(item.getAttribute(attrs.from_address) || '');
+        columns.subject.push(text(item, subjectSel));
+        columns.date.push(text(item, dateSel));
+        columns.size.push(text(item, sizeSel));
+        columns.unread.push(item.classList.contains('unread'));
+    }
+    return columns;
+}
+"""
+
+
 class BizmekaMailScraper(BaseScraper):
     """비즈메카 메일 스크래퍼"""
     
-    def __init__(self):
+    def __init__(self, bulk_extract: bool = True):
+        """
+        Args:
+            bulk_extract: True면 페이지당 evaluate 1회로 추출 (실패 시 요소별 추출로 대체)
+        """
         super().__init__('bizmeka')
         self.selectors = self._load_selectors()
+        self.bulk_extract = bulk_extract
     
     async def scrape(self, max_pages: int = 3) -> List[Dict[str, Any]]:
         """메일 스크래핑 메인 로직"""
@@ -60,13 +90,16 @@ class BizmekaMailScraper(BaseScraper):
         """메일 시스템 접속"""
         mail_link = await self.page.query_selector('a[href*="mail"]')
         if mail_link:
-            await mail_link.click()
-            await self.page.wait_for_timeout(3000)
-            
-            # 새 탭으로 전환
-            if len(self.context.pages) > 1:
-                self.page = self.context.pages[-1]
+            try:
+                # 새 탭이 열리면 즉시 전환
+                async with self.context.expect_page(timeout=3000) as new_page_info:
+                    await mail_link.click()
+                self.page = await new_page_info.value
                 self.log("새 탭으로 전환")
+            except PlaywrightTimeoutError:
+                pass
+            
+            await self.page.wait_for_load_state('domcontentloaded')
     
     async def _navigate_to_inbox(self):
         """받은메일함 접속"""
@@ -84,9 +117,8 @@ class BizmekaMailScraper(BaseScraper):
             try:
                 inbox = await self.page.query_selector(selector)
                 if inbox:
-                    await inbox.click()
+                    await self._click_and_wait_for_list(inbox)
                     self.log("받은메일함 접속 완료")
-                    await self.page.wait_for_timeout(3000)
                     break
             except:
                 continue
@@ -95,16 +127,70 @@ class BizmekaMailScraper(BaseScraper):
         await self.close_popups()
     
     async def _extract_mails_from_page(self, page_num: int) -> List[Dict[str, Any]]:
-        """페이지에서 메일 추출"""
+        """페이지에서 메일 추출 - 일괄 추출 우선, 실패 시 요소별 추출"""
+        if self.bulk_extract:
+            try:
+                columns = await self._extract_columns(self._mail_frame())
+                return self._rows_from_columns(columns, page_num)
+            except Exception as e:
+                self.log(f"일괄 추출 실패, 요소별 추출로 전환: {e}", "WARNING")
+        
+        return await self._extract_mails_per_element(page_num)
+    
+    async def _extract_columns(self, target_page) -> Dict[str, List[Any]]:
+        """메일 목록을 컬럼 구조로 일괄 추출 (IPC 1회)
+        
+        Returns:
+            dict: {'mail_id': [...], 'from_name': [...], 'from_addr': [...],
+                   'subject': [...], 'date': [...], 'size': [...], 'unread': [...]}
+        """
+        mail_list = self.selectors.get('mail_list', {})
+        attrs = {
+            'mail_id': 'data-key',
+            'from_name': 'data-fromname',
+            'from_address': 'data-fromaddr'
+        }
+        attrs.update(self.selectors.get('data_attributes', {}))
+        
+        return await target_page.evaluate(_BULK_EXTRACT_JS, [
+            mail_list.get('mail_items', 'li.m_data'),
+            mail_list.get('subject', 'p.m_subject'),
+            mail_list.get('date', 'span.m_date'),
+            mail_list.get('size', 'span.m_size'),
+            attrs
+        ])
+    
+    def _rows_from_columns(self, columns: Dict[str, List[Any]], page_num: int) -> List[Dict[str, Any]]:
+        """컬럼 구조를 기존 행 형식(메일 데이터 dict 리스트)으로 변환"""
+        page_mails = []
+        collected_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        for i in range(len(columns.get('mail_id', []))):
+            mail_data = {
+                '페이지': page_num,
+                '순번': i + 1,
+                '메일ID': columns['mail_id'][i],
+                '보낸사람': columns['from_name'][i].strip(),
+                '이메일주소': columns['from_addr'][i].strip(),
+                '제목': self._clean_subject(columns['subject'][i]) if columns['subject'][i] else '',
+                '날짜': columns['date'][i].strip(),
+                '크기': columns['size'][i].strip(),
+                '읽음상태': '안읽음' if columns['unread'][i] else '읽음',
+                '수집시간': collected_at
+            }
+            
+            if mail_data['보낸사람'] or mail_data['제목']:
+                page_mails.append(mail_data)
+        
+        return page_mails
+    
+    async def _extract_mails_per_element(self, page_num: int) -> List[Dict[str, Any]]:
+        """페이지에서 메일 추출 - 요소별 추출 (대체 경로)"""
         page_mails = []
         
         try:
             # 프레임 확인
-            target_page = self.page
-            for frame in self.page.frames:
-                if 'mail' in frame.url.lower():
-                    target_page = frame
-                    break
+            target_page = self._mail_frame()
             
             # li.m_data 요소들 찾기
             mail_items = await target_page.query_selector_all('li.m_data')
@@ -165,6 +251,29 @@ class BizmekaMailScraper(BaseScraper):
         
         return page_mails
     
+    def _mail_frame(self):
+        """메일 목록이 있는 프레임 (없으면 현재 페이지)"""
+        for frame in self.page.frames:
+            if 'mail' in frame.url.lower():
+                return frame
+        return self.page
+    
+    async def _click_and_wait_for_list(self, element):
+        """클릭 후 메일 목록 갱신 대기 - 목록 컨테이너 DOM 변경 및 항목 렌더링 확인"""
+        mail_list = self.selectors.get('mail_list', {})
+        container = mail_list.get('container', 'ul:has(> li.m_data)')
+        items = mail_list.get('mail_items', 'li.m_data')
+        
+        target = self._mail_frame()
+        async with self.settler.settle(target, mutation=container, timeout=5000):
+            await element.click()
+        
+        # 프레임이 새로 로드된 경우 항목이 다시 그려질 때까지 대기
+        try:
+            await self._mail_frame().wait_for_selector(items, timeout=5000)
+        except PlaywrightTimeoutError:
+            self.log("메일 목록 대기 시간 초과", "WARNING")
+    
     def _clean_subject(self, subject_text: str) -> str:
         """제목 텍스트 정리"""
         # 이모지와 불필요한 문자 제거
@@ -194,9 +303,8 @@ class BizmekaMailScraper(BaseScraper):
                 try:
                     page_link = await self.page.query_selector(selector)
                     if page_link:
-                        await page_link.click()
+                        await self._click_and_wait_for_list(page_link)
                         self.log(f"{page_num}페이지로 이동")
-                        await self.page.wait_for_timeout(3000)
                         return True
                 except:
                     continue
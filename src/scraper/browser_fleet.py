@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+"""
+브라우저 플릿 - 프로세스마다 Playwright 브라우저 1개, 브라우저마다 컨텍스트 여러 개
+DistributedScraper의 TaskQueue에서 브라우저 작업(사이트 + 동작 + 파라미터)을 꺼내 실행한다.
+
+구성:
+- 부모 프로세스: TaskQueue에서 작업을 임대(pop)해 워커에 나눠주고, 결과에 따라 ack/nack
+  (큐 백엔드가 Redis든 LocalRedis든 부모만 큐에 접근하므로 동작이 같다)
+- 워커 프로세스: core.base.browser.BrowserManager 풀(브라우저 1개)에서 컨텍스트를 임대해 핸들러 실행
+- 워커마다 CPU/RSS를 보고 동시 컨텍스트 수를 min_contexts ~ max_contexts 사이에서 조정
+
+핸들러:
+    async def handler(page, action: str, params: dict) -> Any  (결과는 JSON으로 변환 가능해야 함)
+    handlers={'longtermcare': 'download_all_regions_final_working:fleet_download_region'}
+    문자열("모듈:함수")은 워커 프로세스에서 import 하므로 spawn 방식에서도 동작한다.
+"""
+import asyncio
+import importlib
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from queue import Empty
+from typing import Any, Callable, Dict, List, Optional, Union
+from uuid import uuid4
+
+from distributed_scraper import ScrapingTask, TaskQueue, TaskStatus, decode_task, encode_task
+
+try:
+    import psutil
+except ImportError:  # 없으면 loadavg로 CPU만 판단 (RSS 조정 없음)
+    psutil = None
+
+ROOT = Path(__file__).resolve().parents[2]
+BROWSER_METHOD = 'BROWSER'
+UNSTARTED_GRACE = 5.0  # 워커가 죽은 뒤 시작 보고 없이 inbox에서 사라진 작업을 유실로 볼 때까지 (초)
+
+Handler = Union[str, Callable]
+
+def browser_task(site: str, action: str, params: Optional[Dict] = None,
+                 task_id: Optional[str] = None, max_retries: int = 2) -> ScrapingTask:
+    """브라우저 작업 생성 - 기존 작업 스키마에 그대로 실림 (method=BROWSER, data=명세)"""
+    return ScrapingTask(
+        task_id=task_id or f"{site}_{action}_{uuid4().hex[:8]}",
+        url=f"browser://{site}/{action}",
+        method=BROWSER_METHOD,
+        data={'site': site, 'action': action, 'params': params or {}},
+        max_retries=max_retries
+    )
+
+def _resolve_handler(handler: Handler) -> Callable:
+    if callable(handler):
+        return handler
+    module, _, name = handler.partition(':')
+    return getattr(importlib.import_module(module), name)
+
+# ============ 워커 프로세스 ============
+class _FleetProcess:
+    """워커 프로세스 안의 실행 루프 (브라우저 1개, 컨텍스트 N개)"""
+
+    def __init__(self, worker_id: int, inbox, outbox, config: Dict[str, Any]):
+        self.worker_id = worker_id
+        self.inbox = inbox
+        self.outbox = outbox
+        self.config = config
+        self.handlers: Dict[str, Callable] = {}
+        self.contexts = config['initial_contexts']
+        self.manager = None
+        self.running = set()
+        self.saturated = False
+        self.last_scale = time.monotonic()
+
+    async def run(self):
+        from core.base.browser import BrowserManager
+
+        self.manager = BrowserManager(
+            pool_size=1,
+            contexts_per_browser=self.contexts,
+            max_jobs_per_browser=self.config['max_jobs_per_browser'],
+            max_rss_mb=self.config['max_rss_mb'],
+            **self.config['launch_options']
+        )
+        await self.manager.start()
+        self.outbox.put(('ready', self.worker_id, {'pid': os.getpid(), 'contexts': self.contexts}))
+
+        loop = asyncio.get_running_loop()
+        stopping = False
+        try:
+            while not stopping or self.running:
+                self.running = {t for t in self.running if not t.done()}
+                if not stopping and len(self.running) < self.contexts:
+                    # 빈 컨텍스트 슬롯이 있을 때만 다음 작업을 가져감 (나머지는 다른 프로세스 몫)
+                    try:
+                        payload = await loop.run_in_executor(None, self.inbox.get, True, 0.5)
+                    except Empty:
+                        payload = False
+                    if payload is None:
+                        stopping = True
+                    elif payload:
+                        self.running.add(asyncio.ensure_future(self._run_task(payload)))
+                    self.saturated = len(self.running) >= self.contexts
+                elif self.running:
+                    await asyncio.wait(self.running, timeout=0.5, return_when=asyncio.FIRST_COMPLETED)
+
+                if time.monotonic() - self.last_scale >= self.config['scale_interval']:
+                    self._autoscale()
+        finally:
+            await self.manager.close()
+
+    async def _run_task(self, payload: bytes):
+        task = decode_task(payload)
+        spec = task.data if isinstance(task.data, dict) else {}
+        site, action = spec.get('site'), spec.get('action')
+        self.outbox.put(('started', self.worker_id, task.task_id))
+
+        started = time.monotonic()
+        record = {'task_id': task.task_id, 'status': TaskStatus.COMPLETED.value, 'result': None, 'error': None}
+        try:
+            if site not in self.handlers:
+                if site not in self.config['handlers']:
+                    raise KeyError(f"핸들러 없음: {site}")
+                self.handlers[site] = _resolve_handler(self.config['handlers'][site])
+
+            options = self.config['context_options'].get(site, {})
+            async with self.manager.lease(site, **options) as (context, page):
+                result = await asyncio.wait_for(
+                    self.handlers[site](page, action, spec.get('params') or {}),
+                    self.config['task_timeout']
+                )
+            # 프로세스 간 전달이 깨지지 않도록 JSON 범위로 변환
+            record['result'] = json.loads(json.dumps(result, ensure_ascii=False, default=str))
+        except Exception as e:
+            record['status'] = TaskStatus.FAILED.value
+            record['error'] = f"{type(e).__name__}: {e}"
+
+        record['seconds'] = time.monotonic() - started
+        self.outbox.put(('done', self.worker_id, record))
+
+    def _usage(self):
+        """(CPU %, 프로세스 트리 RSS MB) - psutil이 없으면 loadavg 기반 CPU만"""
+        if psutil is None:
+            try:
+                return os.getloadavg()[0] / (os.cpu_count() or 1) * 100, None
+            except (AttributeError, OSError):
+                return 0.0, None
+
+        cpu = psutil.cpu_percent(interval=None)
+        rss = 0
+        try:
+            proc = psutil.Process()
+            for p in [proc] + proc.children(recursive=True):
+                try:
+                    rss += p.memory_info().rss
+                except psutil.Error:
+                    continue
+        except psutil.Error:
+            return cpu, None
+        return cpu, rss / (1024 * 1024)
+
+    def _autoscale(self):
+        """CPU/RSS 여유가 있고 슬롯이 모두 찼으면 +1, 한도를 넘으면 -1"""
+        self.last_scale = time.monotonic()
+        cfg = self.config
+        cpu, rss = self._usage()
+        over_rss = cfg['max_rss_mb'] and rss is not None and rss > cfg['max_rss_mb']
+        near_rss = cfg['max_rss_mb'] and rss is not None and rss > cfg['max_rss_mb'] * 0.8
+
+        target = self.contexts
+        if cpu > cfg['cpu_high'] or over_rss:
+            target = max(cfg['min_contexts'], self.contexts - 1)
+        elif cpu < cfg['cpu_low'] and not near_rss and self.saturated:
+            target = min(cfg['max_contexts'], self.contexts + 1)
+
+        if target != self.contexts:
+            self.contexts = target
+            # 슬롯 수 이하로만 임대하므로 풀 한도만 맞추면 됨 (줄일 때는 진행 중인 작업이 끝나면서 반영)
+            self.manager.contexts_per_browser = target
+            self.outbox.put(('scale', self.worker_id, {'contexts': target, 'cpu': cpu, 'rss_mb': rss}))
+
+def _fleet_worker(worker_id: int, inbox, outbox, config: Dict[str, Any]):
+    """워커 프로세스 진입점 (spawn)"""
+    os.chdir(config['cwd'])
+    for path in config['paths']:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    try:
+        asyncio.run(_FleetProcess(worker_id, inbox, outbox, config).run())
+    except Exception as e:
+        outbox.put(('error', worker_id, f"{type(e).__name__}: {e}"))
+        raise
+
+# ============ 부모 프로세스 ============
+class BrowserFleet:
+    """브라우저 작업을 여러 프로세스에 분산 실행"""
+
+    def __init__(self, task_queue: TaskQueue, handlers: Dict[str, Handler],
+                 processes: Optional[int] = None, min_contexts: int = 1, max_contexts: int = 4,
+                 initial_contexts: int = 2, cpu_high: float = 85.0, cpu_low: float = 60.0,
+                 max_rss_mb: Optional[float] = None, scale_interval: float = 5.0,
+                 task_timeout: float = 600.0, retry_backoff: float = 2.0, max_restarts: int = 3,
+                 context_options: Optional[Dict[str, Dict]] = None,
+                 launch_options: Optional[Dict[str, Any]] = None,
+                 max_jobs_per_browser: int = 50, paths: Optional[List[str]] = None):
+        """
+        Args:
+            task_queue: 작업을 꺼낼 큐 (DistributedScraper.task_queue)
+            handlers: 사이트 → 핸들러 ("모듈:함수" 문자열 또는 최상위 함수)
+            processes: 워커 프로세스 수 (기본: CPU 코어 수)
+            min_contexts / max_contexts / initial_contexts: 프로세스당 동시 컨텍스트 범위와 시작값
+            cpu_high / cpu_low: 시스템 CPU(%)가 high를 넘으면 컨텍스트 축소, low 미만이면 확장
+            max_rss_mb: 프로세스 트리(브라우저 포함) RSS 상한 - 넘으면 축소 + 브라우저 재시작
+            task_timeout: 작업 하나의 제한 시간 (초)
+            context_options: 사이트 → browser.new_context 옵션 (accept_downloads 등)
+            launch_options: chromium.launch 옵션
+            paths: 워커 프로세스의 sys.path에 추가할 경로 (핸들러 모듈 위치)
+        """
+        self.task_queue = task_queue
+        self.processes = processes or os.cpu_count() or 1
+        self.retry_backoff = retry_backoff
+        self.max_restarts = max_restarts
+        self.config = {
+            'handlers': dict(handlers),
+            'min_contexts': min_contexts,
+            'max_contexts': max_contexts,
+            'initial_contexts': max(min_contexts, min(initial_contexts, max_contexts)),
+            'cpu_high': cpu_high,
+            'cpu_low': cpu_low,
+            'max_rss_mb': max_rss_mb,
+            'scale_interval': scale_interval,
+            'task_timeout': task_timeout,
+            'context_options': context_options or {},
+            'launch_options': launch_options or {'headless': True},
+            'max_jobs_per_browser': max_jobs_per_browser,
+            'cwd': str(ROOT),
+            'paths': [str(ROOT), str(Path(__file__).resolve().parent), str(ROOT / 'scripts')] + list(paths or [])
+        }
+
+        self.stats = {
+            'completed': 0,
+            'failed': 0,
+            'retried': 0,
+            'restarts': 0,
+            'workers': {}
+        }
+
+    def run(self) -> List[ScrapingTask]:
+        """큐가 빌 때까지 실행하고 최종 결과(성공/실패) 반환"""
+        ctx = mp.get_context('spawn')  # Playwright는 fork 이후 재사용 불가
+        inbox, outbox = ctx.Queue(), ctx.Queue()
+        procs: Dict[int, Any] = {}
+
+        def start(worker_id: int):
+            proc = ctx.Process(target=_fleet_worker, args=(worker_id, inbox, outbox, self.config), daemon=True)
+            proc.start()
+            procs[worker_id] = proc
+            self.stats['workers'].setdefault(worker_id, {'completed': 0, 'failed': 0, 'contexts': self.config['initial_contexts']})
+
+        print(f"\n🧭 브라우저 플릿 시작 (프로세스: {self.processes}, 컨텍스트: "
+              f"{self.config['min_contexts']}~{self.config['max_contexts']})")
+        for worker_id in range(self.processes):
+            start(worker_id)
+
+        results: List[ScrapingTask] = []
+        pending: Dict[str, ScrapingTask] = {}   # 큐에서 임대해 워커 쪽에 넘긴 작업
+        claimed: Dict[str, int] = {}            # task_id → 처리 중인 워커
+        queued = 0                              # inbox에 있고 아직 아무도 안 가져간 수
+        suspects: Dict[str, tuple] = {}         # 워커가 죽을 때 inbox에도 시작 보고에도 없던 작업 → (확인 시작 시각, 죽은 워커)
+        last_extend = time.monotonic()
+
+        try:
+            while True:
+                # 대기 작업은 프로세스 수만큼만 미리 넣어둠 (나머지는 큐에 남아 다른 플릿/재시도 몫)
+                while queued < self.processes:
+                    task = self.task_queue.pop(timeout=0)
+                    if task is None:
+                        break
+                    if task.method != BROWSER_METHOD:
+                        print(f"⚠️ 브라우저 작업 아님 → 재시도 없이 실패: {task.task_id}")
+                        task.retry_count = task.max_retries
+                        self.task_queue.nack(task)
+                        continue
+                    pending[task.task_id] = task
+                    inbox.put(encode_task(task))
+                    queued += 1
+
+                if not pending and self.task_queue.size() == 0 and self.task_queue.delayed_size() == 0:
+                    break
+
+                try:
+                    kind, worker_id, body = outbox.get(timeout=0.2)
+                except Empty:
+                    kind = None
+
+                if kind == 'started':
+                    claimed[body] = worker_id
+                    suspects.pop(body, None)
+                    queued -= 1
+                elif kind == 'done':
+                    claimed.pop(body['task_id'], None)
+                    task = pending.pop(body['task_id'], None)
+                    if task is not None:
+                        self._finish(task, worker_id, body, results)
+                elif kind == 'scale':
+                    self.stats['workers'][worker_id]['contexts'] = body['contexts']
+                    print(f"  ⚖️ 워커 {worker_id}: 컨텍스트 {body['contexts']}개 "
+                          f"(CPU {body['cpu']:.0f}%" + (f", RSS {body['rss_mb']:.0f}MB)" if body['rss_mb'] else ")"))
+                elif kind == 'ready':
+                    print(f"  🔧 워커 {worker_id} 준비 (pid {body['pid']})")
+                elif kind == 'error':
+                    print(f"  ❌ 워커 {worker_id} 오류: {body}")
+
+                # 비정상 종료된 워커: 처리 중이던 작업은 실패 1회로 되돌리고 워커 재시작
+                for worker_id, proc in list(procs.items()):
+                    if proc.is_alive():
+                        continue
+                    lost = [task_id for task_id, owner in claimed.items() if owner == worker_id]
+                    print(f"  💥 워커 {worker_id} 종료 (exit {proc.exitcode}), 작업 {len(lost)}개 재시도")
+                    # inbox.get()과 'started' 보고 사이에 죽었으면 그 작업은 inbox에도 claimed에도 없음
+                    now = time.monotonic()
+                    for task_id in self._unstarted_outside_inbox(inbox, pending, claimed):
+                        suspects.setdefault(task_id, (now, worker_id))
+                    for task_id in lost:
+                        claimed.pop(task_id)
+                        task = pending.pop(task_id)
+                        task.error = f"worker {worker_id} exited ({proc.exitcode})"
+                        self._finish(task, worker_id, None, results)
+                    if self.stats['restarts'] < self.max_restarts * self.processes:
+                        self.stats['restarts'] += 1
+                        start(worker_id)
+                    else:
+                        del procs[worker_id]
+
+                # 의심 작업: 다른 워커가 막 가져가 'started'를 보내는 중일 수 있으므로 유예 후에도 시작 보고가 없으면 유실로 처리
+                for task_id, (since, dead_worker) in list(suspects.items()):
+                    if task_id in claimed or task_id not in pending:
+                        del suspects[task_id]
+                    elif time.monotonic() - since >= UNSTARTED_GRACE:
+                        del suspects[task_id]
+                        queued -= 1
+                        task = pending.pop(task_id)
+                        task.error = f"worker {dead_worker} exited before starting the task"
+                        self._finish(task, dead_worker, None, results)
+
+                if not procs:
+                    print("❌ 살아 있는 워커가 없어 중단 (남은 작업은 임대 만료 후 재시도)")
+                    break
+
+                # 오래 걸리는 브라우저 작업이 처리 중에 임대 만료로 재배포되지 않도록 연장
+                if time.monotonic() - last_extend >= self.task_queue.visibility_timeout / 3:
+                    last_extend = time.monotonic()
+                    self.task_queue.extend_lease(list(pending.values()))
+        finally:
+            for _ in procs:
+                inbox.put(None)
+            for proc in procs.values():
+                proc.join(timeout=30)
+                if proc.is_alive():
+                    proc.terminate()
+
+        return results
+
+    @staticmethod
+    def _unstarted_outside_inbox(inbox, pending: Dict[str, ScrapingTask], claimed: Dict[str, int]) -> List[str]:
+        """inbox를 비워 보고 다시 넣은 뒤, 시작 보고가 없는데 inbox에도 없는 작업 ID 반환"""
+        unstarted = {task_id for task_id in pending if task_id not in claimed}
+        if not unstarted:
+            return []
+        drained = []
+        while True:
+            try:
+                payload = inbox.get(timeout=0.1)
+            except Empty:
+                break
+            if payload is None:  # 종료 신호는 run() 끝에서만 넣으므로 여기서는 나오지 않음
+                continue
+            drained.append(payload)
+        for payload in drained:
+            inbox.put(payload)
+        in_inbox = {decode_task(payload).task_id for payload in drained}
+        return [task_id for task_id in unstarted if task_id not in in_inbox]
+
+    def _finish(self, task: ScrapingTask, worker_id: int, record: Optional[Dict], results: List[ScrapingTask]):
+        """워커 결과 반영 - 성공 ack, 실패는 백오프 후 재시도 또는 dead-letter"""
+        worker = self.stats['workers'][worker_id]
+        if record and record['status'] == TaskStatus.COMPLETED.value:
+            task.status = TaskStatus.COMPLETED
+            task.result = record['result']
+            task.completed_at = task.completed_at or datetime.now()
+            self.task_queue.ack(task)
+            self.stats['completed'] += 1
+            worker['completed'] += 1
+            results.append(task)
+            return
+
+        if record:
+            task.error = record['error']
+        delay = self.retry_backoff * 2 ** task.retry_count
+        if self.task_queue.nack(task, delay=delay):
+            self.stats['retried'] += 1
+            print(f"  🔁 재시도 예약 ({task.retry_count}/{task.max_retries}, {delay:.1f}초 후): {task.url} - {task.error}")
+            return
+
+        task.status = TaskStatus.FAILED
+        task.completed_at = datetime.now()
+        self.stats['failed'] += 1
+        worker['failed'] += 1
+        results.append(task)
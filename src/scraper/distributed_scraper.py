@@ -10,13 +10,28 @@ from dataclasses import dataclass
 from enum import Enum
 import json
 import time
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
 import multiprocessing as mp
 from queue import Queue, Empty
 import threading
-import pickle
-import redis
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+try:
+    import redis
+except ImportError:  # Redis 백엔드는 redis-py가 있을 때만 (테스트는 LocalRedis 사용)
+    redis = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack이 없으면 JSON 직렬화
+    msgpack = None
+
+from local_redis import LocalRedis
 
 class TaskStatus(Enum):
     """작업 상태"""
@@ -41,18 +56,154 @@ class ScrapingTask:
     error: str = None
     created_at: datetime = None
     completed_at: datetime = None
+    lease: Optional[str] = None  # pop할 때 받은 임대 토큰 (큐에 싣지 않음, ack/nack/extend_lease에 사용)
     
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now()
 
+# 큐에 싣는 요청 명세 (결과/시각 객체는 싣지 않음)
+#   v: 스키마 버전, id: task_id, u: url, m: method, h: headers, d: data,
+#   r: retry_count, x: max_retries, t: 생성 시각 (epoch 초)
+TASK_SCHEMA_VERSION = 1
+
+def encode_task(task: ScrapingTask, serializer: str = 'json') -> bytes:
+    """ScrapingTask → 전송용 bytes (요청 명세만)"""
+    spec = {
+        'v': TASK_SCHEMA_VERSION,
+        'id': task.task_id,
+        'u': task.url,
+        'm': task.method,
+        'r': task.retry_count,
+        'x': task.max_retries,
+        't': round(task.created_at.timestamp(), 3) if task.created_at else None
+    }
+    if task.headers:
+        spec['h'] = task.headers
+    if task.data:
+        spec['d'] = task.data
+    
+    if serializer == 'msgpack':
+        return msgpack.packb(spec, use_bin_type=True)
+    return json.dumps(spec, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def decode_task(payload: bytes, serializer: str = 'json') -> ScrapingTask:
+    """전송용 bytes → ScrapingTask (스키마 검증 후 허용된 필드만 사용)"""
+    if serializer == 'msgpack':
+        spec = msgpack.unpackb(payload, raw=False)
+    else:
+        spec = json.loads(payload)
+    
+    if not isinstance(spec, dict) or spec.get('v') != TASK_SCHEMA_VERSION:
+        raise ValueError(f"지원하지 않는 작업 형식: {str(spec)[:100]}")
+    if not isinstance(spec.get('id'), str) or not isinstance(spec.get('u'), str):
+        raise ValueError("작업 id/url 누락")
+    
+    return ScrapingTask(
+        task_id=spec['id'],
+        url=spec['u'],
+        method=str(spec.get('m') or 'GET'),
+        headers=spec.get('h') if isinstance(spec.get('h'), dict) else None,
+        data=spec.get('d') if isinstance(spec.get('d'), (dict, str)) else None,
+        retry_count=int(spec.get('r') or 0),
+        max_retries=int(spec.get('x') if spec.get('x') is not None else 3),
+        created_at=datetime.fromtimestamp(spec['t']) if spec.get('t') else None
+    )
+
+class ResultStore:
+    """작업 결과 저장소 - 큐와 분리 (Redis 해시 또는 로컬 dict)"""
+    
+    def __init__(self, redis_client=None, key: str = 'scraping_results'):
+        self.redis_client = redis_client
+        self.key = key
+        self.local: Dict[str, Dict] = {}
+    
+    @staticmethod
+    def _record(task: ScrapingTask) -> Dict:
+        return {
+            'status': task.status.value,
+            'url': task.url,
+            'result': task.result,
+            'error': task.error,
+            'retry_count': task.retry_count,
+            'completed_at': task.completed_at.isoformat() if task.completed_at else None
+        }
+    
+    def save(self, task: ScrapingTask):
+        """결과 저장"""
+        self.save_many([task])
+    
+    def save_many(self, tasks: List[ScrapingTask]):
+        """결과 일괄 저장 (Redis는 HSET 한 번)"""
+        if not tasks:
+            return
+        if self.redis_client is None:
+            for task in tasks:
+                self.local[task.task_id] = self._record(task)
+            return
+        mapping = {
+            task.task_id: json.dumps(self._record(task), ensure_ascii=False, default=str)
+            for task in tasks
+        }
+        self.redis_client.hset(self.key, mapping=mapping)
+    
+    def get(self, task_id: str) -> Optional[Dict]:
+        """결과 조회"""
+        if self.redis_client is None:
+            return self.local.get(task_id)
+        raw = self.redis_client.hget(self.key, task_id)
+        return json.loads(raw) if raw else None
+    
+    def size(self) -> int:
+        if self.redis_client is None:
+            return len(self.local)
+        return self.redis_client.hlen(self.key)
+
 class TaskQueue:
-    """작업 큐 관리"""
+    """작업 큐 관리
+    
+    Redis 백엔드는 pickle 대신 요청 명세만 담은 JSON(또는 msgpack)으로 저장하고,
+    결과는 self.results(ResultStore)에 따로 저장한다.
+    Redis를 쓰지 않으면 같은 명령을 LocalRedis(프로세스 메모리)로 실행하므로 두 백엔드의 동작이 같다.
+    
+    신뢰성 보장:
+    - pop한 작업은 처리 목록으로 옮겨지고 visibility_timeout 동안 임대(lease)됨
+    - ack()로 완료, nack()로 재시도(지연 가능) 또는 max_retries 초과 시 dead-letter
+    - 임대가 만료된 작업(워커 비정상 종료)은 requeue_expired()가 다시 큐에 넣음
+    - 임대는 pop마다 새 토큰(task.lease)으로 기록하므로, 임대가 만료돼 다른 워커가 다시 가져간 뒤
+      늦게 끝난 원래 워커의 ack/nack/extend_lease는 새 임대에 영향을 주지 않음
     
-    def __init__(self, use_redis: bool = False, redis_host: str = 'localhost'):
-        self.use_redis = use_redis
+    키 구성 (key='scraping_tasks'):
+        scraping_tasks             대기 목록
+        scraping_tasks:processing  처리 중 목록 (pop 시 원자적으로 이동)
+        scraping_tasks:leases      임대 토큰 → 임대 만료 시각 (정렬 집합)
+        scraping_tasks:inflight    임대 토큰 → payload (해시), 토큰은 "{task_id}:{uuid}"
+        scraping_tasks:delayed     지연 재시도 payload → 실행 시각 (정렬 집합)
+        scraping_tasks:dead        dead-letter 목록
+    """
+    
+    def __init__(self, use_redis: bool = False, redis_host: str = 'localhost',
+                 redis_client=None, serializer: str = 'json', key: str = 'scraping_tasks',
+                 visibility_timeout: float = 300.0, reap_interval: float = 1.0):
+        self.use_redis = use_redis or redis_client is not None
+        self.key = key
+        self.processing_key = f"{key}:processing"
+        self.leases_key = f"{key}:leases"
+        self.inflight_key = f"{key}:inflight"
+        self.delayed_key = f"{key}:delayed"
+        self.dead_key = f"{key}:dead"
+        self.visibility_timeout = visibility_timeout
+        self.reap_interval = reap_interval
+        self._last_reap = 0.0
+        self._orphans = set()
+        
+        self.serializer = serializer
+        if serializer == 'msgpack' and msgpack is None:
+            print("⚠️ msgpack 미설치, JSON 직렬화 사용")
+            self.serializer = 'json'
         
-        if use_redis:
+        self.redis_client = redis_client
+        if self.use_redis and self.redis_client is None:
             try:
                 self.redis_client = redis.Redis(host=redis_host, port=6379, db=0)
                 self.redis_client.ping()
@@ -60,42 +211,328 @@ class TaskQueue:
             except:
                 print("⚠️ Redis 연결 실패, 로컬 큐 사용")
                 self.use_redis = False
-                self.local_queue = Queue()
-        else:
-            self.local_queue = Queue()
+                self.redis_client = None
+        
+        if self.redis_client is None:
+            self.redis_client = LocalRedis()
+        
+        self.results = ResultStore(self.redis_client)
+    
+    def _encode(self, task: ScrapingTask) -> bytes:
+        return encode_task(task, self.serializer)
+    
+    def _decode(self, payload: bytes) -> ScrapingTask:
+        return decode_task(payload, self.serializer)
     
+    # ============ 추가 ============
     def push(self, task: ScrapingTask):
         """작업 추가"""
-        if self.use_redis:
-            serialized = pickle.dumps(task)
-            self.redis_client.rpush('scraping_tasks', serialized)
-        else:
-            self.local_queue.put(task)
+        self.redis_client.rpush(self.key, self._encode(task))
+    
+    def push_many(self, tasks: List[ScrapingTask], chunk_size: int = 1000) -> int:
+        """작업 일괄 추가 - 청크마다 RPUSH 한 번 (청크당 왕복 1회)"""
+        pushed = 0
+        for i in range(0, len(tasks), chunk_size):
+            chunk = [self._encode(task) for task in tasks[i:i + chunk_size]]
+            self.redis_client.rpush(self.key, *chunk)
+            pushed += len(chunk)
+        return pushed
     
+    # ============ 가져오기 (임대) ============
     def pop(self, timeout: int = 1) -> Optional[ScrapingTask]:
-        """작업 가져오기"""
-        if self.use_redis:
-            result = self.redis_client.blpop('scraping_tasks', timeout=timeout)
-            if result:
-                return pickle.loads(result[1])
+        """작업 가져오기 - 처리 목록으로 옮기고 임대 기록. 완료 후 ack/nack 필요"""
+        self._maybe_reap()
+        
+        # blmove의 timeout=0은 무한 대기이므로 비블로킹 조회는 lmove 사용
+        if timeout == 0:
+            payload = self.redis_client.lmove(self.key, self.processing_key, 'LEFT', 'RIGHT')
         else:
+            payload = self.redis_client.blmove(self.key, self.processing_key, timeout, 'LEFT', 'RIGHT')
+        if not payload:
+            return None
+        
+        tasks = self._lease([payload])
+        return tasks[0] if tasks else None  # 형식이 잘못된 payload는 dead-letter로 가고 None
+    
+    def pop_many(self, count: int) -> List[ScrapingTask]:
+        """작업 일괄 가져오기 - LMOVE count개를 한 트랜잭션으로 (왕복 1회) 후 임대 기록"""
+        self._maybe_reap()
+        
+        pipe = self.redis_client.pipeline(transaction=True)
+        for _ in range(count):
+            pipe.lmove(self.key, self.processing_key, 'LEFT', 'RIGHT')
+        payloads = [payload for payload in pipe.execute() if payload]
+        return self._lease(payloads) if payloads else []
+    
+    def _lease(self, payloads: List[bytes]) -> List[ScrapingTask]:
+        """처리 목록으로 옮긴 작업의 임대 기록 (임대 토큰 → 만료 시각, payload)"""
+        expires = time.time() + self.visibility_timeout
+        tasks = []
+        pipe = self.redis_client.pipeline(transaction=True)
+        for payload in payloads:
             try:
-                return self.local_queue.get(timeout=timeout)
-            except Empty:
-                return None
+                task = self._decode(payload)
+            except ValueError as e:
+                # 형식이 잘못된 payload는 재시도해도 소용없으므로 바로 dead-letter
+                print(f"⚠️ 잘못된 작업 → dead-letter: {e}")
+                pipe.lrem(self.processing_key, 1, payload)
+                pipe.rpush(self.dead_key, payload)
+                continue
+            task.lease = f"{task.task_id}:{uuid.uuid4().hex}"
+            pipe.hset(self.inflight_key, task.lease, payload)
+            pipe.zadd(self.leases_key, {task.lease: expires})
+            tasks.append(task)
+        pipe.execute()
+        return tasks
+    
+    # ============ 완료 / 실패 ============
+    def _release(self, lease: Optional[str]) -> Optional[bytes]:
+        """임대 해제 - 그 토큰의 임대가 아직 있을 때만 성공 (ZREM 결과로 판정), 원래 payload 반환"""
+        if not lease or not self.redis_client.zrem(self.leases_key, lease):
+            return None
+        payload = self.redis_client.hget(self.inflight_key, lease)
+        pipe = self.redis_client.pipeline(transaction=True)
+        if payload:
+            pipe.lrem(self.processing_key, 1, payload)
+        pipe.hdel(self.inflight_key, lease)
+        pipe.execute()
+        return payload or b''
+    
+    def extend_lease(self, tasks: List[ScrapingTask], timeout: Optional[float] = None):
+        """처리 시간이 긴 작업의 임대 연장 (그 토큰의 임대가 아직 있는 것만, ZADD XX)"""
+        leases = [task.lease for task in tasks if task.lease]
+        if not leases:
+            return
+        expires = time.time() + (timeout or self.visibility_timeout)
+        self.redis_client.zadd(self.leases_key, {lease: expires for lease in leases}, xx=True)
+    
+    def ack(self, task: ScrapingTask) -> bool:
+        """처리 완료 - 처리 목록에서 제거. 임대가 이미 만료돼 회수됐으면 False"""
+        return self._release(task.lease) is not None
+    
+    def nack(self, task: ScrapingTask, delay: float = 0.0) -> bool:
+        """처리 실패 - 재시도 횟수가 남았으면 delay초 뒤 다시 대기 목록으로, 아니면 dead-letter
+        
+        Returns:
+            True: 재시도 예약, False: dead-letter (또는 이미 회수된 임대)
+        """
+        if self._release(task.lease) is None:
+            return False
+        return self._retry_or_bury(task, delay)
+    
+    def _retry_or_bury(self, task: ScrapingTask, delay: float) -> bool:
+        if task.retry_count < task.max_retries:
+            task.retry_count += 1
+            payload = self._encode(task)
+            if delay > 0:
+                self.redis_client.zadd(self.delayed_key, {payload: time.time() + delay})
+            else:
+                self.redis_client.rpush(self.key, payload)
+            return True
+        
+        self.redis_client.rpush(self.dead_key, self._encode(task))
+        return False
+    
+    # ============ 회수 ============
+    def _maybe_reap(self):
+        if time.monotonic() - self._last_reap >= self.reap_interval:
+            self._last_reap = time.monotonic()
+            self.requeue_expired()
     
+    def requeue_expired(self) -> int:
+        """지연 재시도 중 실행 시각이 된 작업과 임대가 만료된 작업을 대기 목록으로 되돌림
+        
+        만료된 임대는 실패 1회로 세며, 재시도 횟수를 넘으면 dead-letter로 보낸다.
+        여러 워커가 동시에 호출해도 ZREM에 성공한 한 곳만 처리하므로 중복 재등록이 없다.
+        """
+        now = time.time()
+        moved = 0
+        
+        # 1. 실행 시각이 된 지연 재시도
+        for payload in self.redis_client.zrangebyscore(self.delayed_key, '-inf', now):
+            if self.redis_client.zrem(self.delayed_key, payload):
+                self.redis_client.rpush(self.key, payload)
+                moved += 1
+        
+        # 2. 만료된 임대
+        for lease in self.redis_client.zrangebyscore(self.leases_key, '-inf', now):
+            lease = lease.decode('utf-8') if isinstance(lease, bytes) else lease
+            payload = self.redis_client.hget(self.inflight_key, lease)
+            if self._release(lease) is None or not payload:
+                continue
+            task = self._decode(payload)
+            print(f"⏰ 임대 만료: {task.task_id} ({task.url})")
+            self._retry_or_bury(task, 0)
+            moved += 1
+        
+        # 3. 처리 목록에는 있지만 임대 기록이 없는 작업 (LMOVE 직후 워커 종료)
+        #    바로 옮기면 임대 기록 중인 작업과 겹칠 수 있으므로 두 번 연속 발견됐을 때만 회수
+        inflight = {lease.rsplit(b':', 1)[0] for lease in self.redis_client.hkeys(self.inflight_key)}
+        orphans = set()
+        for payload in self.redis_client.lrange(self.processing_key, 0, -1):
+            try:
+                task_id = self._decode(payload).task_id
+            except ValueError:
+                continue
+            if task_id.encode('utf-8') in inflight:
+                continue
+            if payload in self._orphans:
+                if self.redis_client.lrem(self.processing_key, 1, payload):
+                    self.redis_client.rpush(self.key, payload)
+                    moved += 1
+            else:
+                orphans.add(payload)
+        self._orphans = orphans
+        
+        return moved
+    
+    # ============ 상태 ============
     def size(self) -> int:
         """큐 크기"""
-        if self.use_redis:
-            return self.redis_client.llen('scraping_tasks')
-        else:
-            return self.local_queue.qsize()
+        return self.redis_client.llen(self.key)
+    
+    def processing_size(self) -> int:
+        """처리 중(임대) 작업 수"""
+        return self.redis_client.llen(self.processing_key)
+    
+    def delayed_size(self) -> int:
+        """지연 재시도 대기 작업 수"""
+        return self.redis_client.zcard(self.delayed_key)
+    
+    def dead_size(self) -> int:
+        """dead-letter 작업 수"""
+        return self.redis_client.llen(self.dead_key)
+    
+    def dead_letters(self) -> List[ScrapingTask]:
+        """dead-letter 작업 목록"""
+        tasks = []
+        for payload in self.redis_client.lrange(self.dead_key, 0, -1):
+            try:
+                tasks.append(self._decode(payload))
+            except ValueError:
+                continue
+        return tasks
+
+class AsyncRateLimiter:
+    """호스트별 동시성 제한 + 토큰 버킷 (asyncio 기반)
+    
+    time.sleep 대신 asyncio.sleep으로 대기하므로 이벤트 루프를 막지 않는다.
+    429/503 응답이 오면 해당 호스트의 속도를 절반으로 줄이고 Retry-After 동안 멈추며,
+    성공이 이어지면 설정값까지 조금씩 회복한다.
+    """
+    
+    _shared = None
+    
+    def __init__(self, rate: float = 10.0, burst: int = 10, per_host_concurrency: int = 4,
+                 min_rate: float = 0.2, host_overrides: Optional[Dict[str, Dict]] = None):
+        """
+        Args:
+            rate: 호스트당 초당 요청 수
+            burst: 버킷 크기 (순간 최대 요청 수)
+            per_host_concurrency: 호스트당 동시 요청 수
+            min_rate: 429/503으로 줄일 수 있는 최저 속도
+            host_overrides: {'www.longtermcare.or.kr': {'rate': 2, 'burst': 2, 'concurrency': 2}}
+        """
+        self.rate = rate
+        self.burst = burst
+        self.per_host_concurrency = per_host_concurrency
+        self.min_rate = min_rate
+        self.host_overrides = host_overrides or {}
+        self.hosts: Dict[str, Dict[str, Any]] = {}
+        self._loop = None
+    
+    @classmethod
+    def shared(cls) -> 'AsyncRateLimiter':
+        """프로세스 전체에서 공유하는 기본 리미터"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    
+    def _host(self, host: str) -> Dict[str, Any]:
+        # asyncio.Semaphore는 이벤트 루프에 묶이므로 새 루프(asyncio.run 재호출)에서는 다시 만듦 (속도 상태는 유지)
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            for state in self.hosts.values():
+                state['semaphore'] = asyncio.Semaphore(state['concurrency'])
+        
+        if host not in self.hosts:
+            config = self.host_overrides.get(host, {})
+            rate = config.get('rate', self.rate)
+            burst = config.get('burst', self.burst)
+            self.hosts[host] = {
+                'max_rate': rate,
+                'rate': rate,
+                'burst': burst,
+                'tokens': float(burst),
+                'updated': time.monotonic(),
+                'blocked_until': 0.0,
+                'concurrency': config.get('concurrency', self.per_host_concurrency),
+                'semaphore': asyncio.Semaphore(config.get('concurrency', self.per_host_concurrency)),
+                'throttled': 0
+            }
+        return self.hosts[host]
+    
+    def _reserve(self, state: Dict[str, Any]) -> float:
+        """토큰 하나를 예약하고 기다려야 할 시간 반환 (await 없이 계산하므로 코루틴 간 경쟁 없음)"""
+        now = time.monotonic()
+        state['tokens'] = min(state['burst'], state['tokens'] + (now - state['updated']) * state['rate'])
+        state['updated'] = now
+        state['tokens'] -= 1
+        wait = -state['tokens'] / state['rate'] if state['tokens'] < 0 else 0.0
+        return max(wait, state['blocked_until'] - now)
+    
+    @asynccontextmanager
+    async def slot(self, host: str):
+        """호스트 동시성 슬롯 + 토큰 확보"""
+        state = self._host(host)
+        async with state['semaphore']:
+            wait = self._reserve(state)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            yield
+    
+    def feedback(self, host: str, status: int, retry_after: Optional[str] = None):
+        """응답 결과로 속도 조정"""
+        state = self._host(host)
+        if status in (429, 503):
+            state['throttled'] += 1
+            state['rate'] = max(self.min_rate, state['rate'] / 2)
+            state['tokens'] = min(state['tokens'], 0.0)
+            delay = self._parse_retry_after(retry_after)
+            if delay:
+                state['blocked_until'] = max(state['blocked_until'], time.monotonic() + delay)
+            print(f"⚠️ {host}: HTTP {status} → {state['rate']:.2f} req/s" + (f", {delay:.0f}초 대기" if delay else ""))
+        elif status < 400 and state['rate'] < state['max_rate']:
+            state['rate'] = min(state['max_rate'], state['rate'] + state['max_rate'] * 0.05)
+    
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After (초 또는 HTTP 날짜) → 초"""
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            when = parsedate_to_datetime(value)
+            return max(0.0, (when - datetime.now(tz=when.tzinfo)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+    
+    def get_stats(self) -> Dict[str, Dict]:
+        """호스트별 현재 속도"""
+        return {
+            host: {'rate': state['rate'], 'max_rate': state['max_rate'], 'throttled': state['throttled']}
+            for host, state in self.hosts.items()
+        }
 
 class AsyncScraper:
     """비동기 스크래퍼"""
     
-    def __init__(self, max_concurrent: int = 10):
+    def __init__(self, max_concurrent: int = 10, rate_limiter: Optional[AsyncRateLimiter] = None):
         self.max_concurrent = max_concurrent
+        self.rate_limiter = rate_limiter or AsyncRateLimiter.shared()
         self.semaphore = None
         self.session = None
     
@@ -108,8 +545,10 @@ class AsyncScraper:
         await self.session.close()
     
     async def fetch(self, task: ScrapingTask) -> ScrapingTask:
-        """비동기 페치"""
-        async with self.semaphore:
+        """비동기 페치 - 호스트 슬롯/토큰을 먼저 얻고 전체 동시성 슬롯 사용
+        (바쁜 호스트를 기다리는 동안 전체 슬롯을 잡고 있지 않도록)"""
+        host = urlparse(task.url).netloc
+        async with self.rate_limiter.slot(host), self.semaphore:
             try:
                 task.status = TaskStatus.RUNNING
                 
@@ -121,6 +560,8 @@ class AsyncScraper:
                     timeout=aiohttp.ClientTimeout(total=30)
                 ) as response:
                     
+                    self.rate_limiter.feedback(host, response.status, response.headers.get('Retry-After'))
+                    
                     if response.status == 200:
                         content_type = response.headers.get('Content-Type', '')
                         
@@ -160,14 +601,17 @@ class Worker(threading.Thread):
     """워커 스레드"""
     
     def __init__(self, worker_id: int, task_queue: TaskQueue, result_queue: Queue,
-                 scraper_func: Callable):
+                 scraper_func: Callable, backoff: Optional[Callable[[int], float]] = None):
         super().__init__()
         self.worker_id = worker_id
         self.task_queue = task_queue
         self.result_queue = result_queue
         self.scraper_func = scraper_func
+        self.backoff = backoff or (lambda attempt: 0.0)
         self.running = True
         self.processed_count = 0
+        self.retried_count = 0
+        self.current: Optional[ScrapingTask] = None  # 처리 중인 작업 (임대 연장용)
     
     def run(self):
         """워커 실행"""
@@ -179,19 +623,31 @@ class Worker(threading.Thread):
             if task is None:
                 continue
             
-            # 작업 처리
+            # 작업 처리 (예외도 실패 결과로)
+            self.current = task
             try:
                 result = self.scraper_func(task)
+            except Exception as e:
+                task.error = str(e)
+                task.status = TaskStatus.FAILED
+                result = task
+            finally:
+                self.current = None
+            
+            # COMPLETED만 ack, 나머지는 재시도 횟수가 남았으면 백오프 후 큐로, 아니면 dead-letter + 실패 결과
+            if result.status == TaskStatus.COMPLETED:
+                self.task_queue.ack(result)
                 self.result_queue.put(result)
                 self.processed_count += 1
                 
                 if self.processed_count % 10 == 0:
                     print(f"  Worker {self.worker_id}: {self.processed_count}개 처리")
-                
-            except Exception as e:
-                task.error = str(e)
-                task.status = TaskStatus.FAILED
-                self.result_queue.put(task)
+            elif self.task_queue.nack(result, delay=self.backoff(result.retry_count + 1)):
+                result.status = TaskStatus.RETRYING
+                self.retried_count += 1
+            else:
+                result.status = TaskStatus.FAILED
+                self.result_queue.put(result)
     
     def stop(self):
         """워커 정지"""
@@ -201,12 +657,17 @@ class DistributedScraper:
     """분산 스크래핑 조율자"""
     
     def __init__(self, num_workers: int = 4, use_async: bool = True,
-                 use_multiprocessing: bool = False):
+                 use_multiprocessing: bool = False, retry_backoff: float = 1.0,
+                 max_backoff: float = 30.0, rate_limiter: Optional[AsyncRateLimiter] = None,
+                 task_queue: Optional[TaskQueue] = None):
         self.num_workers = num_workers
         self.use_async = use_async
         self.use_multiprocessing = use_multiprocessing
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter
         
-        self.task_queue = TaskQueue()
+        self.task_queue = task_queue or TaskQueue()
         self.result_queue = Queue()
         self.workers = []
         
@@ -218,10 +679,13 @@ class DistributedScraper:
             'start_time': None,
             'end_time': None
         }
+        
+        # 도메인별 처리량/지연 시간 (run_async)
+        self.domain_stats: Dict[str, Dict[str, Any]] = {}
     
     def add_task(self, url: str, **kwargs) -> str:
-        """작업 추가"""
-        task_id = f"task_{self.stats['total']}_{int(time.time())}"
+        """작업 추가 (작업 ID는 여러 생산자가 같은 큐에 넣어도 겹치지 않게 uuid)"""
+        task_id = f"task_{uuid.uuid4().hex}"
         task = ScrapingTask(
             task_id=task_id,
             url=url,
@@ -233,59 +697,132 @@ class DistributedScraper:
         
         return task_id
     
-    def add_urls(self, urls: List[str]):
-        """URL 리스트 추가"""
-        task_ids = []
-        for url in urls:
-            task_id = self.add_task(url)
-            task_ids.append(task_id)
+    def add_urls(self, urls: List[str], chunk_size: int = 1000):
+        """URL 리스트 추가 (청크 단위 일괄 push)"""
+        tasks = [ScrapingTask(task_id=f"task_{uuid.uuid4().hex}", url=url) for url in urls]
+        self.task_queue.push_many(tasks, chunk_size)
+        self.stats['total'] += len(tasks)
         
-        return task_ids
+        return [task.task_id for task in tasks]
+    
+    def add_browser_task(self, site: str, action: str, params: Optional[Dict] = None, **kwargs) -> str:
+        """브라우저 작업 추가 (run_browser_fleet으로 실행)"""
+        from browser_fleet import browser_task
+        
+        task = browser_task(site, action, params, **kwargs)
+        self.task_queue.push(task)
+        self.stats['total'] += 1
+        
+        return task.task_id
+    
+    def run_browser_fleet(self, handlers: Dict[str, Any], processes: Optional[int] = None,
+                          **fleet_options) -> List[ScrapingTask]:
+        """브라우저 플릿 실행 - 프로세스마다 브라우저 1개, 컨텍스트 여러 개 (browser_fleet.BrowserFleet)"""
+        from browser_fleet import BrowserFleet
+        
+        self.stats['start_time'] = datetime.now()
+        fleet = BrowserFleet(self.task_queue, handlers, processes=processes or self.num_workers, **fleet_options)
+        results = fleet.run()
+        
+        self.stats['completed'] += fleet.stats['completed']
+        self.stats['failed'] += fleet.stats['failed']
+        self.stats['retried'] += fleet.stats['retried']
+        self.stats['fleet'] = fleet.stats
+        self.task_queue.results.save_many(results)
+        self.stats['end_time'] = datetime.now()
+        return results
     
     async def run_async(self) -> List[ScrapingTask]:
-        """비동기 실행"""
-        print(f"\n🚀 비동기 스크래핑 시작 (동시 실행: {self.num_workers})")
+        """비동기 실행 - 워커 코루틴이 큐가 빌 때까지 계속 작업을 가져감
+        
+        느린 URL 하나가 다른 작업을 막지 않고, 실패한 작업은 백오프 후 큐에 다시 들어가
+        같은 실행 안에서 재시도된다. 재시도 대기나 처리 중인 작업이 남아 있으면 워커는 종료하지 않는다.
+        """
+        print(f"\n🚀 비동기 스크래핑 시작 (워커: {self.num_workers})")
         self.stats['start_time'] = datetime.now()
         
-        results = []
-        tasks = []
+        results: List[ScrapingTask] = []
+        running: Dict[str, ScrapingTask] = {}  # 임대 토큰 → 처리 중인 작업
         
-        # 모든 작업 수집
-        while True:
-            task = self.task_queue.pop(timeout=0)
-            if task is None:
-                break
-            tasks.append(task)
+        async def keep_leases():
+            # 처리 중인 작업이 visibility_timeout을 넘겨도 다른 워커에게 재배포되지 않도록
+            while True:
+                await asyncio.sleep(self._lease_heartbeat())
+                self.task_queue.extend_lease(list(running.values()))
         
-        # 배치 처리
-        async with AsyncScraper(max_concurrent=self.num_workers) as scraper:
-            batch_size = self.num_workers * 2
-            
-            for i in range(0, len(tasks), batch_size):
-                batch = tasks[i:i+batch_size]
-                batch_results = await scraper.batch_fetch(batch)
+        async def worker(scraper: AsyncScraper):
+            while True:
+                task = self.task_queue.pop(timeout=0)
+                if task is None:
+                    if not running and self.task_queue.delayed_size() == 0:
+                        return
+                    await asyncio.sleep(0.05)
+                    continue
                 
-                for result in batch_results:
-                    if result.status == TaskStatus.COMPLETED:
-                        self.stats['completed'] += 1
-                    elif result.status == TaskStatus.FAILED:
-                        if result.retry_count < result.max_retries:
-                            result.retry_count += 1
-                            result.status = TaskStatus.RETRYING
-                            self.stats['retried'] += 1
-                            self.task_queue.push(result)
-                        else:
-                            self.stats['failed'] += 1
+                running[task.lease] = task
+                started = time.monotonic()
+                try:
+                    result = await scraper.fetch(task)
+                except Exception as e:
+                    task.error = str(e)
+                    task.status = TaskStatus.FAILED
+                    result = task
+                latency = time.monotonic() - started
+                
+                domain = self._domain_stats(result.url)
+                domain['latencies'].append(latency)
                 
-                results.extend(batch_results)
+                if result.status == TaskStatus.COMPLETED:
+                    self.task_queue.ack(result)
+                    self.stats['completed'] += 1
+                    domain['completed'] += 1
+                    results.append(result)
+                    self.task_queue.results.save(result)
+                elif self.task_queue.nack(result, delay=self._backoff(result.retry_count + 1)):
+                    # 지수 백오프 + 지터 후 큐의 지연 목록에서 다시 나옴
+                    result.status = TaskStatus.RETRYING
+                    self.stats['retried'] += 1
+                    domain['retried'] += 1
+                else:
+                    # 재시도 소진 → dead-letter
+                    self.stats['failed'] += 1
+                    domain['failed'] += 1
+                    results.append(result)
+                    self.task_queue.results.save(result)
+                running.pop(task.lease, None)
                 
                 # 진행 상황 출력
-                print(f"  진행: {len(results)}/{len(tasks)} "
-                      f"(성공: {self.stats['completed']}, 실패: {self.stats['failed']})")
+                if len(results) % 10 == 0 and result.status != TaskStatus.RETRYING:
+                    print(f"  진행: {len(results)}/{self.stats['total']} "
+                          f"(성공: {self.stats['completed']}, 실패: {self.stats['failed']}, "
+                          f"재시도: {self.stats['retried']})")
+        
+        heartbeat = asyncio.ensure_future(keep_leases())
+        try:
+            async with AsyncScraper(max_concurrent=self.num_workers, rate_limiter=self.rate_limiter) as scraper:
+                await asyncio.gather(*[worker(scraper) for _ in range(self.num_workers)])
+        finally:
+            heartbeat.cancel()
         
         self.stats['end_time'] = datetime.now()
         return results
     
+    def _backoff(self, attempt: int) -> float:
+        """재시도 지연 (지수 백오프 + 지터)"""
+        delay = min(self.max_backoff, self.retry_backoff * 2 ** (attempt - 1))
+        return delay * random.uniform(0.8, 1.2)
+    
+    def _lease_heartbeat(self) -> float:
+        """임대 연장 주기 - 만료 전에 연장할 수 있도록 visibility timeout의 1/3 이하"""
+        return max(0.5, min(5.0, getattr(self.task_queue, 'visibility_timeout', 15.0) / 3))
+    
+    def _domain_stats(self, url: str) -> Dict[str, Any]:
+        """도메인별 통계 항목"""
+        domain = urlparse(url).netloc or url
+        if domain not in self.domain_stats:
+            self.domain_stats[domain] = {'completed': 0, 'failed': 0, 'retried': 0, 'latencies': []}
+        return self.domain_stats[domain]
+    
     def run_threaded(self, scraper_func: Callable) -> List[ScrapingTask]:
         """스레드 기반 실행"""
         print(f"\n🔄 스레드 기반 스크래핑 시작 (워커: {self.num_workers})")
@@ -293,16 +830,22 @@ class DistributedScraper:
         
         # 워커 생성
         for i in range(self.num_workers):
-            worker = Worker(i, self.task_queue, self.result_queue, scraper_func)
+            worker = Worker(i, self.task_queue, self.result_queue, scraper_func, backoff=self._backoff)
             worker.start()
             self.workers.append(worker)
         
-        # 결과 수집
+        # 결과 수집 (대기하는 동안 처리 중인 작업의 임대 연장)
         results = []
+        heartbeat = min(1.0, self._lease_heartbeat())
+        last_extend = time.monotonic()
         while len(results) < self.stats['total']:
+            if time.monotonic() - last_extend >= heartbeat:
+                self.task_queue.extend_lease([w.current for w in self.workers if w.current])
+                last_extend = time.monotonic()
             try:
-                result = self.result_queue.get(timeout=1)
+                result = self.result_queue.get(timeout=heartbeat)
                 results.append(result)
+                self.task_queue.results.save(result)
                 
                 if result.status == TaskStatus.COMPLETED:
                     self.stats['completed'] += 1
@@ -324,51 +867,73 @@ class DistributedScraper:
         
         for worker in self.workers:
             worker.join()
+            self.stats['retried'] += worker.retried_count
         
         self.stats['end_time'] = datetime.now()
         return results
     
     def run_multiprocess(self, scraper_func: Callable) -> List[ScrapingTask]:
-        """멀티프로세스 실행"""
+        """멀티프로세스 실행
+        
+        큐 전체를 미리 꺼내지 않고 프로세스 수의 두 배만큼만 임대하며, 기다리는 동안 임대를 연장한다.
+        COMPLETED 결과만 ack하고 나머지는 run_async/run_threaded처럼 백오프 후 재시도 또는 dead-letter.
+        """
         print(f"\n⚡ 멀티프로세스 스크래핑 시작 (프로세스: {self.num_workers})")
         self.stats['start_time'] = datetime.now()
         
-        # 작업 수집
-        tasks = []
-        while True:
-            task = self.task_queue.pop(timeout=0)
-            if task is None:
-                break
-            tasks.append(task)
-        
         results = []
+        futures = {}
+        window = self.num_workers * 2
+        heartbeat = self._lease_heartbeat()
         
         with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-            # 작업 제출
-            futures = {executor.submit(scraper_func, task): task 
-                      for task in tasks}
-            
-            # 결과 수집
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    results.append(result)
+            while True:
+                # 빈 슬롯만큼만 임대
+                if len(futures) < window:
+                    for task in self.task_queue.pop_many(window - len(futures)):
+                        futures[executor.submit(scraper_func, task)] = task
+                
+                if not futures:
+                    # 백오프 중인 재시도가 남았으면 지연 목록에서 나올 때까지 대기
+                    if self.task_queue.delayed_size() == 0:
+                        break
+                    time.sleep(0.05)
+                    continue
+                
+                done, _ = wait(futures, timeout=heartbeat, return_when=FIRST_COMPLETED)
+                
+                # 아직 처리 중인 작업의 임대 연장 (긴 작업이 회수돼 다시 실행되지 않도록)
+                running = [task for future, task in futures.items() if future not in done]
+                self.task_queue.extend_lease(running)
+                
+                for future in done:
+                    task = futures.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        task.error = str(e)
+                        task.status = TaskStatus.FAILED
+                        result = task
                     
                     if result.status == TaskStatus.COMPLETED:
+                        self.task_queue.ack(result)
                         self.stats['completed'] += 1
+                        results.append(result)
+                        self.task_queue.results.save(result)
+                    elif self.task_queue.nack(result, delay=self._backoff(result.retry_count + 1)):
+                        result.status = TaskStatus.RETRYING
+                        self.stats['retried'] += 1
+                        continue
                     else:
+                        # 재시도 소진 → dead-letter
+                        result.status = TaskStatus.FAILED
                         self.stats['failed'] += 1
+                        results.append(result)
+                        self.task_queue.results.save(result)
                     
                     # 진행 상황
                     if len(results) % 10 == 0:
-                        print(f"  처리: {len(results)}/{len(tasks)}")
-                        
-                except Exception as e:
-                    task = futures[future]
-                    task.error = str(e)
-                    task.status = TaskStatus.FAILED
-                    results.append(task)
-                    self.stats['failed'] += 1
+                        print(f"  처리: {len(results)}/{self.stats['total']}")
         
         self.stats['end_time'] = datetime.now()
         return results
@@ -381,6 +946,24 @@ class DistributedScraper:
             duration = (stats['end_time'] - stats['start_time']).total_seconds()
             stats['duration'] = f"{duration:.2f}초"
             stats['speed'] = f"{stats['completed'] / duration:.2f} req/s" if duration > 0 else "N/A"
+        else:
+            duration = 0
+        
+        stats['processing'] = self.task_queue.processing_size()
+        stats['dead_letters'] = self.task_queue.dead_size()
+        
+        stats['domains'] = {}
+        for domain, d in self.domain_stats.items():
+            latencies = sorted(d['latencies'])
+            stats['domains'][domain] = {
+                'completed': d['completed'],
+                'failed': d['failed'],
+                'retried': d['retried'],
+                'throughput': d['completed'] / duration if duration > 0 else 0.0,
+                'p50': _percentile(latencies, 50),
+                'p90': _percentile(latencies, 90),
+                'p99': _percentile(latencies, 99)
+            }
         
         return stats
     
@@ -395,13 +978,31 @@ class DistributedScraper:
         print(f"  완료: {stats['completed']} ({stats['completed']/stats['total']*100:.1f}%)")
         print(f"  실패: {stats['failed']}")
         print(f"  재시도: {stats['retried']}")
+        if stats['dead_letters'] or stats['processing']:
+            print(f"  dead-letter: {stats['dead_letters']} / 처리 중: {stats['processing']}")
         
         if 'duration' in stats:
             print(f"  소요 시간: {stats['duration']}")
             print(f"  처리 속도: {stats['speed']}")
         
+        if stats['domains']:
+            print("-" * 40)
+            for domain, d in stats['domains'].items():
+                print(f"  {domain}: {d['completed']}건 ({d['throughput']:.2f} req/s) "
+                      f"p50 {d['p50']:.2f}s / p90 {d['p90']:.2f}s / p99 {d['p99']:.2f}s "
+                      f"(실패 {d['failed']}, 재시도 {d['retried']})")
+        
         print("=" * 80)
 
+def _percentile(values: List[float], q: float) -> float:
+    """정렬된 값의 백분위수 (선형 보간)"""
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * q / 100
+    lower = int(k)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (k - lower)
+
 # 샘플 스크래퍼 함수
 def simple_scraper(task: ScrapingTask) -> ScrapingTask:
     """간단한 동기 스크래퍼"""
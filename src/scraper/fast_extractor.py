@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+빠른 HTML 추출 엔진 - UltimateScraper.extract_data / DataProcessor 공용
+- 파싱: 문서당 한 번 (lxml C 파서, BeautifulSoup html.parser보다 수 배 빠름)
+- 셀렉터: CSS(cssselect로 XPath 변환)와 XPath 모두 컴파일해서 프로세스별로 캐시
+- 셀렉터 맵 전체를 같은 트리에 한 번에 평가
+- 문서가 많으면 프로세스 풀에서 배치 추출
+결과 형식은 기존 BeautifulSoup 경로와 같음 (1개면 문자열, 여러 개면 리스트, 없으면 None)
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+try:
+    from cssselect import HTMLTranslator
+    from lxml import etree
+    from lxml import html as lxml_html
+    HAS_LXML = True
+except ImportError:  # lxml/cssselect가 없으면 호출 측에서 BeautifulSoup 경로 사용
+    HAS_LXML = False
+
+# 상품 목록 규칙 (DataProcessor.parse_products와 같은 우선순위)
+PRODUCT_CONTAINERS = ['div.product', 'article.product-card', 'li.product-item', 'div[data-testid="product"]']
+PRODUCT_FIELDS = {
+    'title': ['h2', 'h3', 'a.title', '.product-name'],
+    'price': ['.price', 'span.price', '.product-price']
+}
+
+# BeautifulSoup get_text()처럼 주석/script/style/template 내용은 제외
+_TEXT_XPATH = etree.XPath(
+    "descendant-or-self::text()[not(parent::script or parent::style or parent::template)]"
+) if HAS_LXML else None
+_RAW_TEXT_TAGS = {'script', 'style', 'template'}
+
+# '//a', './span', '(//li)[1]', 'count(//tr)' 같은 XPath ('.price', 'li:nth-child(2)'는 CSS)
+_XPATH_RE = re.compile(r'^(?:/|\.\.?/|\(|[a-z][a-z-]*\()')
+
+def is_xpath(selector: str) -> bool:
+    return bool(_XPATH_RE.match(selector.strip()))
+
+@lru_cache(maxsize=2048)
+def compile_selector(selector: str, scoped: bool = False) -> 'etree.XPath':
+    """CSS/XPath 셀렉터 컴파일 (프로세스별 캐시)
+
+    scoped=True면 기준 요소 자신은 빼고 하위 요소만 찾음 (BeautifulSoup의 element.select_one과 같은 범위)
+    """
+    if is_xpath(selector):
+        return etree.XPath(selector)
+    prefix = 'descendant::' if scoped else 'descendant-or-self::'
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix=prefix))
+
+def parse(html: str):
+    """문서 파싱 (비어 있으면 None)"""
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:  # 인코딩 선언이 들어 있는 str은 bytes로 넘겨야 함
+        return lxml_html.document_fromstring(html.encode('utf-8'))
+    except etree.ParserError:
+        return None
+
+def text_of(node) -> str:
+    """요소 텍스트 (get_text(strip=True)와 같은 규칙), XPath가 문자열/속성을 돌려준 경우 그대로"""
+    if isinstance(node, str):
+        return node.strip()
+    if node.tag in _RAW_TEXT_TAGS:
+        return (node.text or '').strip()
+    return ''.join(s.strip() for s in _TEXT_XPATH(node))
+
+def _collapse(found) -> Any:
+    if not isinstance(found, list):  # count(), string() 같은 스칼라 XPath
+        return found
+    if not found:
+        return None
+    if len(found) == 1:
+        return text_of(found[0])
+    return [text_of(node) for node in found]
+
+class Extractor:
+    """셀렉터 맵을 미리 컴파일해 두고, 문서마다 한 번 파싱해서 전부 평가"""
+
+    def __init__(self, selectors: Dict[str, str]):
+        self.selectors = dict(selectors)
+        self._compiled = {key: compile_selector(selector) for key, selector in self.selectors.items()}
+
+    def extract(self, html: str) -> Dict[str, Any]:
+        return self.extract_tree(parse(html))
+
+    def extract_tree(self, tree) -> Dict[str, Any]:
+        """이미 파싱한 트리에서 추출"""
+        if tree is None:
+            return {key: None for key in self._compiled}
+        return {key: _collapse(xpath(tree)) for key, xpath in self._compiled.items()}
+
+def extract(html: str, selectors: Dict[str, str]) -> Dict[str, Any]:
+    """문서 하나에서 셀렉터 맵 추출"""
+    return Extractor(selectors).extract(html)
+
+def parse_products(html: str) -> List[Dict]:
+    """상품 목록 파싱 - 첫 번째로 매칭되는 컨테이너 셀렉터의 항목들"""
+    tree = parse(html)
+    if tree is None:
+        return []
+    for container in PRODUCT_CONTAINERS:
+        items = compile_selector(container)(tree)
+        if items:
+            return [product for product in map(_product_info, items) if product]
+    return []
+
+def _first(element, selector: str):
+    found = compile_selector(selector, scoped=True)(element)
+    return found[0] if found else None
+
+def _product_info(element) -> Optional[Dict]:
+    product = {}
+    for field, selectors in PRODUCT_FIELDS.items():
+        for selector in selectors:
+            node = _first(element, selector)
+            if node is not None:
+                product[field] = text_of(node)
+                break
+
+    img = _first(element, 'img')
+    if img is not None:
+        product['image'] = img.get('src', '')
+
+    link = _first(element, 'a[href]')
+    if link is not None:
+        product['url'] = link.get('href', '')
+
+    return product or None
+
+# ============ 배치 (프로세스 풀) ============
+def _batch(func: Callable, pages: Iterable[str], processes: Optional[int], chunksize: Optional[int]) -> List:
+    """문서 목록을 프로세스 풀에 나눠 처리 (입력 순서 유지)
+
+    프로세스 1개거나 문서가 적으면 풀 생성 비용이 더 크므로 현재 프로세스에서 처리
+    """
+    pages = list(pages)
+    workers = min(processes or os.cpu_count() or 1, len(pages))
+    if workers <= 1:
+        return [func(page) for page in pages]
+
+    chunksize = chunksize or max(1, len(pages) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, pages, chunksize=chunksize))
+
+def extract_many(pages: Iterable[str], selectors: Dict[str, str], processes: Optional[int] = None,
+                 chunksize: Optional[int] = None) -> List[Dict[str, Any]]:
+    """여러 문서에서 같은 셀렉터 맵 추출 (셀렉터는 워커 프로세스마다 한 번만 컴파일)"""
+    return _batch(partial(extract, selectors=selectors), pages, processes, chunksize)
+
+def parse_products_many(pages: Iterable[str], processes: Optional[int] = None,
+                        chunksize: Optional[int] = None) -> List[List[Dict]]:
+    """여러 문서의 상품 목록 파싱"""
+    return _batch(parse_products, pages, processes, chunksize)
@@ -1,14 +1,23 @@
 # -*- coding: utf-8 -*-
 """
 GraphQL 스크래핑 전문 모듈
+- 배열 배치 POST (요청 하나에 operation 여러 개, 서버 지원 시)
+- 동시 실행 (배치 미지원 서버는 개별 요청을 max_concurrent개까지)
+- Automatic Persisted Queries (쿼리 본문 대신 sha256 해시만 전송)
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 import hashlib
 import time
 from dataclasses import dataclass
 
+from response_cache import ResponseCache
+
 @dataclass
 class GraphQLQuery:
     """GraphQL 쿼리 객체"""
@@ -16,18 +25,62 @@ class GraphQLQuery:
     variables: Dict = None
     operation_name: str = None
 
+@lru_cache(maxsize=256)
+def _query_hash(query: str) -> str:
+    """persisted query 해시 (쿼리 문자열 그대로의 sha256)"""
+    return hashlib.sha256(query.encode('utf-8')).hexdigest()
+
+def _persisted_error(result: Dict) -> Optional[str]:
+    """persisted query 관련 에러 코드 (없으면 None)"""
+    for error in (result or {}).get('errors') or []:
+        code = (error.get('extensions') or {}).get('code') or error.get('message', '')
+        if code in ('PERSISTED_QUERY_NOT_FOUND', 'PersistedQueryNotFound'):
+            return 'PERSISTED_QUERY_NOT_FOUND'
+        if code in ('PERSISTED_QUERY_NOT_SUPPORTED', 'PersistedQueryNotSupported'):
+            return 'PERSISTED_QUERY_NOT_SUPPORTED'
+    return None
+
 class GraphQLScraper:
     """GraphQL API 스크래핑 전문 클래스"""
     
-    def __init__(self, endpoint: str):
+    def __init__(self, endpoint: str, cache_ttl: float = 300, cache_max_entries: int = 500,
+                 cache_path: Optional[str] = None, batching: Optional[bool] = None, batch_size: int = 10,
+                 max_concurrent: int = 4, persisted_queries: bool = False, min_interval: float = 0.1):
+        """
+        Args:
+            batching: 배열 배치 POST 사용 여부 (None이면 첫 배치 요청으로 서버 지원 여부 확인)
+            batch_size: 배치 요청 하나에 담을 최대 operation 수
+            max_concurrent: 동시에 보낼 요청 수 (배치 묶음 또는 개별 쿼리)
+            persisted_queries: 쿼리 해시만 보내고, 서버에 없으면 그때 전체 쿼리 전송 (APQ)
+            min_interval: 요청 시작 간 최소 간격 (초, rate limiting)
+        """
         self.endpoint = endpoint
+        self.batching = batching
+        self.batch_size = max(1, batch_size)
+        self.max_concurrent = max(1, max_concurrent)
+        self.persisted_queries = persisted_queries
+        self.min_interval = min_interval
+        
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-        self.query_cache = {}
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrent)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.query_cache = ResponseCache(max_entries=cache_max_entries, ttl=cache_ttl, disk_path=cache_path)
+        
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        self.stats = {
+            'http_requests': 0,
+            'operations': 0,
+            'batched_requests': 0,
+            'persisted_hits': 0,
+            'persisted_misses': 0
+        }
     
     def execute_query(self, query: GraphQLQuery) -> Dict:
         """GraphQL 쿼리 실행"""
@@ -35,14 +88,30 @@ class GraphQLScraper:
         cache_key = self._generate_cache_key(query)
         
         # 캐시 확인
-        if cache_key in self.query_cache:
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
             print(f"📦 캐시에서 로드: {cache_key[:8]}...")
-            return self.query_cache[cache_key]
+            return cached
         
-        # 요청 페이로드 구성
-        payload = {
-            'query': query.query
-        }
+        data = self._send_safely([query])[0]
+        self._remember(cache_key, data)
+        return data
+    
+    def _remember(self, cache_key: str, data: Dict):
+        """에러 응답은 캐시하지 않음"""
+        if not data:
+            return
+        if 'errors' in data:
+            print(f"⚠️ GraphQL 에러: {data['errors']}")
+        else:
+            self.query_cache.set(cache_key, data)
+    
+    # ============ 전송 ============
+    def _payload(self, query: GraphQLQuery, include_query: bool = True) -> Dict:
+        """요청 페이로드 구성 (persisted query면 해시 확장 포함)"""
+        payload = {}
+        if include_query:
+            payload['query'] = query.query
         
         if query.variables:
             payload['variables'] = query.variables
@@ -50,34 +119,112 @@ class GraphQLScraper:
         if query.operation_name:
             payload['operationName'] = query.operation_name
         
-        # 요청 실행
+        if self.persisted_queries:
+            payload['extensions'] = {'persistedQuery': {'version': 1, 'sha256Hash': _query_hash(query.query)}}
+        
+        return payload
+    
+    def _throttle(self):
+        """요청 시작 시각 예약 - 동시 요청도 min_interval 간격으로 출발"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+    
+    def _post(self, body) -> Any:
+        self._throttle()
+        self._count('http_requests')
+        response = self.session.post(self.endpoint, json=body)
+        response.raise_for_status()
+        return response.json()
+    
+    def _post_operations(self, queries: List[GraphQLQuery], include_query: bool) -> List[Dict]:
+        """operation 묶음을 요청 하나로 전송 (1개면 일반 요청, 여러 개면 배열 배치)"""
+        payloads = [self._payload(query, include_query) for query in queries]
+        if len(payloads) == 1:
+            return [self._post(payloads[0])]
+        
+        data = self._post(payloads)
+        if not isinstance(data, list) or len(data) != len(payloads):
+            raise ValueError(f"배치 응답이 배열이 아님: {str(data)[:200]}")
+        self._count('batched_requests')
+        return data
+    
+    def _send(self, queries: List[GraphQLQuery]) -> List[Dict]:
+        """전송 + persisted query 처리 (해시를 모르는 operation만 전체 쿼리로 재전송)"""
+        self._count('operations', len(queries))
+        results = self._post_operations(queries, include_query=not self.persisted_queries)
+        if not self.persisted_queries:
+            return results
+        
+        missing = [i for i, result in enumerate(results) if _persisted_error(result)]
+        if missing:
+            if any(_persisted_error(results[i]) == 'PERSISTED_QUERY_NOT_SUPPORTED' for i in missing):
+                print("⚠️ 서버가 persisted query를 지원하지 않음 - 전체 쿼리 전송으로 전환")
+                self.persisted_queries = False
+            retried = self._post_operations([queries[i] for i in missing], include_query=True)
+            for i, result in zip(missing, retried, strict=True):
+                results[i] = result
+        self._count('persisted_misses', len(missing))
+        self._count('persisted_hits', len(queries) - len(missing))
+        return results
+    
+    def _send_safely(self, queries: List[GraphQLQuery]) -> List[Dict]:
         try:
-            response = self.session.post(
-                self.endpoint,
-                json=payload
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # 에러 체크
-            if 'errors' in data:
-                print(f"⚠️ GraphQL 에러: {data['errors']}")
-            
-            # 캐시 저장
-            self.query_cache[cache_key] = data
-            
-            return data
-            
+            return self._send(queries)
         except Exception as e:
             print(f"❌ 쿼리 실행 실패: {e}")
-            return {}
+            return [{} for _ in queries]
+    
+    def _execute_many(self, queries: List[GraphQLQuery], max_concurrent: int) -> List[Dict]:
+        """여러 쿼리 실행 - 배치 묶음(또는 개별 쿼리)을 동시에 전송, 입력 순서대로 결과"""
+        done = []
+        groups = [[query] for query in queries]
+        if self.batching is not False and len(queries) > 1 and self.batch_size > 1:
+            groups = [queries[i:i + self.batch_size] for i in range(0, len(queries), self.batch_size)]
+            if self.batching is None:
+                # 첫 묶음으로 서버의 배열 배치 지원 여부 확인
+                # (400 또는 배열이 아닌 응답만 미지원으로 확정, 타임아웃/5xx 같은 일시 오류는 다음 호출에서 다시 확인)
+                try:
+                    done = [self._send(groups[0])]
+                    groups = groups[1:]
+                    self.batching = True
+                except (requests.RequestException, ValueError) as e:
+                    response = getattr(e, 'response', None)
+                    if isinstance(e, ValueError) or (response is not None and response.status_code == 400):
+                        print(f"ℹ️ 배열 배치 미지원 ({e}) - 개별 요청으로 실행")
+                        self.batching = False
+                    else:
+                        print(f"⚠️ 배열 배치 확인 실패 ({e}) - 이번에는 개별 요청으로 실행")
+                    groups = [[query] for query in queries]
+        
+        if groups:
+            with ThreadPoolExecutor(max_workers=min(max_concurrent, len(groups))) as pool:
+                done.extend(pool.map(self._send_safely, groups))
+        return [result for group in done for result in group]
     
     def _generate_cache_key(self, query: GraphQLQuery) -> str:
-        """쿼리 캐시 키 생성"""
-        key_data = f"{query.query}{json.dumps(query.variables or {})}"
+        """쿼리 캐시 키 생성 (같은 문서라도 operation이 다르면 다른 결과)"""
+        key_data = f"{query.operation_name or ''}\n{query.query}\n{json.dumps(query.variables or {}, sort_keys=True)}"
         return hashlib.md5(key_data.encode()).hexdigest()
     
+    def get_cache_stats(self) -> Dict:
+        """쿼리 캐시 메트릭 (적중/실패/제거)"""
+        return self.query_cache.get_stats()
+    
+    def get_stats(self) -> Dict:
+        """요청 메트릭 (HTTP 요청 수 대비 operation 수, persisted query 적중) + 캐시"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats['cache'] = self.get_cache_stats()
+        return stats
+    
     def introspect_schema(self) -> Dict:
         """GraphQL 스키마 자동 탐색"""
         introspection_query = GraphQLQuery(
@@ -119,8 +266,17 @@ class GraphQLScraper:
         
         return self.execute_query(introspection_query)
     
-    def paginate_query(self, base_query: str, page_size: int = 20, max_pages: int = None) -> List[Dict]:
-        """페이지네이션 처리"""
+    def paginate_query(self, base_query: str, page_size: int = 20, max_pages: int = None,
+                       variables: Dict = None, offset_variable: str = None) -> List[Dict]:
+        """페이지네이션 처리
+        
+        - 커서 방식(기본): 다음 커서가 앞 페이지 응답에 있으므로 순차 실행
+        - offset_variable 지정 시(예: 'offset', 'skip'): 페이지끼리 독립이므로 첫 페이지의 totalCount로
+          나머지 페이지를 계산해 batch_query로 한꺼번에 실행 (totalCount가 없으면 동시 실행 폭만큼씩)
+        """
+        if offset_variable:
+            return self._paginate_offsets(base_query, page_size, max_pages, variables or {}, offset_variable)
+        
         all_results = []
         has_next_page = True
         cursor = None
@@ -131,14 +287,9 @@ class GraphQLScraper:
                 break
             
             # 커서 기반 페이지네이션 쿼리
-            variables = {
-                'first': page_size,
-                'after': cursor
-            }
-            
             query = GraphQLQuery(
                 query=base_query,
-                variables=variables
+                variables={**(variables or {}), 'first': page_size, 'after': cursor}
             )
             
             result = self.execute_query(query)
@@ -157,8 +308,59 @@ class GraphQLScraper:
             else:
                 break
             
-            page += 1
-            time.sleep(0.5)  # Rate limiting
+            page += 1  # Rate limiting은 요청마다 min_interval로
+        
+        return all_results
+    
+    def _paginate_offsets(self, base_query: str, page_size: int, max_pages: Optional[int],
+                          variables: Dict, offset_variable: str) -> List[Dict]:
+        """오프셋 페이지네이션 - 첫 페이지 이후는 batch_query로 병렬 실행"""
+        def page_query(page: int) -> GraphQLQuery:
+            return GraphQLQuery(
+                query=base_query,
+                variables={**variables, 'first': page_size, offset_variable: page * page_size}
+            )
+        
+        first = self.execute_query(page_query(0))
+        if 'data' not in first:
+            return []
+        
+        all_results = list(self._extract_edges(first['data']))
+        print(f"📄 페이지 1: {len(all_results)}개 항목")
+        if len(all_results) < page_size:
+            return all_results
+        
+        total = self._extract_total_count(first['data'])
+        last_page = -(-total // page_size) if total is not None else None
+        if max_pages:
+            last_page = min(last_page, max_pages) if last_page is not None else max_pages
+        window = self.max_concurrent * (self.batch_size if self.batching else 1)
+        
+        page = 1
+        while last_page is None or page < last_page:
+            # totalCount를 알면 남은 페이지 전부, 모르면 동시 실행 폭만큼씩 (짧은 페이지가 나오면 끝)
+            end = last_page if total is not None else page + window
+            if last_page is not None:
+                end = min(end, last_page)
+            pages = list(range(page, end))
+            results = self.batch_query([page_query(p) for p in pages])
+            
+            finished = False
+            for p, result in zip(pages, results, strict=True):
+                if 'data' not in result:
+                    # 실패한 페이지를 짧은 페이지로 보면 결과가 조용히 잘리므로 한 번 다시 요청하고, 그래도 안 되면 중단
+                    result = self.execute_query(page_query(p))
+                    if 'data' not in result:
+                        raise RuntimeError(f"페이지 {p + 1} 조회 실패: {str(result.get('errors') or '응답 없음')[:200]}")
+                edges = self._extract_edges(result.get('data') or {})
+                all_results.extend(edges)
+                print(f"📄 페이지 {p + 1}: {len(edges)}개 항목")
+                if len(edges) < page_size:
+                    finished = True
+                    break
+            if finished:
+                break
+            page = end
         
         return all_results
     
@@ -192,14 +394,43 @@ class GraphQLScraper:
         
         return {}
     
-    def batch_query(self, queries: List[GraphQLQuery]) -> List[Dict]:
-        """배치 쿼리 실행"""
-        results = []
+    def _extract_total_count(self, data: Dict) -> Optional[int]:
+        """전체 항목 수 추출 (totalCount)"""
+        for value in data.values():
+            if isinstance(value, dict):
+                if isinstance(value.get('totalCount'), int):
+                    return value['totalCount']
+                result = self._extract_total_count(value)
+                if result is not None:
+                    return result
         
-        for query in queries:
-            result = self.execute_query(query)
-            results.append(result)
-            time.sleep(0.1)  # Rate limiting
+        return None
+    
+    def batch_query(self, queries: List[GraphQLQuery], max_concurrent: int = None) -> List[Dict]:
+        """배치 쿼리 실행 (입력 순서대로 결과)
+        
+        - 캐시에 있는 쿼리는 건너뛰고, 같은 쿼리는 한 번만 요청
+        - 서버가 배열 배치를 지원하면 batch_size개씩 묶어 POST, 아니면 개별 요청
+        - 묶음(또는 개별 요청)은 max_concurrent개까지 동시에 실행
+        """
+        results = [None] * len(queries)
+        pending = {}  # cache_key -> 결과를 받을 인덱스들
+        for i, query in enumerate(queries):
+            cache_key = self._generate_cache_key(query)
+            cached = self.query_cache.get(cache_key)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(cache_key, []).append(i)
+        
+        if pending:
+            keys = list(pending)
+            fetched = self._execute_many([queries[pending[key][0]] for key in keys],
+                                         max_concurrent or self.max_concurrent)
+            for cache_key, data in zip(keys, fetched, strict=True):
+                self._remember(cache_key, data)
+                for i in pending[cache_key]:
+                    results[i] = data
         
         return results
     
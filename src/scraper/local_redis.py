@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+LocalRedis - 테스트/단일 머신용 Redis 대용품 (fakeredis 방식)
+TaskQueue가 쓰는 명령(리스트/해시/정렬 집합/파이프라인)만 프로세스 메모리 안에서 구현한다.
+값은 redis-py와 같이 bytes로 저장/반환한다.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+def _b(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode('utf-8')
+
+
+class LocalRedis:
+    """redis.Redis의 리스트/해시 명령 일부를 흉내내는 인메모리 클라이언트"""
+
+    def __init__(self):
+        self._lists: Dict[str, List[bytes]] = {}
+        self._hashes: Dict[str, Dict[bytes, bytes]] = {}
+        self._zsets: Dict[str, Dict[bytes, float]] = {}
+        self._cond = threading.Condition()
+
+    def ping(self) -> bool:
+        return True
+
+    def pipeline(self, transaction: bool = True) -> 'LocalPipeline':
+        return LocalPipeline(self)
+
+    # ============ 리스트 ============
+    def rpush(self, key: str, *values) -> int:
+        with self._cond:
+            items = self._lists.setdefault(key, [])
+            items.extend(_b(v) for v in values)
+            self._cond.notify_all()
+            return len(items)
+
+    def lpush(self, key: str, *values) -> int:
+        with self._cond:
+            items = self._lists.setdefault(key, [])
+            for v in values:
+                items.insert(0, _b(v))
+            self._cond.notify_all()
+            return len(items)
+
+    def lpop(self, key: str, count: Optional[int] = None):
+        with self._cond:
+            items = self._lists.get(key, [])
+            if count is None:
+                return items.pop(0) if items else None
+            popped, self._lists[key] = items[:count], items[count:]
+            return popped or None
+
+    def blpop(self, key: str, timeout: int = 0):
+        deadline = None if not timeout else time.monotonic() + timeout
+        with self._cond:
+            while not self._lists.get(key):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return (_b(key), self._lists[key].pop(0))
+
+    def llen(self, key: str) -> int:
+        with self._cond:
+            return len(self._lists.get(key, []))
+
+    def lrange(self, key: str, start: int, end: int) -> List[bytes]:
+        with self._cond:
+            items = self._lists.get(key, [])
+            end = len(items) if end == -1 else end + 1
+            return list(items[start:end])
+
+    def ltrim(self, key: str, start: int, end: int) -> bool:
+        with self._cond:
+            items = self._lists.get(key, [])
+            end = len(items) if end == -1 else end + 1
+            self._lists[key] = items[start:end]
+            return True
+
+    def lrem(self, key: str, count: int, value) -> int:
+        with self._cond:
+            items = self._lists.get(key, [])
+            value = _b(value)
+            # count > 0: 앞에서부터, count < 0: 뒤에서부터, 0: 전부
+            indexes = [i for i, item in enumerate(items) if item == value]
+            if count < 0:
+                indexes = indexes[::-1][:-count]
+            elif count > 0:
+                indexes = indexes[:count]
+            for i in sorted(indexes, reverse=True):
+                items.pop(i)
+            return len(indexes)
+
+    def lmove(self, source: str, destination: str, src: str = 'LEFT', dest: str = 'RIGHT') -> Optional[bytes]:
+        with self._cond:
+            items = self._lists.get(source, [])
+            if not items:
+                return None
+            value = items.pop(0) if src.upper() == 'LEFT' else items.pop()
+            target = self._lists.setdefault(destination, [])
+            if dest.upper() == 'LEFT':
+                target.insert(0, value)
+            else:
+                target.append(value)
+            self._cond.notify_all()
+            return value
+
+    def blmove(self, first_list: str, second_list: str, timeout: int, src: str = 'LEFT', dest: str = 'RIGHT'):
+        deadline = None if not timeout else time.monotonic() + timeout
+        with self._cond:
+            while not self._lists.get(first_list):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self.lmove(first_list, second_list, src, dest)
+
+    # ============ 정렬 집합 ============
+    def zadd(self, key: str, mapping: Dict, nx: bool = False, xx: bool = False) -> int:
+        with self._cond:
+            zset = self._zsets.setdefault(key, {})
+            added = sum(1 for m in mapping if _b(m) not in zset)
+            for member, score in mapping.items():
+                exists = _b(member) in zset
+                if (nx and exists) or (xx and not exists):
+                    continue
+                zset[_b(member)] = float(score)
+            return 0 if xx else added
+
+    def zrem(self, key: str, *members) -> int:
+        with self._cond:
+            zset = self._zsets.get(key, {})
+            return sum(1 for m in members if zset.pop(_b(m), None) is not None)
+
+    def zrangebyscore(self, key: str, min, max) -> List[bytes]:
+        low = float('-inf') if min == '-inf' else float(min)
+        high = float('inf') if max == '+inf' else float(max)
+        with self._cond:
+            zset = self._zsets.get(key, {})
+            return [m for m, score in sorted(zset.items(), key=lambda x: x[1]) if low <= score <= high]
+
+    def zcard(self, key: str) -> int:
+        with self._cond:
+            return len(self._zsets.get(key, {}))
+
+    # ============ 해시 ============
+    def hset(self, key: str, field=None, value=None, mapping: Optional[Dict] = None) -> int:
+        with self._cond:
+            table = self._hashes.setdefault(key, {})
+            pairs = dict(mapping or {})
+            if field is not None:
+                pairs[field] = value
+            added = sum(1 for f in pairs if _b(f) not in table)
+            for f, v in pairs.items():
+                table[_b(f)] = _b(v)
+            return added
+
+    def hget(self, key: str, field) -> Optional[bytes]:
+        with self._cond:
+            return self._hashes.get(key, {}).get(_b(field))
+
+    def hmget(self, key: str, fields) -> List[Optional[bytes]]:
+        with self._cond:
+            table = self._hashes.get(key, {})
+            return [table.get(_b(f)) for f in fields]
+
+    def hdel(self, key: str, *fields) -> int:
+        with self._cond:
+            table = self._hashes.get(key, {})
+            return sum(1 for f in fields if table.pop(_b(f), None) is not None)
+
+    def hkeys(self, key: str) -> List[bytes]:
+        with self._cond:
+            return list(self._hashes.get(key, {}))
+
+    def hlen(self, key: str) -> int:
+        with self._cond:
+            return len(self._hashes.get(key, {}))
+
+    def delete(self, *keys) -> int:
+        with self._cond:
+            removed = 0
+            for key in keys:
+                for store in (self._lists, self._hashes, self._zsets):
+                    removed += store.pop(key, None) is not None
+            return removed
+
+
+class LocalPipeline:
+    """명령을 모았다가 execute()에서 한 번에 실행 (원자성은 LocalRedis 잠금으로 보장)"""
+
+    def __init__(self, client: LocalRedis):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        def queue(*args, **kwargs):
+            self.commands.append((method, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        with self.client._cond:
+            results = [method(*args, **kwargs) for method, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.commands = []
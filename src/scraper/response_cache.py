@@ -0,0 +1,321 @@
+# -*- coding: utf-8 -*-
+"""
+응답 캐시 - UltimateScraper / GraphQLScraper 공용
+- 메모리: 항목 수/바이트 상한이 있는 LRU (OrderedDict)
+- TTL: 만료된 항목은 조회 시와 주기적 정리에서 제거
+  (ETag/Last-Modified가 있는 항목은 조건부 요청용으로 stale_ttl 동안 더 보관)
+- 디스크: 선택 (SQLite 파일), 메모리에서 밀려나도 재시작 후에도 재사용
+  값은 pickle로 저장하고 HMAC 서명으로 손상/변조 여부를 확인
+  (서명 키는 DB 밖에 둠: secret 인자 → RESPONSE_CACHE_SECRET 환경 변수 → DB 옆 .key 파일)
+- 적중/실패/재검증/제거 수 메트릭
+"""
+import hashlib
+import hmac
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key           TEXT PRIMARY KEY,
+    value         BLOB NOT NULL,
+    content_hash  TEXT NOT NULL,
+    stored_at     REAL NOT NULL,
+    expires_at    REAL NOT NULL,
+    etag          TEXT,
+    last_modified TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache (expires_at);
+"""
+SECRET_ENV = 'RESPONSE_CACHE_SECRET'
+
+@dataclass
+class CacheEntry:
+    """캐시 항목"""
+    value: Any
+    stored_at: float
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    size: int = 0
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def revalidatable(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """조건부 요청 헤더 (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+def validators(headers: Optional[Dict[str, str]]) -> Dict[str, Optional[str]]:
+    """응답 헤더에서 ETag / Last-Modified 추출 (대소문자 무시)"""
+    lowered = {k.lower(): v for k, v in (headers or {}).items()}
+    return {'etag': lowered.get('etag'), 'last_modified': lowered.get('last-modified')}
+
+class ResponseCache:
+    """크기 제한 LRU + TTL + 디스크 계층 캐시 (스레드 안전)"""
+
+    def __init__(self, max_entries: int = 1000, max_bytes: Optional[int] = None, ttl: float = 3600,
+                 stale_ttl: Optional[float] = None, disk_path: Optional[str] = None,
+                 purge_interval: int = 100, secret: Optional[bytes] = None):
+        """
+        Args:
+            max_entries: 메모리에 둘 최대 항목 수
+            max_bytes: 메모리에 둘 값의 직렬화 크기 합계 상한 (None이면 항목 수만)
+            ttl: 기본 유효 시간 (초)
+            stale_ttl: 만료 후에도 조건부 요청용으로 보관할 시간 (기본: ttl)
+            disk_path: SQLite 파일 경로 (None이면 메모리만)
+            purge_interval: 이 횟수만큼 저장할 때마다 만료 항목 정리
+            secret: 디스크 값 서명 키 (기본: RESPONSE_CACHE_SECRET 환경 변수, 없으면 DB 옆 .key 파일)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = ttl if stale_ttl is None else stale_ttl
+        self.purge_interval = purge_interval
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._writes = 0
+        self._lock = threading.RLock()
+
+        self.disk_path = Path(disk_path) if disk_path else None
+        self._conn = None
+        self._secret = None
+        if self.disk_path:
+            self.disk_path.parent.mkdir(parents=True, exist_ok=True)
+            self._secret = secret or self._load_secret()
+            self._conn = sqlite3.connect(str(self.disk_path), check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'stale': 0,
+            'revalidated': 0,
+            'disk_hits': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'corrupted': 0
+        }
+        self.purge_expired()
+
+    # ============ 조회 ============
+    def get(self, key: str, count_miss: bool = True) -> Optional[Any]:
+        """유효한 값 조회 (없거나 만료됐으면 None)
+
+        count_miss=False면 적중만 집계 - 못 찾으면 뒤이어 get_entry로 다시 조회하는 사전 확인용
+        """
+        entry = self.get_entry(key, count_miss=count_miss)
+        return entry.value if entry and entry.fresh else None
+
+    def get_entry(self, key: str, count_miss: bool = True) -> Optional[CacheEntry]:
+        """항목 조회 - 만료됐지만 조건부 요청이 가능한 항목도 반환 (entry.fresh로 구분)"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                entry = self._load(key)
+                if entry is not None:
+                    self.stats['disk_hits'] += 1
+                    self._remember(key, entry)
+            if entry is not None:
+                if self._expired(entry):
+                    self._drop(key)
+                    self.stats['expirations'] += 1
+                    entry = None
+                else:
+                    self._memory.move_to_end(key)
+
+            if entry is not None and entry.fresh:
+                self.stats['hits'] += 1
+            elif count_miss:
+                self.stats['misses' if entry is None else 'stale'] += 1
+            return entry
+
+    def _expired(self, entry: CacheEntry) -> bool:
+        # 검증자가 없으면 TTL이 끝나는 순간 쓸모없음, 있으면 stale_ttl 동안 재검증용으로 보관
+        now = time.time()
+        if now < entry.expires_at:
+            return False
+        return not entry.revalidatable or now >= entry.expires_at + self.stale_ttl
+
+    # ============ 저장 ============
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """값 저장"""
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) if (self._conn or self.max_bytes) else None
+        entry = CacheEntry(
+            value=value,
+            stored_at=now,
+            expires_at=now + (self.ttl if ttl is None else ttl),
+            etag=etag,
+            last_modified=last_modified,
+            size=len(blob) if blob else 0
+        )
+
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, content_hash, stored_at, expires_at, etag, last_modified) "
+                    "VALUES (?,?,?,?,?,?,?)",
+                    (key, blob, self._sign(blob), entry.stored_at, entry.expires_at, etag, last_modified)
+                )
+                self._conn.commit()
+            self.stats['sets'] += 1
+            self._writes += 1
+            if self._writes % self.purge_interval == 0:
+                self.purge_expired()
+
+    def refresh(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """304 Not Modified 응답 후 유효 시간 연장, 기존 값 반환"""
+        with self._lock:
+            entry = self._memory.get(key) or (self._load(key) if self._conn is not None else None)
+            if entry is None:
+                return None
+            entry.expires_at = time.time() + (self.ttl if ttl is None else ttl)
+            self._remember(key, entry)
+            if self._conn is not None:
+                self._conn.execute("UPDATE cache SET expires_at=? WHERE key=?", (entry.expires_at, key))
+                self._conn.commit()
+            self.stats['revalidated'] += 1
+            return entry.value
+
+    def _remember(self, key: str, entry: CacheEntry):
+        """메모리 계층에 넣고 상한을 넘으면 오래 안 쓴 것부터 제거 (디스크에는 남음)"""
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._memory[key] = entry
+        self._bytes += entry.size
+
+        while len(self._memory) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes and len(self._memory) > 1):
+            _, evicted = self._memory.popitem(last=False)
+            self._bytes -= evicted.size
+            self.stats['evictions'] += 1
+
+    # ============ 디스크 ============
+    def _load_secret(self) -> bytes:
+        """서명 키 - 환경 변수가 없으면 DB 옆 파일 (없으면 생성, 소유자만 읽기)"""
+        env = os.environ.get(SECRET_ENV)
+        if env:
+            return env.encode()
+        key_path = self.disk_path.with_name(self.disk_path.name + '.key')
+        try:
+            return key_path.read_bytes()
+        except FileNotFoundError:
+            pass
+        secret = os.urandom(32)
+        try:
+            fd = os.open(str(key_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:  # 다른 프로세스가 먼저 만듦
+            return key_path.read_bytes()
+        with os.fdopen(fd, 'wb') as f:
+            f.write(secret)
+        return secret
+
+    def _sign(self, blob: bytes) -> str:
+        return hmac.new(self._secret, blob, hashlib.sha256).hexdigest()
+
+    def _load(self, key: str) -> Optional[CacheEntry]:
+        row = self._conn.execute(
+            "SELECT value, content_hash, stored_at, expires_at, etag, last_modified FROM cache WHERE key=?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+
+        # 서명이 맞지 않는 값은 역직렬화하지 않음 (pickle은 임의 코드 실행이 가능)
+        blob, content_hash = row[0], row[1]
+        if not hmac.compare_digest(self._sign(blob), content_hash):
+            self.stats['corrupted'] += 1
+            self._conn.execute("DELETE FROM cache WHERE key=?", (key,))
+            self._conn.commit()
+            return None
+        try:
+            value = pickle.loads(blob)
+        except Exception:
+            self.stats['corrupted'] += 1
+            return None
+        return CacheEntry(value, row[2], row[3], row[4], row[5], len(blob))
+
+    # ============ 삭제 / 정리 ============
+    def _drop(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM cache WHERE key=?", (key,))
+            self._conn.commit()
+
+    def delete(self, key: str):
+        """항목 삭제"""
+        with self._lock:
+            self._drop(key)
+
+    def purge_expired(self) -> int:
+        """만료 항목 정리 (메모리 + 디스크)"""
+        with self._lock:
+            expired = [key for key, entry in self._memory.items() if self._expired(entry)]
+            for key in expired:
+                entry = self._memory.pop(key)
+                self._bytes -= entry.size
+            removed = len(expired)
+
+            if self._conn is not None:
+                now = time.time()
+                cur = self._conn.execute(
+                    "DELETE FROM cache WHERE (expires_at <= ? AND etag IS NULL AND last_modified IS NULL) "
+                    "OR expires_at + ? <= ?",
+                    (now, self.stale_ttl, now)
+                )
+                self._conn.commit()
+                removed = max(removed, cur.rowcount)
+
+            self.stats['expirations'] += removed
+            return removed
+
+    def clear(self):
+        """전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+            self._bytes = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM cache")
+                self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 메트릭"""
+        with self._lock:
+            stats = dict(self.stats)
+            lookups = stats['hits'] + stats['misses'] + stats['stale']
+            stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / lookups * 100 if lookups else 0.0
+            stats['entries'] = len(self._memory)
+            stats['bytes'] = self._bytes
+            if self._conn is not None:
+                stats['disk_entries'] = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return stats
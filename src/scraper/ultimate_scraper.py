@@ -4,8 +4,8 @@
 모든 학습된 기술을 통합한 프로덕션 레벨 스크래퍼
 """
 import asyncio
-import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import json
 import time
@@ -16,6 +16,8 @@ from typing import Dict, List, Any, Optional, Union, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from pathlib import Path
 from urllib.parse import urljoin, urlparse, parse_qs
 import re
 import logging
@@ -29,12 +31,26 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import cloudscraper
 
+try:
+    import httpx
+except ImportError:  # 비동기 엔진(scrape_async)은 httpx가 있을 때만
+    httpx = None
+
+try:
+    import h2  # httpx의 HTTP/2 지원 (httpx[http2])
+except ImportError:
+    h2 = None
+
+from response_cache import ResponseCache, validators
+import fast_extractor
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
+logging.getLogger('httpx').setLevel(logging.WARNING)  # 요청마다 INFO 로그를 남기지 않도록
 
 class ScrapingStrategy(Enum):
     """스크래핑 전략"""
@@ -64,8 +80,16 @@ class ScrapingConfig:
     use_proxy: bool = False
     use_cache: bool = True
     cache_ttl: int = 3600
+    cache_max_entries: int = 1000
+    cache_max_bytes: Optional[int] = None
+    cache_path: Optional[str] = None  # 디스크 캐시 (SQLite), None이면 메모리만
     headers: Dict = field(default_factory=dict)
     cookies: Dict = field(default_factory=dict)
+    pool_size: int = 10  # 세션당 호스트별 유지 커넥션 수
+    http2: bool = True  # 비동기 엔진에서 HTTP/2 사용 (h2 설치 + 서버 지원 시)
+    async_pool_size: int = 128  # 비동기 엔진 최대 커넥션 수 (공유 httpx 클라이언트 하나)
+    stream_threshold: int = 5 * 1024 * 1024  # 이보다 큰 응답 본문은 디스크로 스트리밍
+    download_dir: str = 'downloads/scraper'
     
 @dataclass
 class ScrapingResult:
@@ -83,8 +107,23 @@ class UltimateScraper:
     
     def __init__(self, config: ScrapingConfig = None):
         self.config = config or ScrapingConfig()
+        self.user_agents = self._load_user_agents()
+        
+        # 스레드별 세션 (쿠키 저장소는 공유 → 로그인 상태 유지)
+        self._local = threading.local()
+        self._session_pool: Queue = Queue()  # scrape_parallel 워커가 빌려 쓰는 세션 (호출 간 재사용)
+        self._async_client = None  # scrape_async용 공유 httpx 클라이언트 (같은 이벤트 루프 안에서 재사용)
+        self._async_loop = None
+        self._cookie_jar = None
         self.session = self._create_session()
-        self.cache = {}
+        self._cookie_jar = self.session.cookies
+        
+        self.cache = ResponseCache(
+            max_entries=self.config.cache_max_entries,
+            max_bytes=self.config.cache_max_bytes,
+            ttl=self.config.cache_ttl,
+            disk_path=self.config.cache_path
+        )
         self.metrics = {
             'total_requests': 0,
             'successful_requests': 0,
@@ -92,6 +131,7 @@ class UltimateScraper:
             'total_data_size': 0,
             'start_time': datetime.now()
         }
+        self._metrics_lock = threading.Lock()
         
         # 전략별 핸들러
         self.strategy_handlers = {
@@ -104,15 +144,50 @@ class UltimateScraper:
         }
         
         # Anti-bot 우회 컴포넌트
-        self.user_agents = self._load_user_agents()
         self.proxies = []
         self.rate_limiter = RateLimiter(self.config.rate_limit)
         
+    @property
+    def session(self) -> requests.Session:
+        """현재 스레드의 세션 (scrape_parallel 워커마다 따로 생성)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._create_session()
+        return session
+    
+    @session.setter
+    def session(self, session: requests.Session):
+        self._local.session = session
+    
+    def _with_pooled_session(self, func: Callable, *args, **kwargs):
+        """풀에서 세션을 빌려 현재 스레드 세션으로 두고 실행 (없으면 새로 생성)"""
+        try:
+            session = self._session_pool.get_nowait()
+        except Empty:
+            session = self._create_session()
+        self._local.session = session
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self._session_pool.put(session)
+    
+    def _count(self, key: str, n: int = 1):
+        """메트릭 증가 (스레드 안전)"""
+        with self._metrics_lock:
+            self.metrics[key] += n
+    
     def _create_session(self) -> requests.Session:
         """강화된 세션 생성"""
         # Cloudscraper 사용 (Cloudflare 우회)
         session = cloudscraper.create_scraper()
         
+        # 커넥션 풀 (keep-alive 재사용)
+        adapter = HTTPAdapter(pool_connections=self.config.pool_size, pool_maxsize=self.config.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if self._cookie_jar is not None:
+            session.cookies = self._cookie_jar
+        
         # 기본 헤더
         session.headers.update({
             'User-Agent': self._get_random_user_agent(),
@@ -150,35 +225,48 @@ class UltimateScraper:
     
     def scrape(self, url: str, **kwargs) -> ScrapingResult:
         """메인 스크래핑 메서드"""
+        return self._scrape(url, True, **kwargs)
+    
+    def _scrape(self, url: str, rate_limit: bool, **kwargs) -> ScrapingResult:
+        """스크래핑 실행 (rate_limit=False: 호출자가 이미 요청 시각을 예약함)"""
         start_time = time.time()
-        self.metrics['total_requests'] += 1
+        self._count('total_requests')
         
-        # 캐시 확인
+        # 캐시 확인 (만료됐어도 ETag/Last-Modified가 있으면 조건부 요청으로 재검증)
         cache_key = self._get_cache_key(url, kwargs)
-        if self.config.use_cache and cache_key in self.cache:
-            cached_result, cached_time = self.cache[cache_key]
-            if time.time() - cached_time < self.config.cache_ttl:
-                logger.info(f"Cache hit for {url}")
-                return cached_result
+        entry = self.cache.get_entry(cache_key) if self.config.use_cache else None
+        if entry and entry.fresh:
+            logger.info(f"Cache hit for {url}")
+            return entry.value
         
-        # Rate limiting
-        self.rate_limiter.wait()
+        # Rate limiting (도메인별 요청 시각 예약)
+        if rate_limit:
+            self.rate_limiter.wait(urlparse(url).netloc)
         
         # 전략 선택
         strategy = kwargs.get('strategy', self.config.strategy)
         handler = self.strategy_handlers.get(strategy, self._scrape_simple)
         
+        handler_kwargs = dict(kwargs)
+        if entry and strategy in (ScrapingStrategy.SIMPLE, ScrapingStrategy.SESSION):
+            handler_kwargs['conditional'] = entry.conditional_headers()
+        
         try:
-            result = handler(url, **kwargs)
-            self.metrics['successful_requests'] += 1
+            result = handler(url, **handler_kwargs)
+            self._count('successful_requests')
+            
+            if result.status_code == 304 and entry:
+                # 변경 없음 → 캐시된 결과 재사용
+                logger.info(f"Not modified: {url}")
+                return self.cache.refresh(cache_key) or entry.value
             
-            # 캐시 저장
-            if self.config.use_cache:
-                self.cache[cache_key] = (result, time.time())
+            # 캐시 저장 (성공 응답만)
+            if self.config.use_cache and not result.error and 0 < result.status_code < 400:
+                self.cache.set(cache_key, result, **validators(result.metadata.get('headers')))
             
         except Exception as e:
             logger.error(f"Scraping failed for {url}: {e}")
-            self.metrics['failed_requests'] += 1
+            self._count('failed_requests')
             result = ScrapingResult(
                 url=url,
                 status_code=0,
@@ -345,8 +433,11 @@ class UltimateScraper:
             error="All strategies failed"
         )
     
-    def _make_request(self, url: str, **kwargs) -> requests.Response:
-        """재시도 로직이 포함된 요청"""
+    def _make_request(self, url: str, conditional: Optional[Dict] = None, **kwargs) -> requests.Response:
+        """재시도 로직이 포함된 요청 (conditional: 캐시 재검증용 If-None-Match/If-Modified-Since)"""
+        if conditional:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), **conditional}
+        
         for attempt in range(self.config.max_retries):
             try:
                 # User-Agent 로테이션
@@ -365,11 +456,12 @@ class UltimateScraper:
                     **kwargs
                 )
                 
-                if response.status_code == 200:
+                if response.status_code == 200 or (conditional and response.status_code == 304):
                     return response
                 elif response.status_code == 429:  # Rate limit
-                    wait_time = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limited. Waiting {wait_time}s")
+                    wait_time = self._retry_after(response.headers.get('Retry-After'))
+                    response.close()  # 기다리는 동안 커넥션을 붙잡지 않도록
+                    logger.warning(f"Rate limited. Waiting {wait_time:.1f}s")
                     time.sleep(wait_time)
                 else:
                     logger.warning(f"HTTP {response.status_code} for {url}")
@@ -412,40 +504,217 @@ class UltimateScraper:
         
         return driver
     
-    async def scrape_async(self, urls: List[str], max_concurrent: int = 10) -> List[ScrapingResult]:
-        """비동기 배치 스크래핑"""
-        async with aiohttp.ClientSession() as session:
-            semaphore = asyncio.Semaphore(max_concurrent)
+    @staticmethod
+    def _retry_after(value: Optional[str], default: float = 60.0) -> float:
+        """Retry-After (초 또는 HTTP 날짜) → 초"""
+        if not value:
+            return default
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            when = parsedate_to_datetime(value)
+            return max(0.0, (when - datetime.now(tz=when.tzinfo)).total_seconds())
+        except (TypeError, ValueError):
+            return default
+    
+    # ============ 비동기 엔진 (httpx) ============
+    async def _get_async_client(self) -> 'httpx.AsyncClient':
+        """공유 httpx 클라이언트 - 같은 이벤트 루프 안에서는 호출 간 재사용
+        
+        클라이언트 하나를 같이 써야 같은 호스트로 가는 요청이 keep-alive 커넥션(HTTP/2면 다중화)을 재사용한다.
+        이벤트 루프가 바뀌면 이전 클라이언트를 닫고 새로 만든다.
+        """
+        if httpx is None:
+            raise RuntimeError("비동기 엔진에는 httpx가 필요합니다 (pip install httpx[http2])")
+        
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_loop is not loop:
+            await self.aclose()
+        
+        if self._async_client is None:
+            # 세션 기본 헤더/설정 헤더를 그대로 쓰되 압축 방식은 httpx가 지원하는 것으로
+            headers = {k: v for k, v in self.session.headers.items() if k.lower() != 'accept-encoding'}
+            self._async_client = httpx.AsyncClient(
+                http2=self.config.http2 and h2 is not None,
+                headers=headers,
+                cookies=self._cookie_jar,
+                timeout=self.config.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.config.async_pool_size,
+                    max_keepalive_connections=self.config.async_pool_size  # 기본값(20)이면 나머지 커넥션은 응답마다 다시 연결
+                ),
+                follow_redirects=True
+            )
+            self._async_loop = loop
+        
+        return self._async_client
+    
+    async def aclose(self):
+        """비동기 클라이언트 종료"""
+        client, self._async_client = self._async_client, None
+        self._async_loop = None
+        if client is None or client.is_closed:
+            return
+        try:
+            await client.aclose()
+        except Exception as e:
+            # 이미 닫힌 이전 이벤트 루프의 커넥션은 정리 중에 오류가 날 수 있음
+            logger.debug(f"Async client close failed: {e}")
+    
+    async def fetch_async(self, url: str, **kwargs) -> ScrapingResult:
+        """비동기 단일 스크래핑 - scrape()와 같은 캐시/rate limit/메트릭을 사용"""
+        start_time = time.time()
+        self._count('total_requests')
+        
+        cache_key = self._get_cache_key(url, kwargs)
+        entry = self.cache.get_entry(cache_key) if self.config.use_cache else None
+        if entry and entry.fresh:
+            return entry.value
+        
+        # Rate limiting (예약한 시각까지 이벤트 루프에 양보)
+        delay = self.rate_limiter.reserve(urlparse(url).netloc) - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        
+        headers = dict(kwargs.get('headers') or {})
+        headers['User-Agent'] = self._get_random_user_agent()
+        if entry:
+            headers.update(entry.conditional_headers())
+        
+        try:
+            result = await self._request_async(url, headers, conditional=entry is not None)
+            self._count('successful_requests')
             
-            async def fetch(url):
-                async with semaphore:
-                    try:
-                        async with session.get(url) as response:
-                            data = await response.text()
-                            return ScrapingResult(
-                                url=url,
-                                status_code=response.status,
-                                data=data,
-                                metadata={'headers': dict(response.headers)}
-                            )
-                    except Exception as e:
-                        return ScrapingResult(
-                            url=url,
-                            status_code=0,
-                            data=None,
-                            metadata={},
-                            error=str(e)
-                        )
+            if result.status_code == 304 and entry:
+                return self.cache.refresh(cache_key) or entry.value
             
-            tasks = [fetch(url) for url in urls]
-            return await asyncio.gather(*tasks)
+            # 파일로 스트리밍한 응답은 본문이 메모리에 없으므로 캐시하지 않음
+            if (self.config.use_cache and not result.error and 0 < result.status_code < 400
+                    and not result.metadata.get('streamed')):
+                self.cache.set(cache_key, result, **validators(result.metadata.get('headers')))
+        except Exception as e:
+            logger.error(f"Scraping failed for {url}: {e}")
+            self._count('failed_requests')
+            result = ScrapingResult(
+                url=url,
+                status_code=0,
+                data=None,
+                metadata={},
+                error=str(e)
+            )
+        
+        result.duration = time.time() - start_time
+        return result
+    
+    async def _request_async(self, url: str, headers: Dict, conditional: bool = False) -> ScrapingResult:
+        """재시도 로직이 포함된 비동기 요청 (_make_request와 같은 규칙)"""
+        client = await self._get_async_client()
+        
+        for attempt in range(self.config.max_retries):
+            try:
+                wait_time = None
+                async with client.stream('GET', url, headers=headers) as response:
+                    if response.status_code == 200 or (conditional and response.status_code == 304):
+                        return await self._read_async(url, response)
+                    elif response.status_code == 429:  # Rate limit
+                        wait_time = self._retry_after(response.headers.get('Retry-After'))
+                    else:
+                        logger.warning(f"HTTP {response.status_code} for {url}")
+                
+                # 응답(커넥션)을 닫은 뒤에 대기
+                if wait_time is not None:
+                    logger.warning(f"Rate limited. Waiting {wait_time:.1f}s")
+                    await asyncio.sleep(wait_time)
+                        
+            except httpx.HTTPError as e:
+                logger.error(f"Request failed (attempt {attempt + 1}): {e}")
+                
+            if attempt < self.config.max_retries - 1:
+                await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+        
+        raise Exception(f"Failed after {self.config.max_retries} retries")
+    
+    async def _read_async(self, url: str, response: 'httpx.Response') -> ScrapingResult:
+        """응답 본문 읽기 - stream_threshold를 넘으면 메모리에 모으지 않고 파일로 흘려 씀
+        
+        스트리밍한 경우 data는 None이고 파일 경로는 metadata['path']에 있다.
+        """
+        metadata = {
+            'headers': dict(response.headers),
+            'encoding': response.encoding,
+            'http_version': response.http_version
+        }
+        
+        buffer = bytearray()
+        path, out, size = None, None, 0
+        try:
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if out is None and size > self.config.stream_threshold:
+                    path = Path(self.config.download_dir) / hashlib.md5(url.encode()).hexdigest()
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    out = open(path, 'wb')
+                    out.write(buffer)
+                    buffer = bytearray()
+                if out is not None:
+                    out.write(chunk)
+                else:
+                    buffer.extend(chunk)
+        finally:
+            if out is not None:
+                out.close()
+        
+        if path is not None:
+            metadata.update({'path': str(path), 'size': size, 'streamed': True})
+            data = None
+        else:
+            data = bytes(buffer).decode(metadata['encoding'] or 'utf-8', errors='replace')
+        
+        return ScrapingResult(
+            url=url,
+            status_code=response.status_code,
+            data=data,
+            metadata=metadata
+        )
+    
+    async def scrape_async(self, urls: List[str], max_concurrent: int = 10) -> List[ScrapingResult]:
+        """비동기 배치 스크래핑 (입력 순서대로 결과 반환)"""
+        semaphore = asyncio.Semaphore(max_concurrent)
+        
+        async def fetch(url):
+            async with semaphore:
+                return await self.fetch_async(url)
+        
+        return await asyncio.gather(*[fetch(url) for url in urls])
     
     def scrape_parallel(self, urls: List[str], max_workers: int = 10) -> List[ScrapingResult]:
-        """병렬 스크래핑"""
+        """병렬 스크래핑
+        
+        요청 시각은 디스패처가 RateLimiter에서 미리 예약하고 시각이 된 작업만 제출하므로
+        워커 스레드는 rate limit 때문에 잠들지 않는다. 워커는 세션 풀에서 세션(커넥션 풀 포함)을
+        빌려 쓰므로 동시에 같은 세션을 쓰지 않고, 다음 호출에서도 연결을 재사용한다.
+        """
         results = []
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_url = {executor.submit(self.scrape, url): url for url in urls}
+            future_to_url = {}
+            schedule = []
+            for url in urls:
+                # 못 찾으면 _scrape에서 다시 조회하므로 여기서는 miss로 세지 않음
+                cached = self.cache.get(self._get_cache_key(url, {}), count_miss=False) if self.config.use_cache else None
+                if cached is not None:
+                    # 캐시 적중은 요청 시각 예약 불필요
+                    self._count('total_requests')
+                    results.append(cached)
+                else:
+                    schedule.append((self.rate_limiter.reserve(urlparse(url).netloc), url))
+            
+            for due, url in sorted(schedule, key=lambda x: x[0]):
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                future_to_url[executor.submit(self._with_pooled_session, self._scrape, url, False)] = url
             
             for future in as_completed(future_to_url):
                 url = future_to_url[future]
@@ -465,7 +734,24 @@ class UltimateScraper:
         return results
     
     def extract_data(self, html: str, selectors: Dict[str, str]) -> Dict[str, Any]:
-        """데이터 추출 헬퍼"""
+        """데이터 추출 헬퍼 - CSS / XPath('//...') 셀렉터
+        
+        lxml이 있으면 한 번 파싱해서 컴파일된 셀렉터 맵을 평가 (fast_extractor),
+        없으면 BeautifulSoup 경로 (XPath는 건너뜀)
+        """
+        if fast_extractor.HAS_LXML:
+            return fast_extractor.extract(html, selectors)
+        return self._extract_data_bs4(html, selectors)
+    
+    def extract_batch(self, pages: List[str], selectors: Dict[str, str],
+                      processes: Optional[int] = None) -> List[Dict[str, Any]]:
+        """여러 문서에서 같은 셀렉터 맵 추출 - lxml이 있으면 프로세스 풀 사용 (입력 순서대로 반환)"""
+        if fast_extractor.HAS_LXML:
+            return fast_extractor.extract_many(pages, selectors, processes=processes)
+        return [self._extract_data_bs4(html, selectors) for html in pages]
+    
+    def _extract_data_bs4(self, html: str, selectors: Dict[str, str]) -> Dict[str, Any]:
+        """BeautifulSoup 추출 경로 (lxml이 없을 때)"""
         soup = BeautifulSoup(html, 'html.parser')
         extracted = {}
         
@@ -487,41 +773,47 @@ class UltimateScraper:
     def get_metrics(self) -> Dict:
         """성능 메트릭 반환"""
         runtime = (datetime.now() - self.metrics['start_time']).total_seconds()
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
         
         return {
-            'total_requests': self.metrics['total_requests'],
-            'successful_requests': self.metrics['successful_requests'],
-            'failed_requests': self.metrics['failed_requests'],
-            'success_rate': (self.metrics['successful_requests'] / 
-                           max(self.metrics['total_requests'], 1)) * 100,
+            'total_requests': metrics['total_requests'],
+            'successful_requests': metrics['successful_requests'],
+            'failed_requests': metrics['failed_requests'],
+            'success_rate': (metrics['successful_requests'] / 
+                           max(metrics['total_requests'], 1)) * 100,
             'runtime_seconds': runtime,
-            'requests_per_second': self.metrics['total_requests'] / max(runtime, 1)
+            'requests_per_second': metrics['total_requests'] / max(runtime, 1),
+            'cache': self.cache.get_stats()
         }
 
 class RateLimiter:
-    """지능형 Rate Limiter"""
+    """지능형 Rate Limiter - 도메인별 요청 시각을 예약 (스레드 안전)
+    
+    reserve()는 잠들지 않고 다음 요청 가능 시각만 돌려주므로, 디스패처가 그 시각에 작업을
+    제출하거나(scrape_parallel) wait()로 해당 시각까지만 대기할 수 있다.
+    """
     
     def __init__(self, min_delay: float = 0.5):
         self.min_delay = min_delay
-        self.last_request_time = {}
+        self.next_slot = {}
         self.domain_delays = {}
+        self._lock = threading.Lock()
+    
+    def reserve(self, domain: str = None) -> float:
+        """요청 시각 예약 - time.monotonic() 기준 실행 가능 시각 반환"""
+        delay = self.domain_delays.get(domain, self.min_delay)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(domain, now))
+            self.next_slot[domain] = slot + delay
+        return slot
     
     def wait(self, domain: str = None):
-        """요청 전 대기"""
-        if domain is None:
-            time.sleep(self.min_delay)
-            return
-        
-        current_time = time.time()
-        
-        if domain in self.last_request_time:
-            elapsed = current_time - self.last_request_time[domain]
-            delay = self.domain_delays.get(domain, self.min_delay)
-            
-            if elapsed < delay:
-                time.sleep(delay - elapsed)
-        
-        self.last_request_time[domain] = time.time()
+        """요청 전 대기 - 예약한 시각까지만"""
+        remaining = self.reserve(domain) - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
     
     def set_domain_delay(self, domain: str, delay: float):
         """도메인별 딜레이 설정"""
@@ -532,17 +824,26 @@ class DataProcessor:
     
     @staticmethod
     def parse_products(html: str) -> List[Dict]:
-        """제품 정보 파싱"""
+        """제품 정보 파싱 (lxml이 있으면 fast_extractor 경로)"""
+        if fast_extractor.HAS_LXML:
+            return fast_extractor.parse_products(html)
+        return DataProcessor._parse_products_bs4(html)
+    
+    @staticmethod
+    def parse_products_batch(pages: List[str], processes: Optional[int] = None) -> List[List[Dict]]:
+        """여러 문서의 제품 정보 파싱 - lxml이 있으면 프로세스 풀 사용"""
+        if fast_extractor.HAS_LXML:
+            return fast_extractor.parse_products_many(pages, processes=processes)
+        return [DataProcessor._parse_products_bs4(html) for html in pages]
+    
+    @staticmethod
+    def _parse_products_bs4(html: str) -> List[Dict]:
+        """BeautifulSoup 파싱 경로 (lxml이 없을 때)"""
         soup = BeautifulSoup(html, 'html.parser')
         products = []
         
-        # 다양한 제품 셀렉터 시도
-        selectors = [
-            'div.product',
-            'article.product-card',
-            'li.product-item',
-            'div[data-testid="product"]'
-        ]
+        # 다양한 제품 셀렉터 시도 (fast_extractor와 같은 순서)
+        selectors = fast_extractor.PRODUCT_CONTAINERS
         
         for selector in selectors:
             items = soup.select(selector)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+메일 목록 추출 벤치마크 - 일괄(evaluate 1회) vs 요소별 추출
+저장된 받은메일함 픽스처(fixtures/inbox.html, 50건)로 두 경로의 속도와 결과를 비교
+프로젝트 루트에서 실행: python tests/bizmeka/test_mail_extraction_benchmark.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from playwright.async_api import async_playwright
+from sites.bizmeka.scrapers.mail import BizmekaMailScraper
+
+FIXTURE = Path(__file__).parent / "fixtures" / "inbox.html"
+ROUNDS = 20
+
+
+def _strip_timestamp(mails):
+    """수집시간은 호출 시점마다 다르므로 비교에서 제외"""
+    return [{k: v for k, v in mail.items() if k != '수집시간'} for mail in mails]
+
+
+async def _measure(label, extract):
+    """ROUNDS회 반복 실행 후 평균 시간 측정"""
+    result = await extract()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await extract()
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    print(f"  {label:<10} {elapsed * 1000:8.1f} ms/page  ({len(result)}건)")
+    return result, elapsed
+
+
+async def test_mail_extraction_benchmark():
+    """일괄 추출과 요소별 추출 결과가 같고 일괄 추출이 더 빠른지 확인"""
+    print(f"\n{'='*60}")
+    print("  메일 목록 추출 벤치마크")
+    print(f"{'='*60}")
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context()
+        page = await context.new_page()
+        await page.set_content(FIXTURE.read_text(encoding='utf-8'))
+
+        scraper = BizmekaMailScraper()
+        await scraper.setup_browser(context, page)
+
+        bulk, bulk_time = await _measure(
+            "일괄", lambda: scraper._extract_mails_from_page(1)
+        )
+        per_element, element_time = await _measure(
+            "요소별", lambda: scraper._extract_mails_per_element(1)
+        )
+
+        await browser.close()
+
+    print(f"  속도 향상: {element_time / bulk_time:.1f}배")
+
+    assert len(bulk) == 50
+    assert _strip_timestamp(bulk) == _strip_timestamp(per_element)
+    assert bulk_time < element_time
+
+
+if __name__ == "__main__":
+    asyncio.run(test_mail_extraction_benchmark())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+UltimateScraper 비동기 엔진(httpx) 벤치마크 - 스레드 경로(scrape_parallel) 대비 처리량
+같은 로컬 테스트 서버(응답마다 100ms 지연 - 원격 사이트 수준)에 같은 요청 수를 보내 req/s 비교
+(배율은 실행 환경 부하에 따라 달라지므로 출력만 하고, 결과/메트릭 정확성만 검사)
+큰 응답 본문이 메모리에 쌓이지 않고 파일로 스트리밍되는지도 확인
+프로젝트 루트에서 실행: python tests/scraping/test_async_engine_benchmark.py
+"""
+
+import asyncio
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src" / "scraper"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from test_parallel_scaling_benchmark import _SlowHandler, _start_server
+from ultimate_scraper import ScrapingConfig, UltimateScraper
+
+REQUESTS = 512
+THREAD_WORKERS = 16
+ASYNC_CONCURRENCY = 128
+BIG_BODY = 3 * 1024 * 1024
+LATENCY = 0.1
+ROUNDS = 3  # 1코어 환경의 스케줄링 잡음을 줄이려고 각 경로를 여러 번 돌려 최솟값 사용
+
+
+class _BigHandler(_SlowHandler):
+    """/big 은 큰 본문 (스트리밍 확인용), 나머지는 기본 응답"""
+    latency = LATENCY
+
+    def do_GET(self):  # noqa: N802
+        if self.path != "/big":
+            return super().do_GET()
+        body = b"x" * BIG_BODY
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _serve(port_queue):
+    """별도 프로세스에서 서버 실행 (클라이언트와 GIL을 나눠 쓰지 않도록)"""
+    server = _start_server(_BigHandler)
+    port_queue.put(server.server_address[1])
+    while True:
+        time.sleep(3600)
+
+
+def _scraper(**overrides):
+    config = ScrapingConfig(use_cache=False, rate_limit=0.0, pool_size=THREAD_WORKERS, **overrides)
+    return UltimateScraper(config)
+
+
+def _check(scraper, results, count):
+    assert len(results) == count
+    assert all(r.status_code == 200 and not r.error for r in results)
+    assert scraper.get_metrics()['total_requests'] == count
+
+
+def _run_threaded(scraper, urls):
+    scraper.scrape_parallel(urls[:THREAD_WORKERS * 2], max_workers=THREAD_WORKERS)  # 워밍업 (세션 풀)
+    timings = []
+    for _ in range(ROUNDS):
+        scraper.metrics['total_requests'] = 0
+        start = time.perf_counter()
+        results = scraper.scrape_parallel(urls, max_workers=THREAD_WORKERS)
+        timings.append(time.perf_counter() - start)
+        _check(scraper, results, len(urls))
+    return min(timings)
+
+
+async def _run_async(scraper, urls):
+    await scraper.scrape_async(urls[:ASYNC_CONCURRENCY], max_concurrent=ASYNC_CONCURRENCY)  # 워밍업 (커넥션 풀)
+    timings = []
+    for _ in range(ROUNDS):
+        scraper.metrics['total_requests'] = 0
+        start = time.perf_counter()
+        results = await scraper.scrape_async(urls, max_concurrent=ASYNC_CONCURRENCY)
+        timings.append(time.perf_counter() - start)
+        _check(scraper, results, len(urls))
+    return min(timings)
+
+
+def test_async_engine_benchmark():
+    """두 경로의 처리량을 출력하고, 결과가 정확하며 큰 본문은 파일로 스트리밍되는지 확인"""
+    port_queue = mp.Queue()
+    server = mp.Process(target=_serve, args=(port_queue,), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{port_queue.get(timeout=30)}"
+    urls = [f"{base_url}/item/{i}" for i in range(REQUESTS)]
+
+    print(f"\n{'='*60}")
+    print(f"  비동기 엔진 vs 스레드 ({REQUESTS}건, 응답 지연 {LATENCY * 1000:.0f}ms)")
+    print(f"{'='*60}")
+
+    try:
+        thread_time = _run_threaded(_scraper(), urls)
+
+        async_scraper = _scraper()
+
+        async def run():
+            try:
+                return await _run_async(async_scraper, urls)
+            finally:
+                await async_scraper.aclose()
+
+        async_time = asyncio.run(run())
+
+        print(f"  스레드 (워커 {THREAD_WORKERS}):    {thread_time:6.2f}s  {REQUESTS / thread_time:7.1f} req/s")
+        print(f"  비동기 (동시 {ASYNC_CONCURRENCY}):  {async_time:6.2f}s  {REQUESTS / async_time:7.1f} req/s  "
+              f"x{thread_time / async_time:.1f}")
+
+        # 큰 본문 스트리밍
+        with tempfile.TemporaryDirectory() as tmp:
+            streamer = _scraper(stream_threshold=256 * 1024, download_dir=tmp)
+
+            async def fetch_big():
+                try:
+                    return await streamer.fetch_async(f"{base_url}/big")
+                finally:
+                    await streamer.aclose()
+
+            big = asyncio.run(fetch_big())
+            assert big.metadata.get('streamed') and big.data is None
+            assert Path(big.metadata['path']).stat().st_size == BIG_BODY
+            print(f"  스트리밍: {big.metadata['size']:,} bytes → {Path(big.metadata['path']).name}")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    test_async_engine_benchmark()
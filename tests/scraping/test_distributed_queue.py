@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+TaskQueue(LocalRedis 백엔드) 신뢰성 테스트
+직렬화, ack/nack, 재시도 → dead-letter, 지연 재시도, 임대 만료 회수, 늦은 ack가 새 임대를 건드리지 않는지 확인
+프로젝트 루트에서 실행: python -m pytest tests/scraping/test_distributed_queue.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src" / "scraper"))
+
+from distributed_scraper import ScrapingTask, TaskQueue, decode_task, encode_task
+
+
+def _task(task_id="t1", **kwargs):
+    return ScrapingTask(task_id=task_id, url=f"https://example.com/{task_id}", **kwargs)
+
+
+def _queue(**kwargs):
+    kwargs.setdefault("reap_interval", 0)
+    return TaskQueue(**kwargs)
+
+
+def test_encode_decode_roundtrip():
+    task = _task(method="POST", headers={"X-Test": "1"}, data={"q": "값"}, retry_count=2, max_retries=5)
+    decoded = decode_task(encode_task(task))
+
+    assert decoded.task_id == task.task_id
+    assert decoded.url == task.url
+    assert decoded.method == "POST"
+    assert decoded.headers == {"X-Test": "1"}
+    assert decoded.data == {"q": "값"}
+    assert (decoded.retry_count, decoded.max_retries) == (2, 5)
+    assert decoded.lease is None
+
+
+@pytest.mark.parametrize("payload", [b'{"v":99,"id":"t1","u":"x"}', b'{"v":1,"u":"x"}', b"[]"])
+def test_decode_rejects_invalid_payload(payload):
+    with pytest.raises(ValueError):
+        decode_task(payload)
+
+
+def test_invalid_payload_goes_to_dead_letter():
+    queue = _queue()
+    queue.redis_client.rpush(queue.key, b'{"v":99}')
+
+    assert queue.pop(timeout=0) is None
+    assert queue.dead_size() == 1
+    assert queue.processing_size() == 0
+
+
+def test_ack_removes_task():
+    queue = _queue()
+    queue.push(_task())
+
+    task = queue.pop(timeout=0)
+    assert task.lease
+    assert queue.processing_size() == 1
+
+    assert queue.ack(task)
+    assert queue.processing_size() == 0
+    assert queue.size() == 0
+    assert not queue.ack(task)  # 같은 임대로 두 번 ack 불가
+
+
+def test_nack_requeues_until_dead_letter():
+    queue = _queue()
+    queue.push(_task(max_retries=2))
+
+    for attempt in range(1, 3):
+        task = queue.pop(timeout=0)
+        assert queue.nack(task)
+        assert queue.size() == 1
+        assert task.retry_count == attempt
+
+    task = queue.pop(timeout=0)
+    assert task.retry_count == 2
+    assert not queue.nack(task)
+    assert queue.size() == 0
+    assert queue.processing_size() == 0
+    assert [t.task_id for t in queue.dead_letters()] == ["t1"]
+
+
+def test_nack_with_delay_waits_before_requeue():
+    queue = _queue()
+    queue.push(_task())
+
+    assert queue.nack(queue.pop(timeout=0), delay=0.2)
+    assert queue.size() == 0
+    assert queue.delayed_size() == 1
+    assert queue.pop(timeout=0) is None
+
+    time.sleep(0.25)
+    task = queue.pop(timeout=0)
+    assert task is not None
+    assert task.retry_count == 1
+    assert queue.delayed_size() == 0
+
+
+def test_expired_lease_is_requeued_and_counted_as_failure():
+    queue = _queue(visibility_timeout=0.1)
+    queue.push(_task())
+
+    stale = queue.pop(timeout=0)
+    time.sleep(0.15)
+    assert queue.requeue_expired() == 1
+    assert queue.size() == 1
+
+    fresh = queue.pop(timeout=0)
+    assert fresh.retry_count == 1
+    assert fresh.lease != stale.lease
+
+
+def test_extend_lease_prevents_requeue():
+    queue = _queue(visibility_timeout=0.1)
+    queue.push(_task())
+
+    task = queue.pop(timeout=0)
+    time.sleep(0.06)
+    queue.extend_lease([task], timeout=1.0)
+    time.sleep(0.06)
+
+    assert queue.requeue_expired() == 0
+    assert queue.ack(task)
+
+
+def test_stale_ack_does_not_release_new_lease():
+    queue = _queue(visibility_timeout=0.1)
+    queue.push(_task())
+
+    stale = queue.pop(timeout=0)
+    time.sleep(0.15)
+    queue.requeue_expired()
+    fresh = queue.pop(timeout=0)
+
+    # 임대가 만료된 뒤 늦게 끝난 원래 워커의 ack/nack/extend_lease는 새 임대에 영향이 없어야 함
+    assert not queue.ack(stale)
+    assert not queue.nack(stale)
+    queue.extend_lease([stale])
+    assert queue.processing_size() == 1
+    assert queue.size() == 0
+
+    assert queue.ack(fresh)
+    assert queue.processing_size() == 0
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+추출 엔진 마이크로 벤치마크 - lxml(fast_extractor) vs 기존 BeautifulSoup(html.parser) 경로
+상품 목록 페이지를 합성해 extract_data / parse_products 속도를 비교하고 결과가 같은지 확인
+(배율은 실행 환경 부하에 따라 달라지므로 출력만 하고 결과 일치만 검사)
+프로젝트 루트에서 실행: python tests/scraping/test_extraction_benchmark.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src" / "scraper"))
+
+import fast_extractor
+from ultimate_scraper import DataProcessor, ScrapingConfig, UltimateScraper
+
+PAGES = 40
+PRODUCTS_PER_PAGE = 60
+SELECTORS = {
+    'heading': 'h1.page-title',
+    'titles': 'div.product h2',
+    'prices': 'div.product span.price',
+    'next': 'a.next',
+    'missing': 'div.does-not-exist'
+}
+
+
+def _page(n):
+    items = "".join(
+        f"""<div class="product" data-id="{i}">
+              <a href="/p/{n}/{i}"><img src="/img/{i}.jpg" alt=""></a>
+              <h2>상품 {n}-{i} <small>신상</small></h2>
+              <span class="price">{(i + 1) * 1000:,}원</span>
+              <p class="desc">설명 <!-- 주석 --> 텍스트 {i}</p>
+              <script>track({i});</script>
+            </div>"""
+        for i in range(PRODUCTS_PER_PAGE)
+    )
+    return f"""<!DOCTYPE html><html><head><title>목록 {n}</title>
+        <meta property="og:title" content="목록 {n}"></head>
+        <body><h1 class="page-title">카테고리 {n}</h1><div class="list">{items}</div>
+        <a class="next" href="?page={n + 1}">다음</a></body></html>"""
+
+
+def _best(func, pages, rounds=3):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = [func(html) for html in pages]
+        timings.append(time.perf_counter() - start)
+    return results, min(timings)
+
+
+def test_extraction_benchmark():
+    """두 경로의 속도를 출력하고, lxml 경로가 BeautifulSoup 경로와 같은 결과를 내는지 확인"""
+    assert fast_extractor.HAS_LXML, "lxml / cssselect 필요"
+    scraper = UltimateScraper(ScrapingConfig(use_cache=False))
+    pages = [_page(n) for n in range(PAGES)]
+
+    print(f"\n{'='*60}")
+    print(f"  추출 엔진 비교 ({PAGES}페이지 x 상품 {PRODUCTS_PER_PAGE}개)")
+    print(f"{'='*60}")
+
+    bs4_data, bs4_time = _best(lambda html: scraper._extract_data_bs4(html, SELECTORS), pages)
+    fast_data, fast_time = _best(lambda html: scraper.extract_data(html, SELECTORS), pages)
+    print(f"  extract_data     bs4 {bs4_time:6.3f}s  lxml {fast_time:6.3f}s  x{bs4_time / fast_time:.1f}")
+    assert fast_data == bs4_data
+
+    bs4_products, bs4_parse = _best(DataProcessor._parse_products_bs4, pages)
+    fast_products, fast_parse = _best(DataProcessor.parse_products, pages)
+    print(f"  parse_products   bs4 {bs4_parse:6.3f}s  lxml {fast_parse:6.3f}s  x{bs4_parse / fast_parse:.1f}")
+    assert fast_products == bs4_products
+    assert len(fast_products[0]) == PRODUCTS_PER_PAGE
+
+    # BeautifulSoup 경로가 건너뛰던 XPath도 같은 맵 안에서 처리
+    xpath = scraper.extract_data(pages[0], {'links': '//div[@class="product"]/a/@href', 'count': 'count(//h2)'})
+    assert xpath['links'][0] == "/p/0/0" and xpath['count'] == PRODUCTS_PER_PAGE
+
+    start = time.perf_counter()
+    batch = scraper.extract_batch(pages, SELECTORS)
+    batch_time = time.perf_counter() - start
+    print(f"  extract_batch    lxml {batch_time:6.3f}s (프로세스 풀, 코어 수만큼)")
+    assert batch == fast_data
+
+
+if __name__ == "__main__":
+    test_extraction_benchmark()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+UltimateScraper.scrape_parallel 확장성 벤치마크
+로컬 테스트 서버(응답마다 50ms 지연)에 워커 수를 바꿔가며 요청해 처리량이 풀 크기까지 얼마나 늘어나는지 측정
+(배율은 실행 환경 부하에 따라 달라지므로 출력만 하고, 결과/메트릭/rate limit 정확성만 검사)
+프로젝트 루트에서 실행: python tests/scraping/test_parallel_scaling_benchmark.py
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src" / "scraper"))
+
+from ultimate_scraper import ScrapingConfig, UltimateScraper
+
+LATENCY = 0.05
+REQUESTS = 64
+WORKERS = [1, 2, 4, 8, 16]
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """고정 지연 후 작은 HTML 응답 (keep-alive)"""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = LATENCY
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = f"<html><body>{self.path}</body></html>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512  # 동시 연결이 몰려도 SYN이 버려지지 않도록 (기본 5)
+
+
+def _start_server(handler=_SlowHandler):
+    server = _Server(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _scraper(rate_limit=0.0):
+    return UltimateScraper(ScrapingConfig(use_cache=False, rate_limit=rate_limit, pool_size=max(WORKERS)))
+
+
+def _run(scraper, base_url, workers, count=REQUESTS):
+    before = scraper.get_metrics()['total_requests']
+    urls = [f"{base_url}/item/{i}" for i in range(count)]
+    start = time.perf_counter()
+    results = scraper.scrape_parallel(urls, max_workers=workers)
+    elapsed = time.perf_counter() - start
+    assert len(results) == count
+    assert all(r.status_code == 200 and not r.error for r in results)
+    assert scraper.get_metrics()['total_requests'] - before == count
+    return elapsed
+
+
+def test_parallel_scaling_benchmark():
+    """워커 수별 처리량을 출력하고, 결과와 메트릭이 정확히 집계되는지 확인"""
+    server = _start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"\n{'='*60}")
+    print(f"  scrape_parallel 확장성 ({REQUESTS}건, 응답 지연 {LATENCY * 1000:.0f}ms)")
+    print(f"{'='*60}")
+
+    try:
+        scraper = _scraper()
+        _run(scraper, base_url, max(WORKERS), count=max(WORKERS) * 2)  # 워밍업 (세션 풀 채우기)
+        timings = {}
+        for workers in WORKERS:
+            timings[workers] = _run(scraper, base_url, workers)
+            speedup = timings[1] / timings[workers]
+            print(f"  워커 {workers:>2}: {timings[workers]:6.2f}s  {REQUESTS / timings[workers]:7.1f} req/s  "
+                  f"x{speedup:4.1f} (효율 {speedup / workers * 100:5.1f}%)")
+
+        # rate limit은 워커를 재우지 않고 요청 시각만 예약: 20건 x 50ms 간격 ≈ 0.95초 이상
+        limited = _run(_scraper(rate_limit=0.05), base_url, 8, count=20)
+        print(f"  rate_limit 0.05s, 워커 8: {limited:.2f}s")
+    finally:
+        server.shutdown()
+
+    assert limited >= 19 * 0.05
+
+
+if __name__ == "__main__":
+    test_parallel_scaling_benchmark()